@@ -5,6 +5,8 @@ from Mainwindow.Signals import Signals
 from Mainwindow.FontSetting import set_font
 
 import Petal.run_Petal as petal
+from Petal.clock import FPS_CAP_CHOICES, POWER_SAVER_FPS, AnimationClock
+from Petal.frame_cache import FrameCache, PackLoader, SizeLoader, snap_size_factor
 from Petal.utils import read_json
 
 log = logging.getLogger(__name__)
@@ -26,6 +28,11 @@ class MainWindow(QMainWindow):
 
 		# 初始化各类型桌宠数量
 		self.pet_counts = {ptype: 0 for ptype in self.pet_types}
+		# 正在后台加载角色包、等待创建的桌宠数量，以及对应的加载器
+		self.pet_pending = {ptype: 0 for ptype in self.pet_types}
+		self.pack_loaders: dict[str, PackLoader] = {}
+		self.size_factor: float = 1.0  # 桌宠大小（相对原始大小的分档）
+		self.size_loaders: dict[str, SizeLoader] = {}
 		# 保存每种类型的控件引用
 		self.count_labels = {}
 		self.remove_buttons = {}
@@ -166,11 +173,53 @@ class MainWindow(QMainWindow):
 		return chat_widget
 
 	def add_pet(self, pet_type):
+		# 角色包在当前大小分档下的帧已就绪时直接创建；否则先在后台并行加载，期间显示"加载中"
+		if FrameCache.instance().is_ready(pet_type, self.size_factor):
+			self.create_pet(pet_type)
+			return
+
+		self.pet_pending[pet_type] += 1
+		self.update_controls(pet_type)
+		if pet_type not in self.pack_loaders:
+			self.start_pack_loader(pet_type)
+
+	def start_pack_loader(self, pet_type):
+		# 按当前大小分档在后台加载角色包
+		loader = PackLoader(pet_type, self.size_factor, parent=self)
+		loader.sig_progress.connect(self.on_pack_progress)
+		loader.sig_loaded.connect(self.on_pack_loaded)
+		loader.sig_failed.connect(self.on_pack_failed)
+		self.pack_loaders[pet_type] = loader
+		loader.start()
+
+	def create_pet(self, pet_type):
 		# 实际创建桌宠逻辑，根据项目实现补充
 		self.pet_instances.append(petal.create_pet_widget('data/pets.json', pet_type, main_window = self))
 		self.pet_counts[pet_type] += 1
 		self.update_controls(pet_type)
 
+	def on_pack_progress(self, pet_type, done, total):
+		# 角色包加载进度
+		self.count_labels[pet_type].setText(f"{pet_type}数量：{self.pet_counts[pet_type]}（加载中 {done}/{total}）")
+
+	def on_pack_loaded(self, pet_type):
+		# 角色包加载完成，创建等待中的桌宠；加载期间大小分档变了则按新分档继续加载
+		self.pack_loaders.pop(pet_type, None)
+		if not FrameCache.instance().is_ready(pet_type, self.size_factor):
+			self.start_pack_loader(pet_type)
+			return
+		pending, self.pet_pending[pet_type] = self.pet_pending[pet_type], 0
+		for _ in range(pending):
+			self.create_pet(pet_type)
+		self.update_controls(pet_type)
+
+	def on_pack_failed(self, pet_type, message):
+		# 角色包加载失败，放弃等待中的桌宠
+		self.pack_loaders.pop(pet_type, None)
+		self.pet_pending[pet_type] = 0
+		self.update_controls(pet_type)
+		log.error(f"加载桌宠 {pet_type} 失败：{message}")
+
 	def remove_pet(self, pet_type):
 		if self.pet_counts[pet_type] > 0:
 			# 实际移除桌宠逻辑，根据项目实现补充
@@ -185,7 +234,10 @@ class MainWindow(QMainWindow):
 
 	def update_controls(self, pet_type):
 		# 更新数量标签并切换移除按钮状态
-		self.count_labels[pet_type].setText(f"{pet_type}数量：{self.pet_counts[pet_type]}")
+		text = f"{pet_type}数量：{self.pet_counts[pet_type]}"
+		if self.pet_pending[pet_type] > 0:
+			text += f"（加载中 +{self.pet_pending[pet_type]}）"
+		self.count_labels[pet_type].setText(text)
 		self.remove_buttons[pet_type].setEnabled(self.pet_counts[pet_type] > 0)
 
 	def create_setting_window(self):
@@ -233,7 +285,7 @@ class MainWindow(QMainWindow):
 		self.slider = QSlider(Qt.Horizontal)
 		self.slider.setStyleSheet("")
 		self.slider.setRange(1, 300)
-		self.slider.setValue(50)
+		self.slider.setValue(100)
 		self.slider.valueChanged.connect(self.slider_changed)
 		slider_container = QWidget()
 		slider_layout = QVBoxLayout(slider_container)
@@ -251,6 +303,35 @@ class MainWindow(QMainWindow):
 
 		container_layout.addWidget(slider_container)
 
+		# 帧率上限与省电模式（全局设置，与桌宠托盘菜单同步）
+		clock = AnimationClock.instance()
+		fps_container = QWidget()
+		fps_layout = QHBoxLayout(fps_container)
+		fps_layout.setContentsMargins(0, 0, 0, 0)
+		fps_label = QLabel("帧率上限")
+		fps_label.setFont(default_font)
+		fps_label.setStyleSheet("border: none;")
+		self.fps_combo = QComboBox()
+		self.fps_combo.setFont(default_font)
+		for fps in FPS_CAP_CHOICES:
+			self.fps_combo.addItem(f"{fps} FPS" if fps else "不限", fps)
+		self.fps_combo.currentIndexChanged.connect(
+			lambda index: clock.set_fps_cap(self.fps_combo.itemData(index))
+		)
+		fps_layout.addStretch()
+		fps_layout.addWidget(fps_label)
+		fps_layout.addWidget(self.fps_combo)
+		container_layout.addWidget(fps_container)
+
+		self.power_saver_box = QCheckBox(f"省电模式（最高 {POWER_SAVER_FPS} FPS）")
+		self.power_saver_box.setLayoutDirection(Qt.RightToLeft)
+		self.power_saver_box.setFont(default_font)
+		self.power_saver_box.toggled.connect(clock.set_power_saver)
+		container_layout.addWidget(self.power_saver_box)
+
+		clock.sig_profile_changed.connect(self.sync_power_controls)
+		self.sync_power_controls()
+
 		scroll_area.setWidget(container)
 		main_layout.addWidget(scroll_area)
 
@@ -260,9 +341,49 @@ class MainWindow(QMainWindow):
 		# 开关回调逻辑
 		print("特效启用" if state == Qt.Checked else "特效关闭")
 
+	def sync_power_controls(self):
+		# 帧率上限 / 省电模式可能从托盘菜单修改，设置页控件跟随显示
+		clock = AnimationClock.instance()
+		self.fps_combo.blockSignals(True)
+		self.fps_combo.setCurrentIndex(max(0, self.fps_combo.findData(clock.fps_cap)))
+		self.fps_combo.blockSignals(False)
+		self.power_saver_box.blockSignals(True)
+		self.power_saver_box.setChecked(clock.power_saver)
+		self.power_saver_box.blockSignals(False)
+
 	def slider_changed(self, value):
-		# 滑动条逻辑
-		print(f"大小设置为：{value}%")
+		# 滑动条逻辑：吸附到大小分档，只有分档变化时才在后台生成新尺寸的帧
+		size_factor = snap_size_factor(value / 100)
+		if size_factor == self.size_factor:
+			return
+		self.size_factor = size_factor
+		print(f"大小设置为：{value}%（分档 {size_factor:g}）")
+		for pet_type in {inst.curr_pet_name for inst in self.pet_instances}:
+			self.request_size(pet_type)
+
+	def request_size(self, pet_type):
+		# 每种桌宠同时只有一个后台生成任务；完成时若大小又变了再继续生成
+		if pet_type in self.size_loaders:
+			return
+		loader = SizeLoader(pet_type, self.size_factor, parent=self)
+		loader.sig_ready.connect(self.on_size_ready)
+		loader.sig_failed.connect(self.on_size_failed)
+		self.size_loaders[pet_type] = loader
+		loader.start()
+
+	def on_size_ready(self, pet_type, size_factor):
+		# 新尺寸的帧已全部就绪，一次性切换该种类的全部桌宠
+		self.size_loaders.pop(pet_type, None)
+		if size_factor != self.size_factor:
+			self.request_size(pet_type)
+			return
+		for inst in self.pet_instances:
+			if inst.curr_pet_name == pet_type:
+				inst.apply_pet_conf(inst.role_pack.config_for(size_factor))
+
+	def on_size_failed(self, pet_type, message):
+		self.size_loaders.pop(pet_type, None)
+		log.error(f"调整桌宠 {pet_type} 大小失败：{message}")
 
 	def setup_chatting_window(self):
 		"""
@@ -2,6 +2,6 @@ from functools import partial
 import logging
 import sys
 
-from PyQt5.QtWidgets import QFrame, QLabel, QSpacerItem, QSizePolicy, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QStackedWidget, QApplication, QStyleFactory, QTextEdit, QScrollArea, QSlider, QCheckBox
+from PyQt5.QtWidgets import QFrame, QLabel, QSpacerItem, QSizePolicy, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QStackedWidget, QApplication, QStyleFactory, QTextEdit, QScrollArea, QSlider, QCheckBox, QComboBox
 from PyQt5.QtGui import QIcon, QFont, QColor, QPalette, QPixmap
 from PyQt5.QtCore import QPropertyAnimation, QEasingCurve, Qt, pyqtSignal, QObject
\ No newline at end of file
@@ -15,7 +15,7 @@ from typing import List
 
 
 from PyQt5.QtCore import QEvent, QObject, QPoint, Qt, QThread, QTimer, pyqtSignal, QRect
-from PyQt5.QtGui import QCursor, QFont, QFontDatabase, QIcon, QImage, QPainter, QPixmap
+from PyQt5.QtGui import QCursor, QFont, QFontDatabase, QIcon, QImage, QPainter, QPixmap, QRegion, QWindow
 from PyQt5.QtWidgets import *
 
 
@@ -25,6 +25,12 @@ from Petal.conf import *
 from Petal.extra_windows import *
 
 from Petal.settings import Settings
+from Petal.frame_cache import FrameCache
+from Petal.sprite import SpriteWidget
+from Petal.bubble import BubbleCache, BubbleWidget
+from Petal.status_overlay import StatusOverlay
+from Petal.clock import FPS_CAP_CHOICES, POWER_SAVER_FPS, USE_SHARED_CLOCK, AnimationClock
+from Petal.overlay import USE_OVERLAY, PetOverlay
 
 # 修改 screen_scale 的获取方式
 if sys.platform == "win32":
@@ -97,7 +103,13 @@ class PetWidget(QWidget):
         self.init_conf(initial_pet_name_to_load)  # 加载配置、图片字典、宠物数据等
 
         # --- 显示窗口 ---
-        self.show()
+        # 叠加模式下宠物窗口本身不显示，由共享的叠加窗口绘制精灵并转交鼠标事件
+        self.overlay: Optional[PetOverlay] = PetOverlay.instance() if USE_OVERLAY else None
+        if self.overlay is not None:
+            self.overlay.add_pet(self)
+        else:
+            self.show()
+        self._init_exposure_tracking()  # 窗口不可见时节流动画与交互
 
         # --- 后台任务管理初始化 ---
         self.threads: dict[str, QThread] = {}  # 用于管理后台任务的线程对象
@@ -109,7 +121,7 @@ class PetWidget(QWidget):
         self.runScheduler()  # 启动计划任务（提醒、番茄钟等）线程
 
         # --- 根据加载的宠物数据配置UI ---
-        self._setup_ui(self.pic_dict)  # 设置UI元素尺寸、初始值等
+        self._setup_ui()  # 设置UI元素尺寸、初始值等
 
         # super().__init__(parent, flags=Qt.WindowFlags())
         # # --- 安全性检查 ---
@@ -301,10 +313,7 @@ class PetWidget(QWidget):
 
         # 2. 显式设置回默认图像 (以防 _move_customized 未触发图像更新)
         try:
-            # 确保配置和图像列表存在
-            self.default_image = self.pet_conf.default.images[0]
-            self.settings.current_img = self.default_image
-            self.set_img()  # 更新显示的图像
+            self._show_default_frame()  # 更新显示的图像
         except (AttributeError, IndexError, TypeError) as e:
             # 更详细的错误处理
             print(f"警告: 无法设置默认图像。配置或图像列表可能无效。错误: {e}")
@@ -354,126 +363,22 @@ class PetWidget(QWidget):
         # ============================================================
         # 1. 宠物动画显示区域
         # ============================================================
-        # 用于显示宠物动画的主要标签
-        self.label = QLabel(self)
-        self.label.setAlignment(Qt.AlignBottom | Qt.AlignHCenter)
-        self.label.installEventFilter(self)  # 安装事件过滤器
+        # 用于显示宠物动画的精灵控件：在 paintEvent 中直接绘制帧，底部水平居中
+        self.sprite = SpriteWidget(self)
+        self.sprite.installEventFilter(self)  # 安装事件过滤器
 
         # ============================================================
-        # 2. 状态信息框 (包含健康、心情、番茄钟、专注时间)
+        # 2. 状态栏 (包含健康、心情、番茄钟、专注时间)
         # ============================================================
-        # 创建状态信息的容器 Frame
-        self.status_frame = QFrame()
-
-        # 垂直布局，用于放置所有状态信息
-        vbox = QVBoxLayout()
-        vbox.setContentsMargins(0, 0, 0, 0)
-        vbox.setSpacing(0)
-
-        # --- 2.1 健康值 (HP) ---
-        h_box1 = QHBoxLayout()
-        h_box1.setContentsMargins(0, 3, 0, 0)  # 上边距为3
-        h_box1.setAlignment(Qt.AlignBottom | Qt.AlignHCenter)
-
-        # 健康值图标
-        self.hpicon = QLabel(self)
-        self.hpicon.setFixedSize(17, 15)
-        image = QImage()
-        image.load('res/icons/HP_icon.png')
-        self.hpicon.setScaledContents(True)  # 图片自适应
-        self.hpicon.setPixmap(QPixmap.fromImage(image))
-        self.hpicon.setAlignment(Qt.AlignBottom | Qt.AlignRight)
-        h_box1.addWidget(self.hpicon)
-
-        # 健康值进度条
-        self.pet_hp = QProgressBar(
-            self, minimum=0, maximum=100, objectName='PetHP'
-        )  # 设置objectName，便于样式表选择
-        self.pet_hp.setFormat('50/100')  # 显示格式
-        self.pet_hp.setValue(50)  # 初始值
-        self.pet_hp.setAlignment(Qt.AlignCenter)
-        h_box1.addWidget(self.pet_hp)
-
-        # --- 2.2 心情值 (Emotion) ---
-        h_box2 = QHBoxLayout()
-        h_box2.setContentsMargins(0, 3, 0, 0)  # 上边距为3
-        h_box2.setAlignment(Qt.AlignBottom | Qt.AlignHCenter)
-
-        # 心情值图标
-        self.emicon = QLabel(self)
-        self.emicon.setFixedSize(17, 15)
-        image = QImage()
-        image.load('res/icons/emotion_icon.png')  # 加载图片
-        self.emicon.setScaledContents(True)
-        self.emicon.setPixmap(QPixmap.fromImage(image))
-        self.emicon.setAlignment(Qt.AlignBottom | Qt.AlignRight)
-        h_box2.addWidget(self.emicon)
-
-        # 心情值进度条
-        self.pet_em = QProgressBar(self, minimum=0, maximum=100, objectName='PetEM')
-        self.pet_em.setFormat('50/100')
-        self.pet_em.setValue(50)
-        self.pet_em.setAlignment(Qt.AlignCenter)
-        h_box2.addWidget(self.pet_em)
-
-        # --- 2.3 番茄时钟 ---
-        h_box3 = QHBoxLayout()
-        h_box3.setContentsMargins(0, 0, 0, 0)
-        h_box3.setAlignment(Qt.AlignBottom | Qt.AlignHCenter)
-
-        # 番茄时钟图标
-        self.tomatoicon = QLabel(self)
-        self.tomatoicon.setFixedSize(17, 15)
-        image = QImage()
-        image.load('res/icons/Tomato_icon.png')
-        self.tomatoicon.setScaledContents(True)
-        self.tomatoicon.setPixmap(QPixmap.fromImage(image))
-        self.tomatoicon.setAlignment(Qt.AlignBottom | Qt.AlignRight)
-        h_box3.addWidget(self.tomatoicon)
-
-        # 番茄时钟进度条
-        self.tomato_time = QProgressBar(self, minimum=0, maximum=25, objectName='PetHP')
-        self.tomato_time.setFormat('无')
-        self.tomato_time.setValue(0)
-        self.tomato_time.setAlignment(Qt.AlignCenter)
-        self.tomato_time.hide()
-        self.tomatoicon.hide()
-        h_box3.addWidget(self.tomato_time)
-
-        # --- 2.4 专注时间 ---
-        h_box4 = QHBoxLayout()
-        h_box4.setContentsMargins(0, 3, 0, 0)
-        h_box4.setAlignment(Qt.AlignBottom | Qt.AlignHCenter)
-
-        # 专注时间图标
-        self.focusicon = QLabel(self)
-        self.focusicon.setFixedSize(17, 15)
-        image = QImage()
-        image.load('res/icons/Timer_icon.png')
-        self.focusicon.setScaledContents(True)
-        self.focusicon.setPixmap(QPixmap.fromImage(image))
-        self.focusicon.setAlignment(Qt.AlignBottom | Qt.AlignRight)
-        h_box4.addWidget(self.focusicon)
-
-        # 专注时间进度条
-        self.focus_time = QProgressBar(self, minimum=0, maximum=100, objectName='PetFC')
-        self.focus_time.setFormat('无')
-        self.focus_time.setValue(0)
-        self.focus_time.setAlignment(Qt.AlignCenter)
-        self.focus_time.hide()
-        self.focusicon.hide()
-        h_box4.addWidget(self.focus_time)
-
-        # 将所有布局添加到垂直布局中
-        vbox.addLayout(h_box3)  # 番茄时钟
-        vbox.addLayout(h_box4)  # 专注时间
-        vbox.addLayout(h_box1)  # 健康值
-        vbox.addLayout(h_box2)  # 心情值
-
-        # 将垂直布局设置给 status_frame
-        self.status_frame.setLayout(vbox)
-        self.status_frame.setContentsMargins(0, 0, 0, 0)
-        self.status_frame.hide()
+        # 状态栏直接画在精灵控件上，悬停时显示；不是子控件，显示 / 隐藏不触发布局
+        self.status = StatusOverlay(self.sprite)
+        self.sprite.status = self.status
+        self.status.sig_area_changed.connect(self._update_hit_mask)
+        # 各状态条提供 QProgressBar 的常用接口 (value / setValue / setFormat / show / hide)
+        self.pet_hp = self.status.hp  # 健康值
+        self.pet_em = self.status.em  # 心情值
+        self.tomato_time = self.status.tomato  # 番茄时钟，运行时才显示
+        self.focus_time = self.status.focus  # 专注时间，运行时才显示
 
         # ============================================================
         # 3. 对话框显示区域
@@ -483,29 +388,17 @@ class PetWidget(QWidget):
         self.dialogue_box.setContentsMargins(0, 0, 0, 0)
 
         # 对话框背景
-        self.dialogue = QLabel(self)
-        self.dialogue.setAlignment(Qt.AlignCenter)
-
-        # 对话框背景，并设置大小
-        image = QImage()
-        image.load('res/icons/text_framex2.png')
-        self.dialogue.setFixedWidth(image.width())
-        self.dialogue.setFixedHeight(image.height())
+        # 对话框气泡：背景图与换行后的文本整体渲染为 QPixmap，由 BubbleCache 按文本缓存
+        self.dialogue = BubbleWidget(self)
 
         # 设置字体
         QFontDatabase.addApplicationFont('res/font/MFNaiSi_Noncommercial-Regular.otf')
         self.dialogue.setFont(QFont('造字工房奈思体（非商用）', int(11 / screen_scale)))
 
-        self.dialogue.setWordWrap(
-            False
-        )  # 每行最多8个汉字长度，需要自定义function进行换行
-
         self._set_dialogue_dp()
-        self.dialogue.setStyleSheet(
-            "background-image : url(res/icons/text_framex2.png)"
-        )  # ; border : 2px solid blue")
 
         self.dialogue_box.addWidget(self.dialogue)
+        self.dialogue.sig_area_changed.connect(self._update_hit_mask)  # 显示 / 隐藏时更新窗口遮罩
 
         # ============================================================
         # 4. 主窗口布局设置
@@ -515,8 +408,7 @@ class PetWidget(QWidget):
 
         # 宠物布局
         self.petlayout = QVBoxLayout()
-        self.petlayout.addWidget(self.status_frame)
-        self.petlayout.addWidget(self.label)
+        self.petlayout.addWidget(self.sprite)
         self.petlayout.setAlignment(Qt.AlignBottom | Qt.AlignHCenter)
         self.petlayout.setContentsMargins(0, 0, 0, 0)
 
@@ -637,6 +529,9 @@ class PetWidget(QWidget):
         switch_fall.triggered.connect(self.fall_onoff)  # 连接信号
         menu.addAction(switch_fall)  # 直接添加到主菜单
 
+        # --- 添加 "性能" 子菜单：全局帧率上限与省电模式 (与主窗口设置页同步) ---
+        menu.addMenu(self._build_power_menu(menu))
+
         # ============================================================
         # 6. 添加分隔符
         # ============================================================
@@ -654,6 +549,76 @@ class PetWidget(QWidget):
         # ============================================================
         self.menu = menu
 
+    def _build_power_menu(self, parent_menu: QMenu) -> QMenu:
+        """
+        构建 "性能" 子菜单：互斥的帧率上限选项、省电模式开关，以及只读的性能统计。
+        选项作用于全部宠物 (AnimationClock 的全局设置)，勾选状态随时钟设置变化同步；
+        统计在每次打开子菜单时刷新。
+        """
+        clock = AnimationClock.instance()
+        power_menu = QMenu(parent_menu)
+        power_menu.setTitle('性能')
+
+        fps_group = QActionGroup(power_menu)
+        fps_group.setExclusive(True)
+        self.fps_actions: dict[int, QAction] = {}
+        for fps in FPS_CAP_CHOICES:
+            action = QAction(f'帧率上限 {fps} FPS' if fps else '帧率不限', power_menu)
+            action.setCheckable(True)
+            action.triggered.connect(lambda checked, fps=fps: clock.set_fps_cap(fps))
+            fps_group.addAction(action)
+            power_menu.addAction(action)
+            self.fps_actions[fps] = action
+
+        power_menu.addSeparator()
+        self.power_saver_action = QAction(f'省电模式 (最高 {POWER_SAVER_FPS} FPS)', power_menu)
+        self.power_saver_action.setCheckable(True)
+        self.power_saver_action.triggered.connect(clock.set_power_saver)
+        power_menu.addAction(self.power_saver_action)
+
+        power_menu.addSeparator()
+        self.bubble_stats_action = QAction(power_menu)
+        self.bubble_stats_action.setEnabled(False)  # 只用于显示
+        power_menu.addAction(self.bubble_stats_action)
+        self.timing_stats_action = QAction(power_menu)
+        self.timing_stats_action.setEnabled(False)  # 只用于显示
+        power_menu.addAction(self.timing_stats_action)
+        power_menu.aboutToShow.connect(self._update_perf_stats)
+        self._update_perf_stats()
+
+        if not getattr(self, '_power_menu_connected', False):
+            clock.sig_profile_changed.connect(self._sync_power_menu)
+            self._power_menu_connected = True
+        self._sync_power_menu()
+        return power_menu
+
+    def _sync_power_menu(self) -> None:
+        """按时钟的全局设置更新 "性能" 子菜单的勾选状态。"""
+        clock = AnimationClock.instance()
+        action = self.fps_actions.get(clock.fps_cap)
+        if action is not None:
+            action.setChecked(True)
+        self.power_saver_action.setChecked(clock.power_saver)
+
+    def _update_perf_stats(self) -> None:
+        """
+        刷新 "性能" 子菜单中的统计：对话框气泡缓存的命中 / 未命中次数，
+        以及本宠物动画晚于截止时间的程度与跳过的帧数。
+        """
+        stats = BubbleCache.instance().stats()
+        self.bubble_stats_action.setText(
+            f"对话框缓存：命中 {stats['hits']} / 未命中 {stats['misses']} (缓存 {stats['size']} 个)"
+        )
+        worker = getattr(self, 'workers', {}).get('Animation')
+        if worker is None or not hasattr(worker, 'timing_stats'):
+            self.timing_stats_action.setText('动画延迟：无')
+            return
+        timing = worker.timing_stats()
+        self.timing_stats_action.setText(
+            f"动画延迟：平均 {timing['lateness_avg_ms']:.1f} ms / 最大 {timing['lateness_max_ms']:.1f} ms"
+            f" (跳帧 {timing['dropped']})"
+        )
+
     def _show_right_menu(self):
         """
         在当前鼠标光标的位置弹出预先设置好的右键菜单 (self.menu)。
@@ -703,7 +668,7 @@ class PetWidget(QWidget):
 
         # 步骤 5: 更新 UI 元素以匹配新宠物
         if hasattr(self, '_setup_ui') and callable(getattr(self, '_setup_ui')):
-            self._setup_ui(self.pic_dict)
+            self._setup_ui()
         else:
             print(
                 f"警告：方法 _setup_ui 未找到或不可调用。跳过 _change_pet 中的 UI 初始化步骤。 "
@@ -713,17 +678,25 @@ class PetWidget(QWidget):
         """
         根据指定的宠物名称，初始化窗口和宠物的核心配置。
         1. 设置当前宠物名称 (`self.curr_pet_name`)。
-        2. 加载该宠物的所有图像资源 (`self.pic_dict`)。
-        3. 加载或创建该宠物的配置对象 (`self.pet_conf`)。
+        2. 从进程级帧缓存获取该宠物的角色包 (`self.role_pack`)，并释放之前持有的角色包。
+        3. 取得角色包中当前桌宠大小对应的配置对象 (`self.pet_conf`)，其中的帧按需从磁盘缓存映射或解码。
         4. 计算用于布局调整的边距值 (`self.margin_value`)。
         5. 加载或初始化该宠物的状态数据 (`self.pet_data`)。
         6. 更新依赖于当前宠物配置的UI组件 (菜单 `self._set_menu` 和系统托盘 `self._set_tray`)。
         """
         # 1. 设置当前宠物标识与加载核心资源/配置
         # -----------------------------------------
+        #    图片与配置由进程级帧缓存提供，同种宠物的多个实例共用同一份帧
         self.curr_pet_name = pet_name
-        self.pic_dict = _load_all_pic(pet_name)
-        self.pet_conf = PetConfig.init_config(self.curr_pet_name, self.pic_dict)
+        new_pack = FrameCache.instance().acquire(pet_name)
+        if getattr(self, 'role_pack', None) is not None:
+            FrameCache.instance().release(self.role_pack.pet_name)
+        self.role_pack = new_pack
+        if hasattr(self, 'sprite'):
+            self.sprite.invalidate()  # 新宠物的帧标识与旧宠物的无关
+        #    按主窗口设置页中的桌宠大小取对应分档的配置
+        size_factor = getattr(self.main_window, 'size_factor', 1.0)
+        self.pet_conf = self.role_pack.config_for(size_factor)
 
         # 2. 计算用于布局调整的边距值
         # -----------------------------------------
@@ -745,20 +718,17 @@ class PetWidget(QWidget):
         # 更新系统托盘
         self._set_tray()
 
-    def _setup_ui(self, pic_dict):
+    def _setup_ui(self):
         """
-        根据当前宠物的配置 (self.pet_conf) 和传入的图片字典 (pic_dict)，
+        根据当前宠物的配置 (self.pet_conf)，
         调整界面元素的尺寸、设置初始值、更新显示图片、定位窗口，并初始化特定子任务。
         通常在宠物切换或初始化时调用。
         """
 
-        # 1. 调整进度条尺寸
+        # 1. 调整状态栏尺寸
         # ---------------------
-        # 将健康、心情、番茄钟、专注时间的进度条宽度设置为宠物配置宽度的 75%
-        self.pet_hp.setFixedSize(int(0.75 * self.pet_conf.width), 15)
-        self.pet_em.setFixedSize(int(0.75 * self.pet_conf.width), 15)
-        self.tomato_time.setFixedSize(int(0.75 * self.pet_conf.width), 15)
-        self.focus_time.setFixedSize(int(0.75 * self.pet_conf.width), 15)
+        # 将健康、心情、番茄钟、专注时间的状态条宽度设置为宠物配置宽度的 75%
+        self.status.set_bar_width(int(0.75 * self.pet_conf.width))
 
         # 2. 调整主窗口尺寸
         # -------------------
@@ -780,15 +750,11 @@ class PetWidget(QWidget):
 
         # 4. 更新宠物显示的图片
         # -----------------------
-        self.settings.previous_img = self.settings.current_img
-        if pic_dict:  # 确保 pic_dict 不为空
-            self.settings.current_img = list(pic_dict.values())[0]
+        if self.pet_conf.default and self.pet_conf.default.images:  # 使用默认动作的第一帧
+            self._show_default_frame()
         else:
-            print("警告：pic_dict 为空，无法设置当前图片。")
-
-        self.set_img()
+            print("警告：默认动作没有图片，无法设置当前图片。")
         self.border = self.pet_conf.width / 2
-        self.hpicon.adjustSize()
 
         # 5. 设置窗口的初始位置
         # ---------------------
@@ -809,25 +775,125 @@ class PetWidget(QWidget):
         # -------------------
         self.remind_window.initial_task()
 
+    def apply_pet_conf(self, pet_conf: PetConfig) -> None:
+        """
+        换用同一宠物另一大小分档的配置 (帧应已由后台生成完毕)。
+
+        更新各工作线程持有的配置与窗口尺寸，保持窗口底边与水平中心不变；
+        正在播放的动作播放完后，后续动作即使用新尺寸的帧。
+        """
+        bottom = self.y() + self.height()
+        center_x = self.x() + self.width() // 2
+
+        self.pet_conf = pet_conf
+        for worker in self.workers.values():
+            if hasattr(worker, 'pet_conf'):
+                worker.pet_conf = pet_conf
+
+        self.margin_value = 0.5 * max(self.pet_conf.width, self.pet_conf.height)
+        self.status.set_bar_width(int(0.75 * self.pet_conf.width))
+        self.setFixedSize(
+            int(self.pet_conf.width + self.margin_value),
+            int(self.dialogue.height() + self.margin_value + 60 + self.pet_conf.height),
+        )
+        self.border = self.pet_conf.width / 2
+
+        self.sprite.invalidate()  # 帧标识不变但帧图片已换成新尺寸
+        self._show_default_frame()
+
+        work_height = QDesktopWidget().availableGeometry().height()
+        self.floor_pos = work_height - self.height()
+        self.move(center_x - self.width() // 2, min(bottom - self.height(), self.floor_pos))
+
+    def _init_exposure_tracking(self) -> None:
+        """
+        跟踪窗口是否真正可见：QWindow 的暴露 (Expose) 事件与可见性变化、应用状态变化。
+        需在 show() 之后调用，此时才有 windowHandle()；叠加模式下跟踪的是叠加窗口。
+        """
+        self._exposed: bool = True
+        self._window_handle = self._display_window().windowHandle()
+        if self._window_handle is not None:
+            self._window_handle.installEventFilter(self)
+            self._window_handle.visibilityChanged.connect(self._update_exposure)
+        QApplication.instance().applicationStateChanged.connect(self._update_exposure)
+        self._update_exposure()
+
+    def _display_window(self) -> QWidget:
+        """实际显示本宠物的顶层窗口：叠加模式下为叠加窗口，否则为本窗口。"""
+        return self.overlay if getattr(self, 'overlay', None) is not None else self
+
+    def _is_exposed(self) -> bool:
+        """窗口可见、未最小化、已暴露 (未被完全遮挡或锁屏)，且应用未被隐藏 / 挂起。"""
+        host = self._display_window()
+        window = host.windowHandle()
+        return (
+            host.isVisible()
+            and window is not None
+            and window.isExposed()
+            and window.visibility() not in (QWindow.Hidden, QWindow.Minimized)
+            and QApplication.applicationState() not in (Qt.ApplicationHidden, Qt.ApplicationSuspended)
+        )
+
+    def _update_exposure(self, *_) -> None:
+        """
+        可见性变化时开启 / 关闭动画与交互的节流。
+        节流期间动画停在当前帧；重新可见时立即重绘当前帧，不必等下一帧到期。
+        """
+        exposed = self._is_exposed()
+        if exposed == getattr(self, '_exposed', True):
+            return
+        self._exposed = exposed
+        for module_name in ('Animation', 'Interaction'):
+            worker = getattr(self, 'workers', {}).get(module_name)
+            if worker is not None and hasattr(worker, 'set_throttled'):
+                worker.set_throttled(not exposed)
+        if exposed:
+            self.set_img(*self.settings.current_frame)
+
+    @property
+    def frames_skipped(self) -> int:
+        """本宠物因窗口不可见而跳过的帧数 (动画与交互合计)。"""
+        return sum(
+            getattr(self.workers.get(module_name), 'frames_skipped', 0)
+            for module_name in ('Animation', 'Interaction')
+        )
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        self._update_exposure()
+
+    def hideEvent(self, event) -> None:
+        super().hideEvent(event)
+        self._update_exposure()
+
     def eventFilter(self, watched_object, event):
         """
         事件过滤器，用于捕获安装了此过滤器的对象 (watched_object) 上的特定事件。
 
         在此实现中，主要处理鼠标进入和离开事件：
-        - 当鼠标光标进入 `watched_object` 的区域时，显示 `self.status_frame`。
-        - 当鼠标光标离开 `watched_object` 的区域时，隐藏 `self.status_frame`。
-        """
+        - 当鼠标光标进入 `watched_object` 的区域时，显示状态栏 `self.status`。
+        - 当鼠标光标离开 `watched_object` 的区域时，隐藏状态栏 `self.status`。
+
+        窗口句柄 (QWindow) 上只关心暴露事件：事件处理完后再重新判断可见性。
+        """
+        if watched_object is getattr(self, '_window_handle', None):
+            if event.type() == QEvent.Expose:
+                QTimer.singleShot(0, self._update_exposure)
+            return False
+        # 精灵的显示、位置或尺寸变化时更新窗口遮罩
+        if event.type() in (QEvent.Show, QEvent.Hide, QEvent.Move, QEvent.Resize):
+            self._update_hit_mask()
         # 检查事件类型是否为鼠标进入事件 (QEvent.Enter)
         if event.type() == QEvent.Enter:
-            # 如果是鼠标进入事件，则显示状态信息框 (self.status_frame)
-            self.status_frame.show()
+            # 如果是鼠标进入事件，则显示状态栏 (只重绘精灵控件中状态栏所在的矩形)
+            self.status.set_shown(True)
             # 返回 True 表示我们已经处理了这个事件，不需要Qt再做其他处理或传递给父级
             return True
 
         # 检查事件类型是否为鼠标离开事件 (QEvent.Leave)
         elif event.type() == QEvent.Leave:
-            # 如果是鼠标离开事件，则隐藏状态信息框 (self.status_frame)
-            self.status_frame.hide()
+            # 如果是鼠标离开事件，则隐藏状态栏
+            self.status.set_shown(False)
 
         # 对于所有其他未在此处处理的事件类型
         # 返回 False 表示这个过滤器没有处理该事件，
@@ -859,43 +925,90 @@ class PetWidget(QWidget):
             #    可以确保图标处于显示状态（以防万一被隐藏）。
             self.tray.show()
 
-    def set_img(self):  # , img: QImage) -> None:
+    def set_img(self, act_id: int, frame_index: int, flags: int = 0) -> None:
         """
-        根据 `settings.current_img` 中存储的图像数据 (预期为 QImage)，
-        更新 `self.label` 控件以显示该图片，并调整其尺寸。
+        显示帧标识 (动作编号, 帧序号, 标志位) 对应的帧。
 
-        同时，将该图像数据也存储在 `self.image` 属性中。
+        工作线程只发送帧标识，帧图片在 GUI 线程中按当前配置 (self.pet_conf) 查表得到；
+        无法解析的帧标识直接丢弃 (过期的 tick 已由 on_tick 按配置代号丢弃)。
+        同时，将该帧图片存储在 `self.image` 属性中。
         """
-        # 1. 调整 QLabel (self.label) 的尺寸以完全匹配新图像的宽度和高度
-        #    确保标签大小正好能容纳整个图片
-        try:
-            image_width = self.settings.current_img.width()
-            image_height = self.settings.current_img.height()
-            self.label.resize(image_width, image_height)
-        except AttributeError:
-            print(
-                f"错误：无法从 self.settings.current_img 获取尺寸。请确保它是一个有效的 QImage 对象。"
-            )
-            # 可以选择在这里返回或设置一个默认图片/尺寸
+        image = self.pet_conf.frame_image(act_id, frame_index, flags)
+        if image is None:
+            return
+
+        # 帧的 QPixmap 与命中区域由角色包按帧缓存；同一帧重复设置时精灵控件不会重绘
+        self.sprite.set_frame(
+            (act_id, frame_index, flags), self.role_pack.pixmap(image), self.role_pack.hit_region(image)
+        )
+
+        # 将当前的帧图片也保存到实例变量 self.image 中
+        self.image = image
+
+        if getattr(self, 'overlay', None) is not None:
+            self.overlay.mark_dirty(self)
+        else:
+            self._update_hit_mask()
+
+    def _update_hit_mask(self) -> None:
+        """
+        将窗口遮罩设为当前帧的不透明像素，加上正在显示的状态栏与对话框：
+        落在透明像素上的鼠标事件穿透到下层窗口。遮罩不变时 (例如同一帧重复显示) 不重新设置。
+        叠加模式下本窗口不显示，由叠加窗口负责遮罩。
+        """
+        if getattr(self, 'overlay', None) is not None or not hasattr(self, 'dialogue'):
+            return
+        image = getattr(self, 'image', None)
+        origin = self.sprite.pos() + self.sprite.frame_geometry().topLeft()
+        panels = []
+        if self.status.shown:
+            panels.append(self.status.geometry().translated(self.sprite.pos()))
+        if self.dialogue.isVisible():
+            panels.append(QRect(self.dialogue.mapTo(self, QPoint(0, 0)), self.dialogue.size()))
+        panels = tuple(rect for rect in panels if not rect.isEmpty())
+        key = (image.cacheKey() if image is not None else None, origin, panels)
+        if key == getattr(self, '_hit_mask_key', None):
             return
+        self._hit_mask_key = key
+        mask = self.sprite.hit_geometry().translated(self.sprite.pos())
+        for rect in panels:
+            mask += rect
+        # 空遮罩等于取消遮罩，此时用窗口外的一个像素代替
+        self.setMask(mask if not mask.isEmpty() else QRegion(-1, -1, 1, 1))
 
-        # 2. 将 QImage (settings.current_img) 转换为 QPixmap 并设置为 QLabel 的内容
-        #    QPixmap 是专门用于在屏幕上显示的优化图像格式
-        self.label.setPixmap(QPixmap.fromImage(self.settings.current_img))
+    def move(self, *args) -> None:
+        """移动窗口；叠加模式下本窗口不显示、收不到 moveEvent，由此通知叠加窗口重绘。"""
+        super().move(*args)
+        if getattr(self, 'overlay', None) is not None:
+            self.overlay.mark_dirty(self)
+
+    def on_tick(self, act_id: int, frame_index: int, flags: int, plus_x: float, plus_y: float,
+                generation: int) -> None:
+        """
+        处理工作线程每帧发出的 tick：先换帧，再按位移移动窗口。
+
+        先换帧再移动，使落地时 `_move_customized` 切换的默认站立帧不会被本帧覆盖。
+        配置代号与当前配置不符的 tick (切换宠物或大小之前排队的) 连同位移一起丢弃。
+        """
+        if generation != self.pet_conf.generation:
+            return
+        self.set_img(act_id, frame_index, flags)
+        self._move_customized(plus_x, plus_y)
 
-        # 3. 将当前的 QImage 对象也保存到实例变量 self.image 中
-        #    这个副本的具体用途需要结合其他使用 self.image 的代码来理解
-        self.image = self.settings.current_img
+    def _show_default_frame(self) -> None:
+        """显示默认动作的第一帧，并记录为当前帧。"""
+        frame = (self.pet_conf.default.act_id, 0, 0)
+        self.settings.previous_frame = self.settings.current_frame
+        self.settings.current_frame = frame
+        self.set_img(*frame)
 
     def _set_dialogue_dp(self, texts='None'):
         """
-        设置或隐藏对话框标签 (self.dialogue) 的文本内容。
+        设置或隐藏对话框气泡 (self.dialogue) 的文本内容。
 
         - 如果传入的 `texts` 参数是字符串 'None' (区分大小写)，则隐藏对话框。
-        - 否则，使用 `text_wrap` 函数处理传入的文本（例如自动换行），
-          然后将处理后的文本设置到对话框标签上，并显示该标签。
-
-        依赖外部函数 `text_wrap` 来进行文本格式化处理。
+        - 否则，换上显示该文本的气泡并显示。气泡 (含 `text_wrap` 换行、字体与背景图)
+          由 `BubbleCache` 预先渲染并缓存，同一句话再次出现时只是换一张 QPixmap。
         """
         # 检查传入的文本是否等于特定的哨兵字符串 'None'
         if texts == 'None':
@@ -903,21 +1016,10 @@ class PetWidget(QWidget):
             self.dialogue.hide()
 
         else:
-            # 1. 使用外部函数 text_wrap 处理文本格式 (例如：自动换行)
-            #    确保 text_wrap 函数已定义或导入，并且能正确处理输入
-            try:
-                texts_wrapped = text_wrap(texts)
-            except NameError:
-                print(f"错误：text_wrap 函数未定义！将使用原始文本。")
-                texts_wrapped = texts  # 如果 text_wrap 不可用，则回退到原始文本
-            except Exception as e:
-                print(f"错误：调用 text_wrap 时出错: {e}。将使用原始文本。")
-                texts_wrapped = texts  # 其他异常也回退
-
-            # 2. 将处理（或原始）后的文本设置到对话框标签上
-            self.dialogue.setText(texts_wrapped)
+            # 1. 换上显示该文本的气泡：换行与绘制只在气泡缓存未命中时进行
+            self.dialogue.set_text(texts)
 
-            # 3. 显示对话框标签，使其可见
+            # 2. 显示对话框气泡，使其可见
             self.dialogue.show()
 
     def _change_status(self, status: str, change_value: float):
@@ -1130,6 +1232,11 @@ class PetWidget(QWidget):
                 # 此处假设如果 worker 不存在，可能 thread 也不可靠或不需停止
                 # return
             if module_name not in self.threads:
+                # 共享时钟驱动的工作者没有线程，kill 即可停止 (同时退订时钟)
+                worker = self.workers.get(module_name)
+                if getattr(worker, 'clock', None) is not None:
+                    worker.kill()
+                    return
                 print(f"[错误] stop_thread: 未找到名为 '{module_name}' 的线程对象。")
                 return  # 如果线程对象不存在，无法继续
 
@@ -1320,7 +1427,6 @@ class PetWidget(QWidget):
                         "[警告] show_tomato: 无法取消番茄钟，因为 'Scheduler' worker 或其 'cancel_tomato' 方法未找到。"
                     )
                 # 隐藏相关UI元素
-                self.tomatoicon.hide()
                 self.tomato_time.hide()
 
             else:
@@ -1333,7 +1439,7 @@ class PetWidget(QWidget):
 
         except AttributeError as e:
             print(
-                f"[错误] show_tomato: 访问必要的UI元素或属性时出错: {e}。请检查是否所有相关对象 (tomato_window, tomato_clock, tomatoicon, tomato_time, workers) 都已正确初始化。"
+                f"[错误] show_tomato: 访问必要的UI元素或属性时出错: {e}。请检查是否所有相关对象 (tomato_window, tomato_clock, tomato_time, workers) 都已正确初始化。"
             )
         except KeyError as e:
             print(
@@ -1350,7 +1456,7 @@ class PetWidget(QWidget):
         1. 将 `self.tomato_clock` 的文本更改为 "取消番茄时钟"。
         2. 隐藏番茄钟设置窗口 (`self.tomato_window`)。
         3. 调用调度器 (`self.workers['Scheduler']`) 的 `add_tomato` 方法，传入番茄钟数量 `nt`。
-        4. 显示番茄钟相关的图标 (`self.tomatoicon`) 和时间显示 (`self.tomato_time`)。
+        4. 显示番茄钟的状态条 (`self.tomato_time`)。
         """
         try:
             # 检查当前是否可以启动 (状态是否为"未运行")
@@ -1381,12 +1487,11 @@ class PetWidget(QWidget):
                 return
 
             # 4. 显示进行中的UI元素
-            self.tomatoicon.show()
             self.tomato_time.show()
 
         except AttributeError as e:
             print(
-                f"[错误] run_tomato: 访问必要的UI元素或属性时出错: {e}。请检查是否所有相关对象 (tomato_clock, tomato_window, tomatoicon, tomato_time, workers) 都已正确初始化。"
+                f"[错误] run_tomato: 访问必要的UI元素或属性时出错: {e}。请检查是否所有相关对象 (tomato_clock, tomato_window, tomato_time, workers) 都已正确初始化。"
             )
         except KeyError as e:
             print(
@@ -1401,7 +1506,7 @@ class PetWidget(QWidget):
 
         如果番茄钟当前状态为"正在运行"（通过 `self.tomato_clock` 的文本 "取消番茄时钟" 判断），则：
         1. 将 `self.tomato_clock` 的文本改回 "番茄时钟"。
-        2. 隐藏番茄钟相关的图标 (`self.tomatoicon`) 和时间显示 (`self.tomato_time`)。
+        2. 隐藏番茄钟的状态条 (`self.tomato_time`)。
 
         此方法主要负责UI状态的同步，不直接影响番茄钟的运行逻辑。
         """
@@ -1413,12 +1518,11 @@ class PetWidget(QWidget):
             self.tomato_clock.setText("番茄时钟")
 
             # 2. 隐藏进行中的UI元素
-            self.tomatoicon.hide()
             self.tomato_time.hide()
 
         except AttributeError as e:
             print(
-                f"[错误] change_tomato_menu: 访问必要的UI元素 (tomato_clock, tomatoicon, tomato_time) 时出错: {e}。请检查它们是否已正确初始化。"
+                f"[错误] change_tomato_menu: 访问必要的UI元素 (tomato_clock, tomato_time) 时出错: {e}。请检查它们是否已正确初始化。"
             )
         except Exception as e:
             print(f"[错误] change_tomato_menu: 执行菜单状态更改时发生未知错误: {e}")
@@ -1432,7 +1536,7 @@ class PetWidget(QWidget):
         2. 如果设置窗口不可见，并且专注状态为"正在运行"（通过 `self.focus_clock` 的文本判断为 "取消专注任务"），则：
            - 将 `self.focus_clock` 文本改回 "专注时间"。
            - 调用调度器 (`self.workers['Scheduler']`) 的 `cancel_focus` 方法。
-           - 隐藏专注任务相关的图标 (`self.focusicon`) 和时间显示 (`self.focus_time`)。
+           - 隐藏专注任务的状态条 (`self.focus_time`)。
         3. 如果设置窗口不可见，并且专注状态为"未运行"（文本为 "专注时间"），则：
            - 将设置窗口移动到当前主窗口的位置 (`self.pos()`)。
            - 显示设置窗口 (`self.focus_window`)。
@@ -1442,7 +1546,6 @@ class PetWidget(QWidget):
             required_attrs = [
                 'focus_window',
                 'focus_clock',
-                'focusicon',
                 'focus_time',
                 'workers',
             ]
@@ -1480,7 +1583,6 @@ class PetWidget(QWidget):
                     )
 
                 # 隐藏相关UI元素
-                self.focusicon.hide()
                 self.focus_time.hide()
 
             else:
@@ -1511,7 +1613,7 @@ class PetWidget(QWidget):
         2. 隐藏专注设置窗口 (`self.focus_window`)。
         3. 根据 `task` 参数 ('range' 或 'point') 调用调度器 (`self.workers['Scheduler']`) 的 `add_focus` 方法，
            并传递对应的时间参数 (`time_range=[hs, ms]` 或 `time_point=[hs, ms]`)。
-        4. 显示专注任务相关的图标 (`self.focusicon`) 和时间显示 (`self.focus_time`)。
+        4. 显示专注任务的状态条 (`self.focus_time`)。
 
         如果 `task` 参数无效，则打印错误并中止。
         """
@@ -1520,7 +1622,6 @@ class PetWidget(QWidget):
             required_attrs = [
                 'focus_clock',
                 'focus_window',
-                'focusicon',
                 'focus_time',
                 'workers',
             ]
@@ -1563,7 +1664,6 @@ class PetWidget(QWidget):
                     scheduler.add_focus(time_point=[hs, ms])
 
                 # 5. 显示进行中的UI元素
-                self.focusicon.show()
                 self.focus_time.show()
 
         except AttributeError as e:
@@ -1589,13 +1689,13 @@ class PetWidget(QWidget):
 
         如果专注任务当前状态为"正在运行"（通过 `self.focus_clock` 的文本 "取消专注任务" 判断），则：
         1. 将 `self.focus_clock` 的文本改回 "专注时间"。
-        2. 隐藏专注任务相关的图标 (`self.focusicon`) 和时间显示 (`self.focus_time`)。
+        2. 隐藏专注任务的状态条 (`self.focus_time`)。
 
         此方法主要负责UI状态的同步，不直接影响专注任务的运行逻辑。
         """
         try:
             # 入口检查：确保必要的UI元素存在
-            required_attrs = ['focus_clock', 'focusicon', 'focus_time']
+            required_attrs = ['focus_clock', 'focus_time']
             for attr in required_attrs:
                 if not hasattr(self, attr):
                     print(
@@ -1612,14 +1712,9 @@ class PetWidget(QWidget):
                     f"[错误] change_focus_menu: 'self.focus_clock' 对象缺少 text 或 setText 方法。操作中止。"
                 )
                 return
-            if not (
-                hasattr(self.focusicon, 'hide')
-                and callable(self.focusicon.hide)
-                and hasattr(self.focus_time, 'hide')
-                and callable(self.focus_time.hide)
-            ):
+            if not (hasattr(self.focus_time, 'hide') and callable(self.focus_time.hide)):
                 print(
-                    f"[错误] change_focus_menu: 'self.focusicon' 或 'self.focus_time' 对象缺少 hide 方法。操作中止。"
+                    f"[错误] change_focus_menu: 'self.focus_time' 对象缺少 hide 方法。操作中止。"
                 )
                 return
 
@@ -1630,7 +1725,6 @@ class PetWidget(QWidget):
                 self.focus_clock.setText("专注时间")
 
                 # 2. 隐藏进行中的UI元素
-                self.focusicon.hide()
                 self.focus_time.hide()
 
         except AttributeError as e:
@@ -1744,13 +1838,30 @@ class PetWidget(QWidget):
         2. 创建一个 `Animation_worker` 实例 (传入宠物配置) 并存储在 `self.workers['Animation']`。
         3. 将 `Animation_worker` 移动到新创建的线程中。
         4. 连接线程的 `started` 信号到工作者的 `run` 方法。
-        5. 连接工作者发出的信号 (`sig_setimg_anim`, `sig_move_anim`, `sig_repaint_anim`)
-           到主线程中对应的槽函数 (`self.set_img`, `self._move_customized`, `self.repaint`)。
+        5. 连接工作者每帧发出的 `sig_tick_anim` 到主线程的 `self.on_tick`，
+           换帧与移动在一次处理中完成。
+           精灵控件换帧时自行请求局部重绘，不再需要整窗 repaint。
         6. 启动线程。
         7. 允许线程被外部终止 (setTerminationEnabled)。
+
+        USE_SHARED_CLOCK 为 True 时跳过线程相关的步骤 (1、3、4、6、7)：
+        工作者订阅全应用共享的 AnimationClock，由时钟在 GUI 线程中推进帧序列。
         """
         module_name = 'Animation'
 
+        if USE_SHARED_CLOCK:
+            try:
+                self.workers[module_name] = Animation_worker(
+                    self.pet_conf, settings=self.settings, clock=AnimationClock.instance()
+                )
+                self.worker = self.workers[module_name]
+                self.worker.sig_tick_anim.connect(self.on_tick)
+                self.worker.set_throttled(not getattr(self, '_exposed', True))
+            except Exception as e:
+                print(f"[错误] runAnimation: 创建共享时钟驱动的 'Animation_worker' 失败: {e}")
+                self.workers.pop(module_name, None)
+            return
+
         try:
             # --- 核心逻辑 ---
             # 1. 创建线程对象
@@ -1784,26 +1895,15 @@ class PetWidget(QWidget):
             # 5. 连接工作者信号到主线程槽函数
             #    需要确保 worker 有这些信号，主线程有这些槽函数
             self.worker = self.workers[module_name]
-            if hasattr(self.worker, 'sig_setimg_anim'):
-                self.worker.sig_setimg_anim.connect(self.set_img)
-            else:
-                print(
-                    f"[警告] runAnimation: Animation_worker 缺少 sig_setimg_anim 信号。"
-                )
-
-            if hasattr(self.worker, 'sig_move_anim'):
-                self.worker.sig_move_anim.connect(self._move_customized)
+            if hasattr(self.worker, 'sig_tick_anim'):
+                self.worker.sig_tick_anim.connect(self.on_tick)
             else:
                 print(
-                    f"[警告] runAnimation: Animation_worker 缺少 sig_move_anim 信号。"
+                    f"[警告] runAnimation: Animation_worker 缺少 sig_tick_anim 信号。"
                 )
 
-            if hasattr(self.worker, 'sig_repaint_anim'):
-                self.worker.sig_repaint_anim.connect(self.repaint)
-            else:
-                print(
-                    f"[警告] runAnimation: Animation_worker 缺少 sig_repaint_anim 信号。"
-                )
+            # 窗口当前不可见时，新工作者从节流状态开始
+            self.worker.set_throttled(not getattr(self, '_exposed', True))
 
             # 6. 启动线程
             self.threads[module_name].start()
@@ -1838,42 +1938,41 @@ class PetWidget(QWidget):
         1. 创建一个新的 QThread 对象并存储在 `self.threads['Interaction']`。
         2. 创建一个 `Interaction_worker` 实例 (传入宠物配置) 并存储在 `self.workers['Interaction']`。
         3. 将 `Interaction_worker` 移动到新创建的线程中。
-        4. 连接工作者发出的信号 (`sig_setimg_inter`, `sig_move_inter`, `sig_act_finished`)
-           到主线程中对应的槽函数 (`self.set_img`, `self._move_customized`, `self.resume_animation`)。
+        4. 连接工作者发出的信号 (`sig_tick_inter`, `sig_act_finished`)
+           到主线程中对应的槽函数 (`self.on_tick`, `self.resume_animation`)。
         5. 启动线程。
         6. 允许线程被外部终止 (setTerminationEnabled)。
+
+        USE_SHARED_CLOCK 为 True 时跳过线程相关的步骤 (1、3、5、6)：
+        工作者由全应用共享的 AnimationClock 在 GUI 线程中驱动。
         """
         module_name = 'Interaction'
         try:
             # --- 核心逻辑 ---
-            # 1. 创建线程
-            self.threads[module_name] = QThread()
+            # 1. 创建线程 (共享时钟模式下不需要)
+            if not USE_SHARED_CLOCK:
+                self.threads[module_name] = QThread()
 
-            # 2. 创建
+            # 2. 创建工作者
+            clock = AnimationClock.instance() if USE_SHARED_CLOCK else None
             try:
-                self.workers[module_name] = Interaction_worker(self.pet_conf, settings = self.settings)
+                self.workers[module_name] = Interaction_worker(self.pet_conf, settings = self.settings, clock = clock)
             except Exception as e:
                 print(f"[错误] runInteraction: 创建 'Interaction_worker' 实例失败: {e}")
-                del self.threads[module_name]
+                self.threads.pop(module_name, None)
                 return
 
             # 3. 移动到线程
-            self.workers[module_name].moveToThread(self.threads[module_name])
+            if module_name in self.threads:
+                self.workers[module_name].moveToThread(self.threads[module_name])
 
             # 4. 连接工作者信号到主线程槽
             self.worker = self.workers[module_name]
-            if hasattr(self.worker, 'sig_setimg_inter'):
-                self.worker.sig_setimg_inter.connect(self.set_img)
-            else:
-                print(
-                    f"[警告] runInteraction: Interaction_worker 缺少 sig_setimg_inter 信号。"
-                )
-
-            if hasattr(self.worker, 'sig_move_inter'):
-                self.worker.sig_move_inter.connect(self._move_customized)
+            if hasattr(self.worker, 'sig_tick_inter'):
+                self.worker.sig_tick_inter.connect(self.on_tick)
             else:
                 print(
-                    f"[警告] runInteraction: Interaction_worker 缺少 sig_move_inter 信号。"
+                    f"[警告] runInteraction: Interaction_worker 缺少 sig_tick_inter 信号。"
                 )
 
             if hasattr(self.worker, 'sig_act_finished'):
@@ -1883,6 +1982,12 @@ class PetWidget(QWidget):
                     f"[警告] runInteraction: Interaction_worker 缺少 sig_act_finished 信号。"
                 )
 
+            # 窗口当前不可见时，新工作者从节流状态开始
+            self.worker.set_throttled(not getattr(self, '_exposed', True))
+
+            if module_name not in self.threads:
+                return
+
             # 6. 启动线程
             self.threads[module_name].start()
 
@@ -1910,6 +2015,8 @@ class PetWidget(QWidget):
         4. 连接 `Scheduler_worker` 发出的多个信号到主线程中对应的槽函数。
         5. 启动调度器线程(`self.threads['Scheduler']`)。
         6. 允许调度器线程被外部终止。
+
+        工作者所在的线程为交互线程；共享时钟模式下没有交互线程，工作者移到调度器自己的线程。
         """
         scheduler_module_name = 'Scheduler'
         interaction_thread_name = 'Interaction'
@@ -1927,8 +2034,9 @@ class PetWidget(QWidget):
                 del self.threads[scheduler_module_name]
                 return
 
+            host_thread_name = scheduler_module_name if USE_SHARED_CLOCK else interaction_thread_name
             self.workers[scheduler_module_name].moveToThread(
-                self.threads[interaction_thread_name]
+                self.threads[host_thread_name]
             )
 
             # 3. 连接调度器线程的 started 到 run (可能行为异常，见步骤3注释)
@@ -2020,8 +2128,7 @@ class PetWidget(QWidget):
                     if self.settings.onfloor == 0:
                         self.settings.onfloor = 1  # 标记为在地面上
                         # 设置默认站立图片
-                        self.settings.current_img = self.pet_conf.default.images[0]
-                        self.set_img()  # 更新显示图片
+                        self._show_default_frame()  # 更新显示图片
                         # 恢复动画
                         self.workers['Animation'].resume()
 
@@ -2078,6 +2185,23 @@ class PetWidget(QWidget):
         """
         self.workers['Animation'].resume()
 
+    def closeEvent(self, event) -> None:
+        """
+        窗口关闭时释放对共享角色包的引用，使其可以被帧缓存淘汰；
+        共享时钟驱动的工作者同时退订时钟，时钟不再推进已关闭的宠物；
+        叠加模式下同时从叠加窗口中移除。
+        """
+        for module_name in ('Animation', 'Interaction'):
+            worker = getattr(self, 'workers', {}).get(module_name)
+            if getattr(worker, 'clock', None) is not None:
+                worker.kill()
+        if getattr(self, 'overlay', None) is not None:
+            self.overlay.remove_pet(self)
+        if getattr(self, 'role_pack', None) is not None:
+            FrameCache.instance().release(self.role_pack.pet_name)
+            self.role_pack = None
+        super().closeEvent(event)
+
     def __del__(self):
         self.stop_thread('Animation')
         self.stop_thread('Interaction')
@@ -2086,22 +2210,6 @@ class PetWidget(QWidget):
 
 
 
-def _load_all_pic(pet_name: str) -> dict:
-    """
-    加载指定宠物名称对应的所有动作图片资源。
-
-    函数会查找 'res/role/{pet_name}/action/' 目录下的所有图片文件，
-    并将它们加载为图片对象 (通过 `_get_q_img` 函数)。
-    返回一个字典，其中键是动作名称 (通常是去掉扩展名的文件名)，值是加载的图片对象。
-    """
-    # 1. 构建图片目录路径
-    img_dir = 'res/role/{}/action/'.format(pet_name)
-    # 2. 列出目录中的所有文件/目录
-    images = os.listdir(img_dir)
-    # 3. 返回成功加载的图片字典
-    return {image.split('.')[0]: _get_q_img(img_dir + image) for image in images}
-
-
 def _build_act(name: str, parent: QObject, act_func) -> QAction:
     """
     构建一个 QAction 对象（菜单项或工具栏按钮）。
@@ -2126,59 +2234,6 @@ def _build_act(name: str, parent: QObject, act_func) -> QAction:
         return None
 
 
-def _get_q_img(img_path: str) -> Optional[QImage]:
-    """
-    从指定的路径加载图片为 QImage 对象。
-    """
-    try:
-        # 1. 创建空的 QImage 对象
-        image = QImage()
-
-        # 2. 尝试加载图片
-        #    QImage.load() 会返回 bool 值指示成功与否
-        if image.load(img_path):
-            # 3. 加载成功，返回 QImage 对象
-            return image
-        else:
-            # 4. 加载失败 (文件格式不支持、文件损坏等)
-            print(
-                f"[警告] _get_q_img: 无法加载图片 (可能格式不支持或文件损坏): '{img_path}'"
-            )
-            return None  # 返回 None 表示失败
-
-    except Exception as e:
-        # 捕获 QImage 构造、load 或 os.path.isfile 中可能发生的其他意外错误
-        print(f"[错误] _get_q_img: 加载图片 '{img_path}' 时发生未知错误: {e}")
-        return None
-
-
-def text_wrap(texts: str, line_length: int = 7) -> str:
-    """
-    将输入字符串按指定行长度进行换行处理。
-    """
-    try:
-        n_char = len(texts)
-        # 计算需要的行数 (向上取整)
-        n_line = (n_char + line_length - 1) // line_length
-
-        texts_wrapped = ''
-        # 逐行构建包装后的文本
-        for i in range(n_line):
-            start_index = line_length * i
-            # 使用切片获取当前行的子字符串，min() 确保不会超出字符串末尾
-            end_index = min(start_index + line_length, n_char)
-            texts_wrapped += texts[start_index:end_index] + '\n'
-
-        # 移除末尾多余的换行符
-        texts_wrapped = texts_wrapped.rstrip('\n')
-
-        return texts_wrapped
-
-    except Exception as e:
-        # 捕获在长度计算、切片或拼接中可能出现的意外错误
-        print(f"[错误] text_wrap: 处理文本换行时发生未知错误: {e}")
-        return ''  # 返回空字符串表示失败
-
 
 if __name__ == '__main__':
     """
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+角色包图集的离线构建工具。
+
+将 'res/role/{pet_name}/action/' 下的零散 PNG 帧打包为一张图集 (atlas.png)，
+并生成索引文件 (atlas.json)，记录每帧在图集中的矩形、按动作分组的帧列表与帧数。
+运行时由 Petal.conf.load_atlas 读取；没有图集时仍回退到零散 PNG 加载。
+
+用法（在项目根目录下）:
+    python -m Petal.atlas Doggy Kitty
+    python -m Petal.atlas            # 构建 data/pets.json 中的全部宠物
+"""
+
+import json
+import os
+import sys
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QGuiApplication, QImage, QPainter
+
+from Petal.conf import (ATLAS_FORMAT_VERSION, ATLAS_IMG_FILENAME, ATLAS_INDEX_FILENAME,
+                        RES_ROLE_PATH_TPL, action_dir_mtime, atlas_source_fingerprint, load_all_pic)
+from Petal.utils import log, read_json
+
+# 图集的最大宽度 (像素)，超出后换行
+ATLAS_MAX_WIDTH = 4096
+# 帧之间的留白，避免缩放采样时串色
+ATLAS_PADDING = 1
+
+
+def _split_frame_key(frame_key: str) -> tuple[str, int]:
+    """将 'leftwalk_3' 拆分为 ('leftwalk', 3)；无法解析序号的按第 0 帧处理。"""
+    base_name, _, index = frame_key.rpartition('_')
+    if not base_name or not index.isdigit():
+        return frame_key, 0
+    return base_name, int(index)
+
+
+def _pack_shelves(sizes: dict[str, tuple[int, int]]) -> tuple[dict[str, tuple[int, int, int, int]], int, int]:
+    """
+    简单的货架式装箱：按高度从大到小逐行排放。
+
+    返回 (每帧矩形 [x, y, w, h], 图集宽度, 图集高度)。
+    """
+    rects = {}
+    x = y = 0
+    shelf_height = 0
+    atlas_width = 0
+    for key in sorted(sizes, key=lambda k: (-sizes[k][1], k)):
+        w, h = sizes[key]
+        if x > 0 and x + w > ATLAS_MAX_WIDTH:
+            # 当前行放不下，换到下一行
+            y += shelf_height + ATLAS_PADDING
+            x = 0
+            shelf_height = 0
+        rects[key] = (x, y, w, h)
+        x += w + ATLAS_PADDING
+        shelf_height = max(shelf_height, h)
+        atlas_width = max(atlas_width, x - ATLAS_PADDING)
+    return rects, atlas_width, y + shelf_height
+
+
+def build_atlas(pet_name: str) -> str:
+    """
+    为指定宠物构建图集与索引文件，返回索引文件路径。
+    """
+    role_path = RES_ROLE_PATH_TPL.format(pet_name=pet_name)
+    log(f"开始构建图集: 宠物='{pet_name}'")
+
+    pic_dict = {key: img for key, img in load_all_pic(pet_name).items() if img is not None}
+    if not pic_dict:
+        raise FileNotFoundError(f"宠物 '{pet_name}' 的 action 目录下没有可用的图片。")
+
+    sizes = {key: (img.width(), img.height()) for key, img in pic_dict.items()}
+    rects, atlas_width, atlas_height = _pack_shelves(sizes)
+
+    # 将所有帧绘制到同一张透明图集上
+    atlas = QImage(atlas_width, atlas_height, QImage.Format_ARGB32)
+    atlas.fill(Qt.transparent)
+    painter = QPainter(atlas)
+    painter.setCompositionMode(QPainter.CompositionMode_Source)
+    for key, (x, y, _, _) in rects.items():
+        painter.drawImage(x, y, pic_dict[key])
+    painter.end()
+
+    # 按动作（图片基础名称）分组，帧按序号排列
+    acts: dict[str, list[str]] = {}
+    for key in sorted(rects, key=_split_frame_key):
+        base_name, _ = _split_frame_key(key)
+        acts.setdefault(base_name, []).append(key)
+
+    index = {
+        'version': ATLAS_FORMAT_VERSION,
+        'image': ATLAS_IMG_FILENAME,
+        'size': [atlas_width, atlas_height],
+        'source_mtime': action_dir_mtime(pet_name),
+        'source_fingerprint': atlas_source_fingerprint(pet_name, rects),
+        'frames': {key: list(rect) for key, rect in rects.items()},
+        'acts': acts,
+        'frame_counts': {base_name: len(keys) for base_name, keys in acts.items()},
+    }
+
+    atlas_path = os.path.join(role_path, ATLAS_IMG_FILENAME)
+    index_path = os.path.join(role_path, ATLAS_INDEX_FILENAME)
+    if not atlas.save(atlas_path, 'PNG'):
+        raise IOError(f"无法写入图集文件 '{atlas_path}'。")
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=1)
+
+    log(f"图集构建完成: {len(rects)} 帧, {len(acts)} 个动作, 尺寸 {atlas_width}x{atlas_height} -> '{atlas_path}'")
+    return index_path
+
+
+if __name__ == '__main__':
+    app = QGuiApplication(sys.argv)
+    pet_names = sys.argv[1:] or read_json('data/pets.json')
+    for name in pet_names:
+        build_atlas(name)
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+宠物的对话框气泡。
+
+原先每句话都经过 text_wrap → QLabel.setText，由样式表绘制背景图、再排版换行后的文本；
+而调度器显示的句子只有几十种 (问候语、番茄钟与专注时间的提示、提醒事项)。
+BubbleCache 把 "背景图 + 换行后的文本" 整个渲染成 QPixmap，按 (文本, 字体, 缩放, 颜色) 缓存在 LRU 中；
+BubbleWidget (不带样式表的 QLabel) 显示气泡时只是换一张 QPixmap。
+"""
+
+from collections import OrderedDict
+from typing import Optional
+
+from PyQt5.QtCore import QRect, Qt, pyqtSignal
+from PyQt5.QtGui import QColor, QFont, QPainter, QPalette, QPixmap
+from PyQt5.QtWidgets import QLabel, QWidget
+
+# 气泡背景图，气泡控件的尺寸与其一致
+BUBBLE_BACKGROUND = 'res/icons/text_framex2.png'
+# LRU 中最多保留的气泡数量
+DEFAULT_MAX_BUBBLES = 64
+
+
+def text_wrap(texts: str, line_length: int = 7) -> str:
+    """
+    将输入字符串按指定行长度进行换行处理。
+    """
+    try:
+        n_char = len(texts)
+        # 计算需要的行数 (向上取整)
+        n_line = (n_char + line_length - 1) // line_length
+
+        texts_wrapped = ''
+        # 逐行构建包装后的文本
+        for i in range(n_line):
+            start_index = line_length * i
+            # 使用切片获取当前行的子字符串，min() 确保不会超出字符串末尾
+            end_index = min(start_index + line_length, n_char)
+            texts_wrapped += texts[start_index:end_index] + '\n'
+
+        # 移除末尾多余的换行符
+        texts_wrapped = texts_wrapped.rstrip('\n')
+
+        return texts_wrapped
+
+    except Exception as e:
+        # 捕获在长度计算、切片或拼接中可能出现的意外错误
+        print(f"[错误] text_wrap: 处理文本换行时发生未知错误: {e}")
+        return ''  # 返回空字符串表示失败
+
+
+class BubbleCache:
+    """
+    单例气泡缓存，只能在 GUI 线程中使用。
+
+    缓存键为 (文本, QFont.key(), 设备像素比, 文字颜色)，超过 max_bubbles 时淘汰最久未显示的气泡。
+    hits / misses 统计命中与未命中 (需要渲染) 的次数。
+    """
+
+    _instance: Optional['BubbleCache'] = None
+
+    @staticmethod
+    def instance() -> 'BubbleCache':
+        if BubbleCache._instance is None:
+            BubbleCache._instance = BubbleCache()
+        return BubbleCache._instance
+
+    def __init__(self, max_bubbles: int = DEFAULT_MAX_BUBBLES):
+        self.max_bubbles: int = max_bubbles
+        self._bubbles: OrderedDict[tuple, QPixmap] = OrderedDict()
+        self._background: Optional[QPixmap] = None
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @property
+    def background(self) -> QPixmap:
+        """气泡背景图，首次访问时加载。"""
+        if self._background is None:
+            self._background = QPixmap(BUBBLE_BACKGROUND)
+            if self._background.isNull():
+                print(f"[警告] 对话框背景图未找到: '{BUBBLE_BACKGROUND}'。")
+        return self._background
+
+    def bubble(self, text: str, font: QFont, scale: float, color: QColor) -> QPixmap:
+        """返回显示 text 的气泡，未缓存时渲染并放入 LRU。"""
+        key = (text, font.key(), scale, color.rgba())
+        pixmap = self._bubbles.get(key)
+        if pixmap is not None:
+            self._bubbles.move_to_end(key)
+            self.hits += 1
+            return pixmap
+        self.misses += 1
+        pixmap = self._render(text_wrap(text), font, scale, color)
+        self._bubbles[key] = pixmap
+        while len(self._bubbles) > self.max_bubbles:
+            self._bubbles.popitem(last=False)
+        return pixmap
+
+    def _render(self, texts_wrapped: str, font: QFont, scale: float, color: QColor) -> QPixmap:
+        """背景图左上角对齐，换行后的文本在气泡中居中 (与原先 QLabel 的样式表、对齐方式一致)。"""
+        size = self.background.size()
+        pixmap = QPixmap(size * scale)
+        pixmap.setDevicePixelRatio(scale)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.drawPixmap(0, 0, self.background)
+        painter.setFont(font)
+        painter.setPen(color)
+        painter.drawText(QRect(0, 0, size.width(), size.height()), Qt.AlignCenter, texts_wrapped)
+        painter.end()
+        return pixmap
+
+    def stats(self) -> dict[str, int]:
+        """返回命中、未命中次数与当前缓存的气泡数。"""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._bubbles)}
+
+    def clear(self) -> None:
+        """清空缓存 (例如字体或背景图变化后)；统计保留。"""
+        self._bubbles.clear()
+        self._background = None
+
+
+class BubbleWidget(QLabel):
+    """
+    显示对话框气泡的标签，尺寸固定为背景图的尺寸，不使用样式表。
+
+    set_text 从 BubbleCache 取得 (或渲染) 气泡 QPixmap 并换上；同一张 QPixmap 不重复设置。
+    显示 / 隐藏、位置或尺寸变化时发出 sig_area_changed，供宠物窗口更新遮罩。
+    """
+
+    sig_area_changed = pyqtSignal()
+
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.setFixedSize(BubbleCache.instance().background.size())
+        self._text: str = ''
+        self._pixmap: Optional[QPixmap] = None
+
+    def text(self) -> str:
+        """当前显示的文本 (未换行)。"""
+        return self._text
+
+    def set_text(self, text: str) -> None:
+        """切换到显示 text 的气泡。"""
+        pixmap = BubbleCache.instance().bubble(
+            text, self.font(), self.devicePixelRatioF(), self.palette().color(QPalette.WindowText)
+        )
+        self._text = text
+        if pixmap is self._pixmap:
+            return
+        self._pixmap = pixmap
+        self.setPixmap(pixmap)
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        self.sig_area_changed.emit()
+
+    def hideEvent(self, event) -> None:
+        super().hideEvent(event)
+        self.sig_area_changed.emit()
+
+    def moveEvent(self, event) -> None:
+        super().moveEvent(event)
+        self.sig_area_changed.emit()
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self.sig_area_changed.emit()
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+全应用共享的动画时钟。
+
+AnimationClock 用一个与显示器刷新率对齐的 QTimer 驱动所有宠物：每次触发时按订阅顺序
+调用各订阅者的 advance(now)，由订阅者自行判断本帧是否到期并发出 tick，
+所有宠物的换帧与移动在同一次事件处理中完成，不再是每只宠物一个线程各自在不相关的时刻唤醒。
+
+全局帧率上限与省电模式也由时钟统一管理：frame_budget 为每帧的最短时长，
+短于它的帧由订阅者合并；没有订阅者需要全速 (拖拽、掉落) 时，定时器按帧预算的间隔触发。
+"""
+
+import time
+from typing import Optional, Protocol
+
+from PyQt5.QtCore import QObject, Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import QGuiApplication
+
+# 无法获取显示器刷新率时使用的默认值 (Hz)
+DEFAULT_REFRESH_RATE = 60.0
+# 为 False 时恢复旧行为：每只宠物一个动画线程 (time.sleep 定速)，交互使用各自的 QTimer
+USE_SHARED_CLOCK = True
+# 设置页与托盘菜单中可选的帧率上限 (0 表示不限)
+FPS_CAP_CHOICES = (0, 60, 30, 15)
+# 省电模式下的帧率上限；与手动设置的上限同时生效时取较低者
+POWER_SAVER_FPS = 10
+
+
+class ClockSubscriber(Protocol):
+    """
+    时钟订阅者：advance 由时钟在 GUI 线程中调用，now 为 time.monotonic() 时间 (秒)，
+    返回本次是否有更新 (发出了 tick 或执行了交互)。
+    needs_full_rate 为 True 时 (例如正在拖拽)，时钟不按帧预算放慢。
+    """
+
+    def advance(self, now: float) -> bool: ...
+
+    def needs_full_rate(self) -> bool: ...
+
+
+def display_interval_ms() -> int:
+    """主屏幕一帧的时长 (毫秒)，至少为 1。"""
+    screen = QGuiApplication.primaryScreen()
+    refresh_rate = screen.refreshRate() if screen is not None else 0.0
+    if refresh_rate <= 0:
+        refresh_rate = DEFAULT_REFRESH_RATE
+    return max(1, round(1000 / refresh_rate))
+
+
+class AnimationClock(QObject):
+    """
+    单例动画时钟，只能在 GUI 线程中使用。
+
+    有常规订阅者时定时器才运行；只剩后置订阅者 (它们只同步常规订阅者的变化) 或没有订阅者时
+    定时器停止，应用空闲、宠物全部不可见时不再唤醒。
+    帧率上限或省电模式变化时发出 sig_profile_changed，供设置页与托盘菜单同步显示。
+    """
+
+    sig_profile_changed = pyqtSignal()
+
+    _instance: Optional['AnimationClock'] = None
+
+    @staticmethod
+    def instance() -> 'AnimationClock':
+        if AnimationClock._instance is None:
+            AnimationClock._instance = AnimationClock()
+        return AnimationClock._instance
+
+    def __init__(self, interval_ms: Optional[int] = None, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.interval_ms: int = interval_ms if interval_ms is not None else display_interval_ms()
+        self._subscribers: list[ClockSubscriber] = []  # 后置订阅者排在末尾
+        self._late_subscribers: set[ClockSubscriber] = set()
+        self.fps_cap: int = 0  # 帧率上限，0 表示不限
+        self.power_saver: bool = False
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self._on_timeout)
+
+        # 统计：时钟触发次数，以及订阅者报告的更新总数
+        self.passes: int = 0
+        self.updates: int = 0
+
+    @property
+    def subscribers(self) -> tuple[ClockSubscriber, ...]:
+        return tuple(self._subscribers)
+
+    @property
+    def effective_fps(self) -> int:
+        """当前生效的帧率上限 (0 表示不限)：手动上限与省电模式上限中较低者。"""
+        caps = [fps for fps in (self.fps_cap, POWER_SAVER_FPS if self.power_saver else 0) if fps > 0]
+        return min(caps) if caps else 0
+
+    @property
+    def frame_budget(self) -> float:
+        """每帧的最短时长 (秒)，0 表示不限。"""
+        fps = self.effective_fps
+        return 1 / fps if fps > 0 else 0.0
+
+    def set_fps_cap(self, fps: int) -> None:
+        """设置全局帧率上限 (0 表示不限)。"""
+        if fps == self.fps_cap:
+            return
+        self.fps_cap = max(0, int(fps))
+        self.retime()
+        self.sig_profile_changed.emit()
+
+    def set_power_saver(self, enabled: bool) -> None:
+        """开启 / 关闭省电模式。"""
+        if enabled == self.power_saver:
+            return
+        self.power_saver = bool(enabled)
+        self.retime()
+        self.sig_profile_changed.emit()
+
+    def retime(self) -> None:
+        """
+        按需调整定时器间隔：有订阅者需要全速时用显示器刷新间隔，否则放慢到帧预算的间隔。
+        """
+        interval = self.interval_ms
+        if not any(subscriber.needs_full_rate() for subscriber in self._subscribers):
+            interval = max(interval, round(self.frame_budget * 1000))
+        if self.timer.isActive() and self.timer.interval() != interval:
+            self.timer.setInterval(interval)
+
+    def subscribe(self, subscriber: ClockSubscriber, last: bool = False) -> None:
+        """
+        加入订阅者（重复订阅无效），必要时启动定时器。
+        last 为 True 的订阅者总在其余订阅者之后推进 (例如在所有宠物换帧之后统一重绘的叠加窗口)。
+        """
+        if subscriber in self._subscribers:
+            return
+        if last:
+            self._late_subscribers.add(subscriber)
+            self._subscribers.append(subscriber)
+        else:
+            n_normal = len(self._subscribers) - len(self._late_subscribers)
+            self._subscribers.insert(n_normal, subscriber)
+        if not self.timer.isActive() and self._has_regular_subscribers():
+            self.timer.start(self.interval_ms)
+            self.retime()
+
+    def unsubscribe(self, subscriber: ClockSubscriber) -> None:
+        """移除订阅者；没有常规订阅者时停止定时器。"""
+        try:
+            self._subscribers.remove(subscriber)
+        except ValueError:
+            return
+        self._late_subscribers.discard(subscriber)
+        if not self._has_regular_subscribers():
+            self.timer.stop()
+
+    def _has_regular_subscribers(self) -> bool:
+        return len(self._subscribers) > len(self._late_subscribers)
+
+    def _on_timeout(self) -> None:
+        """一次遍历推进全部订阅者；订阅者可能在 advance 中退订，因此遍历副本。"""
+        now = time.monotonic()
+        self.passes += 1
+        for subscriber in tuple(self._subscribers):
+            if subscriber.advance(now):
+                self.updates += 1
+        self.retime()
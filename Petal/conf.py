@@ -4,84 +4,560 @@
 
 PetConfig: 加载和管理宠物的静态配置（外观、行为、动作）。
 Act: 代表宠物的一个具体动作，包含动画帧和参数。
+ActSchedule: 动作编译后的只读播放表，两个工作者按下标查表推进。
 PetData: 管理宠物的动态状态（HP、EM、物品），并进行持久化存储。
 """
 
 import json
-import glob
+import hashlib
+import itertools
+import math
 import os.path
+import threading
 import time
-from typing import Optional
+from typing import Callable, Optional
 
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QImage 
 
+from Petal.raw_cache import frame_digest, stat_fingerprint
+
 RES_ROLE_PATH_TPL = 'res/role/{pet_name}/'
 PET_CONF_FILENAME = 'pet_conf.json'
 ACT_CONF_FILENAME = 'act_conf.json'
 ACTION_IMG_PATH_TPL = 'action/{image_base_name}'
 DATA_PATH_TPL = 'data/{pet_name}.json'
+ACTION_DIR_TPL = 'res/role/{pet_name}/action/'
+ATLAS_IMG_FILENAME = 'atlas.png'
+ATLAS_INDEX_FILENAME = 'atlas.json'
+ATLAS_FORMAT_VERSION = 2
+MANIFEST_CACHE_PATH_TPL = 'cache/manifest/{pet_name}.json'
+MANIFEST_FORMAT_VERSION = 1
+# 帧标识 (动作编号, 帧序号, 标志位) 中的标志位：显示水平镜像后的帧
+FRAME_MIRRORED = 1
+# 镜像动作未显式给出 direction 时，由源动作的方向翻转得到
+MIRRORED_DIRECTIONS = {'left': 'right', 'right': 'left'}
+# PetConfig 实例的代号计数：每个配置 (每只宠物、每个大小分档) 的代号都不同
+_config_generations = itertools.count(1)
+
+
+def load_act_frames(pic_dict: dict[str, QImage],
+                    image_base_name: str,
+                    scale: float,
+                    pet_name: str,
+                    n_images: Optional[int] = None) -> tuple[QImage, ...]:
+    """
+    从预加载图片中取出某个动作的全部帧，并按 scale 缩放。
+
+    n_images 为已知的帧数（例如来自图集索引）；未提供时从动作清单中获取。
+    """
+    if n_images is None:
+        n_images = count_act_frames(pet_name, image_base_name)
+    elif n_images <= 0:
+        raise FileNotFoundError(f"宠物 '{pet_name}' 没有动作 '{image_base_name}' 的帧。")
+
+    processed_images = []
+    for i in range(n_images):
+        image_key = f"{image_base_name}_{i}"
+        try:
+            original_image = pic_dict[image_key]
+        except KeyError:
+            raise KeyError(f"图片字典 (pic_dict) 中缺少键 '{image_key}'，无法加载动作 '{image_base_name}' 的第 {i} 帧。")
+
+        processed_images.append(scale_image(original_image, scale))
+
+    return tuple(processed_images)
+
+
+def count_act_frames(pet_name: str, image_base_name: str) -> int:
+    """根据动作清单返回某个动作的帧图片数量。"""
+    n_images = action_manifest(pet_name).get(image_base_name, 0)
+    if n_images <= 0:
+        action_dir = ACTION_DIR_TPL.format(pet_name=pet_name)
+        raise FileNotFoundError(f"在 '{action_dir}' 目录下找不到名为 '{image_base_name}_*.png' 的图片文件。")
+    return n_images
+
+
+def act_frame_files(pet_name: str, image_base_name: str, n_images: int) -> list[str]:
+    """按帧序号返回某个动作的源 PNG 文件路径列表。"""
+    action_dir = ACTION_DIR_TPL.format(pet_name=pet_name)
+    return [os.path.join(action_dir, f'{image_base_name}_{i}.png') for i in range(n_images)]
+
+
+def load_act_pics(pet_name: str, image_base_name: str, n_images: int) -> dict[str, QImage]:
+    """只解码某一个动作的零散 PNG 帧，返回与 pic_dict 相同键格式的字典。"""
+    return {
+        f'{image_base_name}_{i}': _get_q_img(path)
+        for i, path in enumerate(act_frame_files(pet_name, image_base_name, n_images))
+    }
+
+
+def scale_image(image: QImage, scale: float) -> QImage:
+    """按比例平滑缩放单帧图片。"""
+    return image.scaled(
+        int(image.width() * scale),
+        int(image.height() * scale),
+        aspectRatioMode=Qt.KeepAspectRatio,
+        transformMode=Qt.SmoothTransformation # 添加平滑变换以获得更好的效果
+    )
+
+
+def mirror_frames(images: tuple[QImage, ...]) -> tuple[QImage, ...]:
+    """水平镜像一组已缩放的帧。"""
+    return tuple(img.mirrored(True, False) for img in images)
+
+
+def action_dir_mtime(pet_name: str) -> float:
+    """返回宠物 action 目录的修改时间，用于判断离线生成的缓存是否过期。"""
+    return os.path.getmtime(ACTION_DIR_TPL.format(pet_name=pet_name))
+
+
+# 进程内已读取的动作清单，按宠物名称索引
+_manifests: dict[str, dict[str, int]] = {}
+_manifests_lock = threading.Lock()
+
+
+def scan_action_dir(pet_name: str) -> dict[str, int]:
+    """
+    扫描一次宠物的 action 目录，返回 {图片基础名称: 帧数}。
+
+    帧文件名形如 '{图片基础名称}_{序号}.png'，序号须从 0 开始连续；
+    出现缺号时只保留缺号之前的帧并打印警告。
+    """
+    action_dir = ACTION_DIR_TPL.format(pet_name=pet_name)
+    indices: dict[str, set[int]] = {}
+    with os.scandir(action_dir) as entries:
+        for entry in entries:
+            stem, ext = os.path.splitext(entry.name)
+            base_name, _, index = stem.rpartition('_')
+            if ext.lower() != '.png' or not base_name or not index.isdigit():
+                continue
+            indices.setdefault(base_name, set()).add(int(index))
+
+    manifest = {}
+    for base_name in sorted(indices):
+        n_images = 0
+        while n_images in indices[base_name]:
+            n_images += 1
+        if n_images != len(indices[base_name]):
+            print(f"[警告] scan_action_dir: '{action_dir}' 中动作 '{base_name}' 的帧序号不连续，只使用前 {n_images} 帧。")
+        if n_images > 0:
+            manifest[base_name] = n_images
+    return manifest
+
+
+def action_manifest(pet_name: str) -> dict[str, int]:
+    """
+    返回宠物的动作清单 {图片基础名称: 帧数}。
+
+    清单缓存在 'cache/manifest/{pet_name}.json' 中，以 action 目录的修改时间为指纹；
+    指纹一致时直接读取，不列目录。进程内只读取一次。
+    """
+    with _manifests_lock:
+        manifest = _manifests.get(pet_name)
+        if manifest is not None:
+            return manifest
+
+        fingerprint = action_dir_mtime(pet_name)
+        cache_path = MANIFEST_CACHE_PATH_TPL.format(pet_name=pet_name)
+        try:
+            with open(cache_path, 'r', encoding='UTF-8') as f:
+                cached = json.load(f)
+            if cached.get('version') == MANIFEST_FORMAT_VERSION and cached.get('fingerprint') == fingerprint:
+                manifest = {base_name: int(n) for base_name, n in cached['frame_counts'].items()}
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError, OSError) as e:
+            print(f"[警告] action_manifest: 动作清单缓存 '{cache_path}' 无效: {e}，重新扫描。")
+
+        if manifest is None:
+            manifest = scan_action_dir(pet_name)
+            try:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                with open(cache_path, 'w', encoding='utf-8') as f:
+                    json.dump({
+                        'version': MANIFEST_FORMAT_VERSION,
+                        'fingerprint': fingerprint,
+                        'frame_counts': manifest,
+                    }, f, ensure_ascii=False, indent=1)
+            except OSError as e:
+                print(f"[警告] action_manifest: 无法写入动作清单缓存 '{cache_path}': {e}")
+
+        _manifests[pet_name] = manifest
+        return manifest
+
+
+def invalidate_action_manifest(pet_name: str) -> None:
+    """丢弃进程内的动作清单（例如工具修改了 action 目录之后）。"""
+    with _manifests_lock:
+        _manifests.pop(pet_name, None)
+
+
+def atlas_source_fingerprint(pet_name: str, frame_keys) -> str:
+    """
+    图集各源 PNG 帧 ('action/{帧键}.png') 的指纹 (名称、大小与修改时间，见 stat_fingerprint)。
+    源文件缺失时抛出 OSError。
+    """
+    action_dir = ACTION_DIR_TPL.format(pet_name=pet_name)
+    return stat_fingerprint([os.path.join(action_dir, f'{key}.png') for key in sorted(frame_keys)]).hex()
+
+
+def read_atlas_index(pet_name: str) -> Optional[dict]:
+    """
+    读取并校验宠物的图集索引 (atlas.json)，不解码图集本身。
+
+    索引不存在、版本不符或已过期时返回 None。有 action 目录时校验是否过期：
+    目录的修改时间反映帧文件的增删与改名，源帧的指纹反映原地覆盖；
+    没有 action 目录 (只发布了图集) 时直接信任索引。
+    """
+    role_path = RES_ROLE_PATH_TPL.format(pet_name=pet_name)
+    index_path = os.path.join(role_path, ATLAS_INDEX_FILENAME)
+    if not os.path.isfile(index_path):
+        return None
+
+    try:
+        with open(index_path, 'r', encoding='UTF-8') as f:
+            index = json.load(f)
+
+        if index.get('version') != ATLAS_FORMAT_VERSION:
+            print(f"[警告] read_atlas_index: 图集索引 '{index_path}' 版本不符，回退到零散图片。")
+            return None
+        if os.path.isdir(ACTION_DIR_TPL.format(pet_name=pet_name)):
+            if action_dir_mtime(pet_name) > float(index.get('source_mtime', 0)):
+                print(f"[警告] read_atlas_index: 图集 '{index_path}' 早于 action 目录的修改，回退到零散图片。")
+                return None
+            try:
+                fingerprint = atlas_source_fingerprint(pet_name, index['frames'])
+            except OSError:
+                fingerprint = None
+            if fingerprint != index.get('source_fingerprint'):
+                print(f"[警告] read_atlas_index: 图集 '{index_path}' 的源帧已被修改，回退到零散图片。")
+                return None
+        return index
+
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError, OSError) as e:
+        print(f"[警告] read_atlas_index: 读取图集索引 '{index_path}' 失败: {e}，回退到零散图片。")
+        return None
+
+
+def atlas_files(pet_name: str, index: dict) -> list[str]:
+    """返回图集的源文件路径列表 (图集图片与索引)。"""
+    role_path = RES_ROLE_PATH_TPL.format(pet_name=pet_name)
+    return [os.path.join(role_path, index.get('image', ATLAS_IMG_FILENAME)),
+            os.path.join(role_path, ATLAS_INDEX_FILENAME)]
+
+
+def load_atlas(pet_name: str, index: Optional[dict] = None) -> Optional[tuple[dict[str, QImage], dict[str, int]]]:
+    """
+    从预编译的图集 (atlas.png + atlas.json) 加载宠物的全部动作帧。
+
+    整张图集只解码一次，每帧按索引中的矩形从图集中截取。
+    返回 (图片字典, 各动作帧数)；图集不可用时返回 None。
+    """
+    if index is None:
+        index = read_atlas_index(pet_name)
+        if index is None:
+            return None
+
+    try:
+        atlas = _get_q_img(atlas_files(pet_name, index)[0])
+        if atlas is None:
+            return None
+
+        pic_dict = {
+            key: atlas.copy(x, y, w, h)
+            for key, (x, y, w, h) in index['frames'].items()
+        }
+        frame_counts = {base_name: int(n) for base_name, n in index['frame_counts'].items()}
+        return pic_dict, frame_counts
+
+    except (KeyError, TypeError, ValueError) as e:
+        print(f"[警告] load_atlas: 宠物 '{pet_name}' 的图集索引内容无效: {e}，回退到零散图片。")
+        return None
+
+
+def load_pic_dict(pet_name: str) -> tuple[dict[str, QImage], Optional[dict[str, int]]]:
+    """
+    加载宠物的全部动作帧：优先使用图集，不存在时回退到逐个加载零散 PNG。
+
+    返回 (图片字典, 各动作帧数)；走零散 PNG 路径时帧数为 None。
+    """
+    atlas = load_atlas(pet_name)
+    if atlas is not None:
+        return atlas
+    return load_all_pic(pet_name), None
+
+
+def load_all_pic(pet_name: str) -> dict[str, QImage]:
+    """
+    加载指定宠物名称对应的所有动作图片资源。
+
+    按动作清单加载 'res/role/{pet_name}/action/' 目录下的全部帧图片 (通过 `_get_q_img` 函数)。
+    返回一个字典，其中键是去掉扩展名的文件名 (如 'leftwalk_0')，值是加载的图片对象。
+    """
+    pic_dict = {}
+    for image_base_name, n_images in action_manifest(pet_name).items():
+        pic_dict.update(load_act_pics(pet_name, image_base_name, n_images))
+    return pic_dict
+
+
+def _get_q_img(img_path: str) -> Optional[QImage]:
+    """
+    从指定的路径加载图片为 QImage 对象。
+    """
+    try:
+        # 1. 创建空的 QImage 对象
+        image = QImage()
+
+        # 2. 尝试加载图片
+        #    QImage.load() 会返回 bool 值指示成功与否
+        if image.load(img_path):
+            # 3. 加载成功，返回 QImage 对象
+            return image
+        else:
+            # 4. 加载失败 (文件格式不支持、文件损坏等)
+            print(
+                f"[警告] _get_q_img: 无法加载图片 (可能格式不支持或文件损坏): '{img_path}'"
+            )
+            return None  # 返回 None 表示失败
+
+    except Exception as e:
+        # 捕获 QImage 构造、load 或 os.path.isfile 中可能发生的其他意外错误
+        print(f"[错误] _get_q_img: 加载图片 '{img_path}' 时发生未知错误: {e}")
+        return None
+
+
+class FramePool:
+    """
+    一个宠物配置内共享的已缩放帧池。
+
+    以 (图片基础名称, 缩放比例) 为键缓存帧序列，多个动作引用同一组图片时只缩放、保存一份，
+    bytes_shared 统计因此少保存的像素字节数；
+    同时按像素内容摘要合并逐字节相同的帧（例如不同动作中重复出现的同一帧），
+    bytes_deduped 统计因此少保存的像素字节数。
+    """
+
+    def __init__(self):
+        self.frames: dict[tuple, tuple[QImage, ...]] = {}
+        self._by_content: dict[tuple, QImage] = {}
+        self._digests: dict[int, bytes] = {}  # 池中各帧 (QImage.cacheKey) 的像素内容摘要
+        self._lock = threading.Lock()
+        self.frames_total: int = 0   # 加入池中的帧数
+        self.frames_unique: int = 0  # 像素内容互不相同的帧数
+        self.bytes_deduped: int = 0  # 合并内容相同的帧节省的字节数
+        self.bytes_shared: int = 0   # 多个动作共用同一帧序列节省的字节数
+
+    def lookup(self, key: tuple) -> Optional[tuple[QImage, ...]]:
+        """返回已缓存的帧序列，未缓存时返回 None。"""
+        with self._lock:
+            return self.frames.get(key)
+
+    def get(self,
+            key: tuple,
+            loader: Callable[[], tuple[QImage, ...]],
+            digests: Optional[tuple[bytes, ...]] = None) -> tuple[QImage, ...]:
+        """
+        按键获取帧序列，未缓存时调用 loader 加载并合并重复帧 (digests 见 add)。
+
+        命中缓存时，调用方（通常是又一个动作）不再持有自己的一份，计入 bytes_shared。
+        """
+        with self._lock:
+            frames = self.frames.get(key)
+            if frames is not None:
+                self.bytes_shared += sum(img.sizeInBytes() for img in frames)
+                return frames
+        return self.add(key, loader(), digests)
+
+    def get_mirrored(self, key: tuple, source: tuple[QImage, ...]) -> tuple[QImage, ...]:
+        """
+        按键获取 source (池中的帧) 水平镜像后的帧序列。
+
+        相同的源帧镜像后仍相同，镜像帧的摘要由源帧的摘要导出，不再读取像素。
+        """
+        with self._lock:
+            source_digests = [self._digests.get(img.cacheKey()) for img in source]
+        digests = None
+        if None not in source_digests:
+            digests = tuple(hashlib.blake2b(b'mirror:' + digest, digest_size=16).digest()
+                            for digest in source_digests)
+        return self.get(key, lambda: mirror_frames(source), digests)
+
+    def add(self,
+            key: tuple,
+            frames: tuple[QImage, ...],
+            digests: Optional[tuple[bytes, ...]] = None) -> tuple[QImage, ...]:
+        """
+        将新加载的帧序列放入池中并返回合并后的序列；键已存在时直接返回已有序列。
+
+        digests 为已知的各帧像素内容摘要（例如来自磁盘缓存，见 raw_cache.frame_digest），
+        未提供时在此计算。
+        """
+        if digests is None:
+            # 经 get 加载的帧序列通常已由帧缓存放入本池，此时不再计算摘要
+            existing = self.lookup(key)
+            if existing is not None:
+                return existing
+            digests = tuple(frame_digest(img) for img in frames)
+        keys = [self._content_key(img, digest) for img, digest in zip(frames, digests)]
+        with self._lock:
+            existing = self.frames.get(key)
+            if existing is not None:
+                return existing
+            interned = []
+            for img, digest, content_key in zip(frames, digests, keys):
+                shared = self._by_content.get(content_key)
+                if shared is not None and shared == img:
+                    self.bytes_deduped += img.sizeInBytes()
+                    interned.append(shared)
+                else:
+                    self._by_content[content_key] = img
+                    self._digests[img.cacheKey()] = digest
+                    self.frames_unique += 1
+                    interned.append(img)
+            self.frames_total += len(frames)
+            self.frames[key] = tuple(interned)
+            return self.frames[key]
+
+    def stats(self) -> dict[str, int]:
+        """返回去重统计：总帧数、不重复帧数、合并相同内容与共用帧序列各自节省的字节数。"""
+        with self._lock:
+            return {
+                'frames_total': self.frames_total,
+                'frames_unique': self.frames_unique,
+                'bytes_deduped': self.bytes_deduped,
+                'bytes_shared': self.bytes_shared,
+            }
+
+    @staticmethod
+    def _content_key(img: QImage, digest: bytes) -> tuple:
+        """帧的尺寸、格式与像素内容摘要。"""
+        return img.width(), img.height(), int(img.format()), img.bytesPerLine(), digest
+
+
+class ActSchedule:
+    """
+    动作编译后的只读播放表。
+
+    整个动作 (帧序列重复 act_num 次) 展开为 len(schedule) 步，第 i 步显示 frame_index[i] 帧。
+    帧时长与窗口位移对动作内的每一步都相同，只保存一份 (duration, dx, dy)。
+    """
+
+    __slots__ = ('frame_index', 'duration', 'dx', 'dy')
+
+    def __init__(self, act: 'Act'):
+        self.frame_index: tuple[int, ...] = tuple(range(len(act.images))) * act.act_num
+        self.duration: float = act.frame_refresh
+        self.dx, self.dy = act.offset
+
+    def __len__(self) -> int:
+        return len(self.frame_index)
+
+    def ticks_per_step(self, tick_interval_ms: float) -> int:
+        """按固定间隔 tick 播放时 (交互工作者)，每步占用的 tick 数：ceil(帧时长 / tick 间隔)，至少一个。"""
+        return max(1, math.ceil(self.duration * 1000 / tick_interval_ms))
+
 
 class Act:
     """
     代表宠物的一个具体动作。
 
     封装了执行该动作所需的动画帧图像序列和相关参数。
+    帧序列可以延迟加载：构造时只传入 image_loader，第一次访问 images 时才解码。
     """
     def __init__(self,
-                 images: tuple[QImage, ...], 
+                 images: Optional[tuple[QImage, ...]] = None,
                  act_num: int = 1,
                  need_move: bool = False,
                  direction: Optional[str] = None,
                  frame_move: float = 10.0, 
-                 frame_refresh: float = 0.04):
+                 frame_refresh: float = 0.04,
+                 image_loader: Optional[Callable[[], tuple[QImage, ...]]] = None):
         """
         初始化一个动作实例。
+
+        images 与 image_loader 二选一；提供 image_loader 时帧序列延迟到首次访问再加载。
         """
-        self.images = images
+        if images is None and image_loader is None:
+            raise ValueError("Act 需要提供 images 或 image_loader。")
+        self._images = tuple(images) if images is not None else None
+        self._image_loader = image_loader
+        self._load_lock = threading.Lock()
         self.act_num = act_num
         self.need_move = need_move
         self.direction = direction
         self.frame_move = frame_move
         self.frame_refresh = frame_refresh
+        self.act_id: int = -1  # 在所属 PetConfig.act_table 中的编号，由 init_config 分配
+        self._mirrored_images: Optional[tuple[QImage, ...]] = None
+        self._schedule: Optional[ActSchedule] = None
+
+    @property
+    def images(self) -> tuple[QImage, ...]:
+        """动作的帧序列，首次访问时通过 image_loader 加载。"""
+        if self._images is None:
+            with self._load_lock:
+                if self._images is None:
+                    self._images = tuple(self._image_loader())
+        return self._images
+
+    @property
+    def mirrored_images(self) -> tuple[QImage, ...]:
+        """水平镜像后的帧序列（例如向右掉落），首次访问时生成。"""
+        if self._mirrored_images is None:
+            images = self.images  # 先在锁外加载原始帧，_load_lock 不可重入
+            with self._load_lock:
+                if self._mirrored_images is None:
+                    self._mirrored_images = mirror_frames(images)
+        return self._mirrored_images
+
+    @property
+    def offset(self) -> tuple[float, float]:
+        """每帧的窗口位移 (dx, dy)，由 direction 与 frame_move 决定；没有方向时不移动。"""
+        move_amount = float(self.frame_move)
+        if self.direction == 'right':
+            return move_amount, 0.0
+        if self.direction == 'left':
+            return -move_amount, 0.0
+        if self.direction == 'up':
+            return 0.0, -move_amount
+        if self.direction == 'down':
+            return 0.0, move_amount
+        return 0.0, 0.0
+
+    @property
+    def schedule(self) -> ActSchedule:
+        """动作的播放表，首次访问时 (帧序列加载后) 编译一次。"""
+        if self._schedule is None:
+            self.images  # 先在锁外加载帧序列，_load_lock 不可重入
+            with self._load_lock:
+                if self._schedule is None:
+                    self._schedule = ActSchedule(self)
+        return self._schedule
+
+    @property
+    def is_loaded(self) -> bool:
+        """帧序列是否已经加载。"""
+        return self._images is not None
 
     @classmethod
     def init_act(cls,
                  conf_param: dict,
                  pic_dict: dict[str, QImage],
                  scale: float,
-                 pet_name: str) -> 'Act': 
+                 pet_name: str,
+                 frame_loader: Optional[Callable[[str, float], tuple[QImage, ...]]] = None) -> 'Act':
         """
-        从配置参数和预加载图片创建并初始化一个 Act 实例。
+        从配置参数创建一个 Act 实例，帧序列延迟到首次访问时加载。
+
+        若提供 frame_loader，则以 (图片基础名称, 缩放比例) 向其索取已缩放的帧序列，
+        否则直接从 pic_dict 中取图并缩放。
         """
         image_base_name = conf_param['images'] # 动作图片的基础名称
-        role_path = RES_ROLE_PATH_TPL.format(pet_name=pet_name)
-        action_img_path = ACTION_IMG_PATH_TPL.format(image_base_name=image_base_name)
-        img_dir_pattern = os.path.join(role_path, action_img_path) # 使用 os.path.join 构造路径
-
-        # 使用 glob 查找所有帧图片文件
-        list_image_files = sorted(glob.glob(f'{img_dir_pattern}_*.png')) # 排序确保帧顺序
-        if not list_image_files:
-            raise FileNotFoundError(f"在 '{os.path.dirname(img_dir_pattern)}' 目录下找不到名为 '{os.path.basename(img_dir_pattern)}_*.png' 的图片文件。")
-
-        n_images = len(list_image_files)
-        processed_images = []
-        for i in range(n_images):
-            image_key = f"{image_base_name}_{i}"
-            try:
-                original_image = pic_dict[image_key]
-            except KeyError:
-                raise KeyError(f"图片字典 (pic_dict) 中缺少键 '{image_key}'，无法加载动作 '{image_base_name}' 的第 {i} 帧。")
-
-            # 应用缩放
-            scaled_image = original_image.scaled(
-                int(original_image.width() * scale),
-                int(original_image.height() * scale),
-                aspectRatioMode=Qt.KeepAspectRatio,
-                transformMode=Qt.SmoothTransformation # 添加平滑变换以获得更好的效果
-            )
-            processed_images.append(scaled_image)
-
+        if frame_loader is not None:
+            # 由外部（如进程级帧缓存）提供已缩放的帧，避免重复缩放
+            image_loader = lambda: frame_loader(image_base_name, scale)
+        else:
+            image_loader = lambda: load_act_frames(pic_dict, image_base_name, scale, pet_name)
 
         act_num = conf_param.get('act_num', 1)
         need_move = conf_param.get('need_move', False)
@@ -89,13 +565,45 @@ class Act:
         frame_move = float(conf_param.get('frame_move', 10.0)) * scale
         frame_refresh = float(conf_param.get('frame_refresh', 0.5))
 
-        # 返回创建的 Act 实例，使用元组存储图片
-        return cls(images=tuple(processed_images),
-                   act_num=act_num,
+        # 返回创建的 Act 实例，图片在首次访问 images 时才加载
+        return cls(act_num=act_num,
                    need_move=need_move,
                    direction=direction,
                    frame_move=frame_move,
-                   frame_refresh=frame_refresh)
+                   frame_refresh=frame_refresh,
+                   image_loader=image_loader)
+
+    @classmethod
+    def init_mirror(cls,
+                    conf_param: dict,
+                    source: 'Act',
+                    scale: float,
+                    frame_pool: Optional[FramePool] = None) -> 'Act':
+        """
+        从带 'mirror_of' 的配置参数创建一个镜像动作。
+
+        帧序列在首次访问时由源动作已缩放的帧水平镜像得到，不需要单独的 PNG；
+        未显式给出的参数沿用源动作，direction 默认左右翻转。
+        提供 frame_pool 时，镜像同一源动作的多个动作共用一份镜像帧。
+        """
+        if frame_pool is not None:
+            key = (f"mirror_of:{conf_param['mirror_of']}", scale)
+            image_loader = lambda: frame_pool.get_mirrored(key, source.images)
+        else:
+            image_loader = lambda: mirror_frames(source.images)
+
+        direction = conf_param.get('direction', MIRRORED_DIRECTIONS.get(source.direction, source.direction))
+        if 'frame_move' in conf_param:
+            frame_move = float(conf_param['frame_move']) * scale
+        else:
+            frame_move = source.frame_move
+
+        return cls(act_num=conf_param.get('act_num', source.act_num),
+                   need_move=conf_param.get('need_move', source.need_move),
+                   direction=direction,
+                   frame_move=frame_move,
+                   frame_refresh=float(conf_param.get('frame_refresh', source.frame_refresh)),
+                   image_loader=image_loader)
 
 
 class PetConfig:
@@ -107,6 +615,8 @@ class PetConfig:
 
     def __init__(self):
         """初始化一个空的 PetConfig 实例，所有属性设为默认值。"""
+        # 配置代号：工作线程的 tick 附带它，GUI 线程据此丢弃换用本配置之前排队的 tick
+        self.generation: int = next(_config_generations)
         self.petname: Optional[str] = None
         self.width: float = 128.0
         self.height: float = 128.0
@@ -126,6 +636,13 @@ class PetConfig:
         self.drag: Optional[Act] = None
         self.fall: Optional[Act] = None
 
+        # act_conf.json 中定义的全部动作，按动作名称索引
+        self.acts: dict[str, Act] = {}
+        # 按动作编号排列的全部动作；工作线程只发送帧标识 (动作编号, 帧序号, 标志位)，由 GUI 线程在此查表
+        self.act_table: list[Act] = []
+        # 全部动作共用的已缩放帧池（按图片与缩放比例缓存，并合并重复帧）
+        self.frame_pool: FramePool = FramePool()
+
         # 随机动作相关属性
         self.random_act: list[list[Act]] = [] # 存储分组的随机动作 Act 实例列表
         self.act_prob: list[float] = []      # 存储随机动作组的累积概率
@@ -136,13 +653,52 @@ class PetConfig:
         self.em_interval: int = 15 
 
 
+    def frame_image(self, act_id: int, frame_index: int, flags: int = 0) -> Optional[QImage]:
+        """
+        将帧标识解析为帧图片；编号越界时返回 None。
+        编号在范围内的过期帧 (切换宠物或大小之前排队的 tick) 无法在此识别，由 tick 附带的配置代号丢弃。
+        """
+        if not 0 <= act_id < len(self.act_table):
+            return None
+        act = self.act_table[act_id]
+        images = act.mirrored_images if flags & FRAME_MIRRORED else act.images
+        if not 0 <= frame_index < len(images):
+            return None
+        return images[frame_index]
+
+    def core_acts(self) -> tuple[Act, ...]:
+        """显示第一帧之前必须加载好的动作：默认、拖拽、掉落。"""
+        return self.default, self.drag, self.fall
+
     @classmethod
-    def init_config(cls, pet_name: str, pic_dict: dict[str, QImage]) -> 'PetConfig':
+    def init_config(cls,
+                    pet_name: str,
+                    pic_dict: dict[str, QImage],
+                    frame_loader: Optional[Callable[[str, float], tuple[QImage, ...]]] = None,
+                    preload_core: bool = True,
+                    frame_pool: Optional[FramePool] = None,
+                    size_factor: float = 1.0,
+                    frame_counts: Optional[dict[str, int]] = None) -> 'PetConfig':
         """
         加载指定宠物的配置并创建一个完全初始化的 PetConfig 实例。
+
+        所有动作的帧都经由 frame_pool 获取：同一 (图片基础名称, 缩放比例) 只加载一次，
+        逐字节相同的帧只保留一份。frame_loader 用于加载池中尚未缓存的帧序列
+        （如进程级帧缓存），未提供时直接从 pic_dict 中取图并缩放。
+        preload_core 为 False 时不立即加载核心动作帧，由调用方（如并行加载器）负责。
+        size_factor 为桌宠大小相对于 pet_conf.json 中 scale 的倍数（设置页的"桌宠大小"）。
+        frame_counts 为已知的各动作帧数（例如来自图集索引），用于校验动作配置；未提供时使用动作清单。
         """
         config_instance = cls() # 创建一个 PetConfig 的空实例
         config_instance.petname = pet_name
+        if frame_pool is not None:
+            config_instance.frame_pool = frame_pool
+        pool = config_instance.frame_pool
+        if frame_loader is None:
+            frame_loader = lambda image_base_name, scale: load_act_frames(pic_dict, image_base_name, scale, pet_name)
+        pooled_loader = lambda image_base_name, scale: pool.get(
+            (image_base_name, scale), lambda: frame_loader(image_base_name, scale)
+        )
 
         role_path = RES_ROLE_PATH_TPL.format(pet_name=pet_name)
         pet_conf_path = os.path.join(role_path, PET_CONF_FILENAME)
@@ -160,7 +716,7 @@ class PetConfig:
             raise # 重新抛出异常
 
         # 从配置中读取参数，使用 .get() 提供默认值
-        config_instance.scale = float(conf_params.get('scale', 1.0))
+        config_instance.scale = float(conf_params.get('scale', 1.0)) * size_factor
         # 尺寸应用缩放
         config_instance.width = float(conf_params.get('width', 128)) * config_instance.scale
         config_instance.height = float(conf_params.get('height', 128)) * config_instance.scale
@@ -173,7 +729,7 @@ class PetConfig:
         config_instance.hp_interval = int(conf_params.get('hp_interval', 15))
         config_instance.em_interval = int(conf_params.get('em_interval', 15))
 
-        # 2. 加载动作配置 (act_conf.json) 并创建 Act 实例
+        # 2. 加载动作配置 (act_conf.json) 并创建 Act 实例 (帧序列延迟加载)
         try:
             with open(act_conf_path, 'r', encoding='UTF-8') as f:
                 act_conf = json.load(f) # 直接加载为字典
@@ -184,11 +740,36 @@ class PetConfig:
             print(f"错误：解析动作配置文件 '{act_conf_path}' 失败: {e}")
             raise
 
+        # 对照各动作帧数校验动作配置，尽早报告引用了不存在图片的动作
+        manifest = frame_counts
+        if manifest is None:
+            try:
+                manifest = action_manifest(pet_name)
+            except OSError:
+                manifest = None # 没有 action 目录，跳过校验
+        for act_name, act_params in act_conf.items():
+            if int(act_params.get('act_num', 1)) < 1:
+                print(f"警告：'{act_conf_path}' 中动作 '{act_name}' 的 act_num 应为正整数。")
+            if manifest is not None and 'images' in act_params and act_params['images'] not in manifest:
+                print(f"警告：'{act_conf_path}' 中动作 '{act_name}' 引用的图片 '{act_params['images']}' 在 action 目录中不存在。")
+
         try:
-            act_dict = {
-                act_name: Act.init_act(act_params, pic_dict, config_instance.scale, pet_name)
+            built = {
+                act_name: Act.init_act(act_params, pic_dict, config_instance.scale, pet_name, pooled_loader)
                 for act_name, act_params in act_conf.items()
+                if 'mirror_of' not in act_params
             }
+            # 镜像动作 ("mirror_of": "源动作名称") 只能引用普通动作
+            for act_name, act_params in act_conf.items():
+                if 'mirror_of' in act_params:
+                    source_name = act_params['mirror_of']
+                    if source_name not in built:
+                        raise KeyError(f"动作 '{act_name}' 的 mirror_of 引用了不存在（或本身是镜像）的动作 '{source_name}'")
+                    built[act_name] = Act.init_mirror(act_params, built[source_name], config_instance.scale, pool)
+            act_dict = {act_name: built[act_name] for act_name in act_conf} # 保持配置文件中的顺序
+            # 动作编号按配置文件中的顺序分配，同一宠物不同大小分档的编号一致
+            for act_id, act in enumerate(act_dict.values()):
+                act.act_id = act_id
         except (FileNotFoundError, KeyError) as e:
             print(f"错误：在为宠物 '{pet_name}' 初始化动作时发生错误: {e}")
             raise # 将图片加载或键错误传播出去
@@ -206,6 +787,17 @@ class PetConfig:
         except KeyError as e:
             print(f"错误：宠物配置文件 '{pet_conf_path}' 中指定的核心动作 '{e}' 在动作配置 '{act_conf_path}' 中未定义。")
             raise
+        config_instance.acts = act_dict
+        config_instance.act_table = list(act_dict.values())
+
+        # 首帧所需的动作 (默认、拖拽、掉落) 立即加载，其余动作在首次播放时才解码
+        if preload_core:
+            try:
+                for act in config_instance.core_acts():
+                    act.images
+            except (FileNotFoundError, KeyError) as e:
+                print(f"错误：在为宠物 '{pet_name}' 加载核心动作帧时发生错误: {e}")
+                raise
 
         # 4. 初始化随机动作
         random_act_groups = []
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+把角色包中左右对称的动作改写为镜像动作的转换工具。
+
+对 act_conf.json 中每个使用 'right*' 图片的动作，若存在使用对应 'left*' 图片的动作，
+且两组帧逐像素互为水平镜像，则把该动作的 "images" 改写为 "mirror_of": "<左向动作名称>"，
+运行时由左向帧镜像得到（见 Petal.conf.Act.init_mirror）。
+加上 --delete 时，同时删除不再被任何动作引用的右向 PNG。
+
+用法（在项目根目录下）:
+    python -m Petal.convert_mirror Doggy Kitty
+    python -m Petal.convert_mirror --delete     # 转换 data/pets.json 中的全部宠物并删除多余 PNG
+"""
+
+import json
+import os
+import sys
+
+from PyQt5.QtGui import QGuiApplication, QImage
+
+from Petal.conf import (ACT_CONF_FILENAME, RES_ROLE_PATH_TPL, act_frame_files, count_act_frames,
+                        invalidate_action_manifest, _get_q_img)
+from Petal.utils import log, read_json
+
+# 像素比较前统一转换的格式：预乘后完全透明像素的颜色值不参与比较
+_COMPARE_FORMAT = QImage.Format_ARGB32_Premultiplied
+
+
+def _is_mirror(pet_name: str, left_base: str, right_base: str) -> bool:
+    """判断两组帧的帧数相同且逐帧互为水平镜像。"""
+    try:
+        n_images = count_act_frames(pet_name, left_base)
+        if count_act_frames(pet_name, right_base) != n_images:
+            return False
+    except FileNotFoundError:
+        return False
+
+    for left_path, right_path in zip(act_frame_files(pet_name, left_base, n_images),
+                                     act_frame_files(pet_name, right_base, n_images)):
+        left_img, right_img = _get_q_img(left_path), _get_q_img(right_path)
+        if left_img is None or right_img is None:
+            return False
+        if left_img.mirrored(True, False).convertToFormat(_COMPARE_FORMAT) != right_img.convertToFormat(_COMPARE_FORMAT):
+            return False
+    return True
+
+
+def convert_pet(pet_name: str, delete: bool = False) -> list[str]:
+    """
+    转换指定宠物的 act_conf.json，返回被改写为镜像动作的动作名称列表。
+    """
+    role_path = RES_ROLE_PATH_TPL.format(pet_name=pet_name)
+    act_conf_path = os.path.join(role_path, ACT_CONF_FILENAME)
+    with open(act_conf_path, 'r', encoding='UTF-8') as f:
+        act_conf = json.load(f)
+
+    # 每组左向图片对应的第一个普通动作，作为镜像源
+    left_acts: dict[str, str] = {}
+    for act_name, act_params in act_conf.items():
+        if 'images' in act_params:
+            left_acts.setdefault(act_params['images'], act_name)
+
+    converted = []
+    checked: dict[str, bool] = {}
+    for act_name, act_params in act_conf.items():
+        right_base = act_params.get('images', '')
+        if not right_base.startswith('right'):
+            continue
+        left_base = 'left' + right_base[len('right'):]
+        if left_base not in left_acts:
+            continue
+        if right_base not in checked:
+            checked[right_base] = _is_mirror(pet_name, left_base, right_base)
+        if not checked[right_base]:
+            log(f"跳过 '{act_name}': '{right_base}' 不是 '{left_base}' 的镜像")
+            continue
+        # 原位替换键，保持其余参数与键顺序不变
+        act_conf[act_name] = {
+            ('mirror_of' if key == 'images' else key): (left_acts[left_base] if key == 'images' else value)
+            for key, value in act_params.items()
+        }
+        converted.append(act_name)
+
+    if not converted:
+        log(f"宠物 '{pet_name}' 没有可转换的镜像动作")
+        return converted
+
+    with open(act_conf_path, 'w', encoding='utf-8') as f:
+        json.dump(act_conf, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    log(f"宠物 '{pet_name}': {len(converted)} 个动作改写为镜像动作: {', '.join(converted)}")
+
+    if delete:
+        still_used = {act_params['images'] for act_params in act_conf.values() if 'images' in act_params}
+        removed = 0
+        for right_base, is_mirror in checked.items():
+            if not is_mirror or right_base in still_used:
+                continue
+            for path in act_frame_files(pet_name, right_base, count_act_frames(pet_name, right_base)):
+                os.remove(path)
+                removed += 1
+        invalidate_action_manifest(pet_name)
+        log(f"宠物 '{pet_name}': 删除了 {removed} 张多余的右向图片")
+    return converted
+
+
+if __name__ == '__main__':
+    app = QGuiApplication(sys.argv)
+    args = sys.argv[1:]
+    delete_files = '--delete' in args
+    pet_names = [arg for arg in args if arg != '--delete'] or read_json('data/pets.json')
+    for name in pet_names:
+        convert_pet(name, delete=delete_files)
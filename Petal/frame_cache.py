@@ -0,0 +1,518 @@
+# -*- coding: utf-8 -*-
+"""
+进程级共享的宠物帧缓存。
+
+RolePack: 一个宠物角色包在内存中的全部资源（已缩放帧、PetConfig，以及按需解码的原始图片）。
+FrameCache: 单例，按宠物名称对角色包做引用计数，所有 PetWidget 共用同一份帧；
+            引用计数归零的角色包进入 LRU 队列，超出容量时被淘汰。
+"""
+
+import math
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable, Optional
+
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+from PyQt5.QtGui import QBitmap, QImage, QPixmap, QRegion
+
+from Petal import raw_cache
+from Petal.conf import (FramePool, PetConfig, act_frame_files, action_manifest, atlas_files, load_act_frames,
+                        load_act_pics, load_pic_dict, read_atlas_index)
+
+# 引用计数为 0 后仍保留在内存中的角色包数量
+DEFAULT_MAX_IDLE_PACKS = 2
+# 后台预取：角色包加载后等待的秒数，以及每预取一个动作后的休息秒数
+PREFETCH_START_DELAY = 3.0
+PREFETCH_INTERVAL = 0.2
+# 并行加载角色包时默认使用的线程数
+DEFAULT_LOAD_WORKERS = min(8, os.cpu_count() or 1)
+# 桌宠大小的分档（相对于 pet_conf.json 中的 scale），相邻两档约差 √2 倍；
+# 每档的帧只生成一次，拖动大小滑块时在已生成的档位之间切换
+SIZE_BUCKETS = (0.25, 0.35, 0.5, 0.7, 1.0, 1.4, 2.0, 2.8)
+
+
+def snap_size_factor(size_factor: float) -> float:
+    """把任意大小倍数吸附到对数距离最近的分档。"""
+    size_factor = max(size_factor, 1e-3)
+    return min(SIZE_BUCKETS, key=lambda bucket: abs(math.log(bucket / size_factor)))
+
+
+def alpha_mask(image: QImage) -> QImage:
+    """
+    帧中 alpha 不为 0 的像素组成的 1 位遮罩 (位为 1 表示不透明)，可在任意线程中调用。
+
+    createAlphaMask 以 alpha >= 128 为阈值，会丢掉抗锯齿的半透明边缘；窗口遮罩同时裁剪绘制，
+    因此改为在预乘格式下按全透明像素 (值恰为 0) 生成遮罩。
+    """
+    premultiplied = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+    return premultiplied.createMaskFromColor(0, Qt.MaskInColor)
+
+
+class RolePack:
+    """
+    一个宠物角色包的共享资源。
+
+    frames 以 (图片基础名称, 缩放比例) 为键，保存已缩放的帧序列；
+    结合 pet_name 即构成 (宠物名称, 图片基础名称, 缩放比例) 的全局帧键。
+    帧序列存放在与 PetConfig 共用的 FramePool 中，逐字节相同的帧只保留一份。
+    configs 按桌宠大小分档保存各自的 PetConfig，同一份 FramePool 以缩放比例区分各档的帧。
+    alpha_masks 按帧 (QImage.cacheKey) 保存加载时由 alpha 通道生成的 1 位遮罩 (见 alpha_mask)；
+    pixmaps / hit_regions 按帧缓存转换好的 QPixmap 与不透明像素的命中区域 (行程编码的 QRegion)，
+    只能在 GUI 线程中访问。
+    已缩放的帧优先从内存映射的磁盘缓存 (raw_cache) 中取得，只有缓存未命中时
+    才会解码原始图片 (pic_dict)。缓存以源文件的大小与修改时间为指纹：有图集时为图集文件，
+    否则为本动作的零散 PNG。
+    """
+
+    def __init__(self, pet_name: str, preload_core: bool = True):
+        self.pet_name: str = pet_name
+        self.refcount: int = 0
+        self.frame_pool: FramePool = FramePool()
+        self.frames: dict[tuple, tuple[QImage, ...]] = self.frame_pool.frames
+        self._pic_dict: Optional[dict[str, QImage]] = None
+        self._lock = threading.Lock()  # 保护 _key_locks
+        self._pic_lock = threading.Lock()  # 保护原始图片的解码
+        self._key_locks: dict[tuple[str, float], threading.Lock] = {}
+        self._config_lock = threading.Lock()  # 保护 configs，并保证同一档位只构建一次
+        self._prefetcher: Optional[threading.Thread] = None
+        self._prefetch_stop = threading.Event()
+        self.alpha_masks: dict[int, QImage] = {}  # 预加载核心动作时即会写入，需先于 pet_conf 创建
+        self.pixmaps: dict[int, QPixmap] = {}
+        self.hit_regions: dict[int, QRegion] = {}
+        # 有可用图集时直接从索引获取各动作帧数，否则使用动作清单（均不需要列目录）
+        atlas_index = read_atlas_index(pet_name)
+        self.has_atlas: bool = atlas_index is not None
+        self._atlas_files: list[str] = atlas_files(pet_name, atlas_index) if atlas_index is not None else []
+        self._source_hashes: dict[tuple, bytes] = {}  # 源文件内容哈希，图集的哈希只计算一次
+        self.frame_counts: dict[str, int] = (
+            {base_name: int(n) for base_name, n in atlas_index['frame_counts'].items()}
+            if atlas_index is not None else action_manifest(pet_name)
+        )
+        self.pet_conf: PetConfig = PetConfig.init_config(
+            pet_name, {}, frame_loader=self.get_frames, preload_core=preload_core, frame_pool=self.frame_pool,
+            frame_counts=self.frame_counts
+        )
+        self.configs: dict[float, PetConfig] = {1.0: self.pet_conf}
+
+    @property
+    def pic_dict(self) -> dict[str, QImage]:
+        """未缩放的原始图片，首次访问时才解码（图集或零散 PNG）。"""
+        with self._pic_lock:
+            if self._pic_dict is None:
+                self._pic_dict, _ = load_pic_dict(self.pet_name)
+            return self._pic_dict
+
+    def get_frames(self, image_base_name: str, scale: float) -> tuple[QImage, ...]:
+        """
+        获取指定图片基础名称、指定缩放比例的帧序列，首次访问时才加载。
+
+        不同帧序列的加载互不阻塞；同一帧序列只会被加载一次。
+        """
+        key = (image_base_name, scale)
+        frames = self.frame_pool.lookup(key)
+        if frames is not None:
+            return frames
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            frames = self.frame_pool.lookup(key)
+            if frames is None:
+                frames = self.frame_pool.add(key, *self._load_scaled(image_base_name, scale))
+                # 在加载线程中顺便生成各帧的 alpha 遮罩，去重后相同的帧只生成一次
+                for image in frames:
+                    if image.cacheKey() not in self.alpha_masks:
+                        self.alpha_masks[image.cacheKey()] = alpha_mask(image)
+            return frames
+
+    def pixmap(self, image: QImage) -> QPixmap:
+        """
+        返回帧对应的 QPixmap，每帧只转换一次；须在 GUI 线程中调用。
+
+        去重后的相同帧共用同一个 QImage，因此也共用同一个 QPixmap。
+        """
+        key = image.cacheKey()
+        pixmap = self.pixmaps.get(key)
+        if pixmap is None:
+            pixmap = QPixmap.fromImage(image)
+            self.pixmaps[key] = pixmap
+        return pixmap
+
+    def hit_region(self, image: QImage) -> QRegion:
+        """
+        返回帧中不透明像素组成的区域（相对于帧左上角），用于窗口遮罩与命中测试；
+        每帧只转换一次，须在 GUI 线程中调用。
+
+        优先使用加载时生成的 alpha 遮罩；不经过 get_frames 的帧 (例如镜像帧) 在此生成。
+        """
+        key = image.cacheKey()
+        region = self.hit_regions.get(key)
+        if region is None:
+            mask = self.alpha_masks.get(key)
+            if mask is None:
+                mask = alpha_mask(image)
+            region = QRegion(QBitmap.fromImage(mask))
+            self.hit_regions[key] = region
+        return region
+
+    def config_for(self, size_factor: float, preload_core: bool = True) -> PetConfig:
+        """
+        返回指定大小分档的 PetConfig，首次请求时构建（帧仍按需加载）。
+        """
+        with self._config_lock:
+            pet_conf = self.configs.get(size_factor)
+            if pet_conf is None:
+                pet_conf = PetConfig.init_config(
+                    self.pet_name, {}, frame_loader=self.get_frames, preload_core=preload_core,
+                    frame_pool=self.frame_pool, size_factor=size_factor, frame_counts=self.frame_counts
+                )
+                self.configs[size_factor] = pet_conf
+            return pet_conf
+
+    def is_ready(self, size_factor: float) -> bool:
+        """指定大小分档的配置已构建且核心动作帧已加载（创建桌宠时不需要再解码）。"""
+        with self._config_lock:
+            pet_conf = self.configs.get(size_factor)
+        return pet_conf is not None and all(act.is_loaded for act in pet_conf.core_acts())
+
+    def load_acts(self,
+                  max_workers: int = DEFAULT_LOAD_WORKERS,
+                  on_progress: Optional[Callable[[int, int], None]] = None,
+                  pet_conf: Optional[PetConfig] = None) -> None:
+        """
+        在线程池中并行解码、缩放全部动作帧，核心动作优先提交；全部完成后返回。
+
+        pet_conf 默认为原始大小的配置；on_progress(已完成数, 总数) 在工作线程中调用。
+        """
+        if pet_conf is None:
+            pet_conf = self.pet_conf
+        core = pet_conf.core_acts()
+        acts = list(dict.fromkeys(core + tuple(pet_conf.acts.values())))
+        total = len(acts)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f'load-{self.pet_name}') as pool:
+            futures = [pool.submit(lambda a=act: a.images) for act in acts]
+            for done, future in enumerate(as_completed(futures), start=1):
+                future.result()  # 传播加载中的异常
+                if on_progress is not None:
+                    on_progress(done, total)
+
+    def dedupe_report(self) -> str:
+        """返回一行帧去重统计，用于日志。"""
+        stats = self.frame_pool.stats()
+        return (f"帧 {stats['frames_total']} 个（不重复 {stats['frames_unique']} 个），"
+                f"合并相同帧节省 {stats['bytes_deduped'] / 1024:.1f} KB，"
+                f"动作共用帧序列节省 {stats['bytes_shared'] / 1024:.1f} KB。")
+
+    def start_prefetch(self) -> None:
+        """
+        启动低优先级的后台预取线程，在空闲时逐个加载尚未播放过的动作。
+        """
+        if self._prefetcher is not None:
+            return
+        self._prefetch_stop.clear()
+        self._prefetcher = threading.Thread(
+            target=self._prefetch, name=f'prefetch-{self.pet_name}', daemon=True
+        )
+        self._prefetcher.start()
+
+    def stop_prefetch(self) -> None:
+        """通知预取线程尽快停止（不等待其结束）。"""
+        self._prefetch_stop.set()
+        self._prefetcher = None
+
+    def _prefetch(self) -> None:
+        """预取线程主体：先让出启动阶段，之后每加载一个动作就休息一会儿。"""
+        if self._prefetch_stop.wait(PREFETCH_START_DELAY):
+            return
+        for act in list(self.pet_conf.acts.values()):
+            if act.is_loaded:
+                continue
+            try:
+                act.images
+            except (FileNotFoundError, KeyError) as e:
+                print(f"[警告] RolePack: 预取 '{self.pet_name}' 的动作失败: {e}")
+            if self._prefetch_stop.wait(PREFETCH_INTERVAL):
+                return
+        print(f"[FrameCache] 角色包 '{self.pet_name}' 预取完成，{self.dedupe_report()}")
+
+    def _load_scaled(self,
+                     image_base_name: str,
+                     scale: float) -> tuple[tuple[QImage, ...], Optional[tuple[bytes, ...]]]:
+        """
+        先查磁盘缓存；未命中时解码并缩放，再写回缓存。
+
+        返回 (帧序列, 各帧的像素内容摘要)；不经过磁盘缓存时摘要为 None，由 FramePool 计算。
+        """
+        n_images = self.frame_counts.get(image_base_name, 0)
+        if n_images <= 0:
+            raise FileNotFoundError(f"宠物 '{self.pet_name}' 没有动作 '{image_base_name}' 的帧图片。")
+
+        path = raw_cache.cache_path(self.pet_name, image_base_name, scale)
+        source_files = self._atlas_files or act_frame_files(self.pet_name, image_base_name, n_images)
+        try:
+            fingerprint = raw_cache.source_fingerprint(source_files, scale)
+        except OSError as e:
+            # 源文件不完整，无法校验缓存，直接解码
+            print(f"[警告] RolePack: 无法读取 '{image_base_name}' 源文件的信息: {e}，跳过磁盘缓存。")
+            fingerprint = None
+
+        if fingerprint is not None:
+            cached = raw_cache.load_frames(path, fingerprint, lambda: self._source_hash(source_files, scale))
+            if cached is not None:
+                return cached
+
+        # 有图集时整张图集只解码一次；否则只解码本动作用到的零散 PNG
+        if self.has_atlas or self._pic_dict is not None:
+            source = self.pic_dict
+        else:
+            source = load_act_pics(self.pet_name, image_base_name, n_images)
+        frames = load_act_frames(source, image_base_name, scale, self.pet_name, n_images)
+        if fingerprint is not None:
+            try:
+                source_hash = self._source_hash(source_files, scale)
+            except OSError as e:
+                print(f"[警告] RolePack: 无法计算 '{image_base_name}' 源文件的哈希: {e}，跳过磁盘缓存。")
+            else:
+                return raw_cache.store_frames(path, frames, fingerprint, source_hash)
+        return frames, None
+
+    def _source_hash(self, source_files: list[str], scale: float) -> bytes:
+        """源文件的内容哈希 (见 raw_cache.content_hash)，按源文件与缩放比例记忆。"""
+        key = (tuple(source_files), scale)
+        source_hash = self._source_hashes.get(key)
+        if source_hash is None:
+            source_hash = raw_cache.content_hash(source_files, scale)
+            self._source_hashes[key] = source_hash
+        return source_hash
+
+
+class FrameCache:
+    """
+    进程级的角色包缓存，只有一个实例。
+
+    acquire/release 成对调用；release 后引用计数归零的角色包不会立即释放，
+    而是按最近使用顺序保留至多 max_idle_packs 个，以便快速重新添加同种宠物。
+    角色包在缓存锁外构建与加载；同一宠物同时只构建一次，其他线程等待 _pending 中的 Future。
+    """
+
+    _instance: Optional['FrameCache'] = None
+
+    @staticmethod
+    def instance() -> 'FrameCache':
+        if FrameCache._instance is None:
+            FrameCache._instance = FrameCache()
+        return FrameCache._instance
+
+    def __init__(self, max_idle_packs: int = DEFAULT_MAX_IDLE_PACKS):
+        self.max_idle_packs: int = max_idle_packs
+        self._packs: dict[str, RolePack] = {}
+        self._pending: dict[str, Future] = {}  # 正在构建的角色包
+        self._idle: OrderedDict[str, None] = OrderedDict()  # 引用计数为 0 的角色包，按 LRU 排序
+        self._lock = threading.RLock()
+
+    def acquire(self, pet_name: str) -> RolePack:
+        """
+        获取指定宠物的角色包并增加其引用计数；若不在缓存中则加载。
+        """
+        pack, created = self._get_or_build(pet_name, preload_core=True, hold=True)
+        if created:
+            pack.start_prefetch()
+            print(f"[FrameCache] 已加载角色包 '{pet_name}'。")
+        with self._lock:
+            self._evict()
+        return pack
+
+    def is_ready(self, pet_name: str, size_factor: float = 1.0) -> bool:
+        """指定宠物的角色包已在缓存中（无论是否被持有），且指定大小分档的核心动作帧已加载。"""
+        with self._lock:
+            pack = self._packs.get(pet_name)
+        return pack is not None and pack.is_ready(size_factor)
+
+    def preload(self,
+                pet_name: str,
+                max_workers: int = DEFAULT_LOAD_WORKERS,
+                on_progress: Optional[Callable[[int, int], None]] = None,
+                size_factor: float = 1.0) -> RolePack:
+        """
+        并行加载指定宠物在指定大小分档下的全部动作帧，完成后放入缓存（引用计数为 0，等待 acquire）。
+
+        加载过程不持有缓存锁，不会阻塞其他宠物的 acquire/release；可在任意线程调用。
+        角色包构建后即登记到缓存，加载期间同一宠物的 acquire 直接取得这个角色包，帧按需加载。
+        """
+        pack, created = self._get_or_build(pet_name, preload_core=False)
+        pet_conf = pack.config_for(size_factor, preload_core=False)
+        pack.load_acts(max_workers=max_workers, on_progress=on_progress, pet_conf=pet_conf)
+        if not created:
+            return pack
+
+        with self._lock:
+            if self._packs.get(pet_name) is pack and pack.refcount == 0:
+                # 不在加载线程中淘汰：被淘汰的角色包会释放其 QPixmap，只能在 GUI 线程中进行，
+                # 超出的空闲角色包留到下一次 acquire/release 时淘汰
+                self._idle[pet_name] = None
+        print(f"[FrameCache] 已并行加载角色包 '{pet_name}'，{pack.dedupe_report()}")
+        return pack
+
+    def release(self, pet_name: str) -> None:
+        """
+        减少指定宠物角色包的引用计数；归零后放入 LRU 队列等待淘汰。
+        """
+        with self._lock:
+            pack = self._packs.get(pet_name)
+            if pack is None or pack.refcount <= 0:
+                print(f"[警告] FrameCache.release: 角色包 '{pet_name}' 未被持有，忽略。")
+                return
+            pack.refcount -= 1
+            if pack.refcount == 0:
+                self._idle[pet_name] = None
+                self._idle.move_to_end(pet_name)
+                self._evict()
+
+    def load_size(self, pet_name: str, size_factor: float, max_workers: int = DEFAULT_LOAD_WORKERS) -> PetConfig:
+        """
+        为已持有的角色包生成指定大小分档的全部帧，返回该档的 PetConfig；可在任意线程调用。
+        """
+        with self._lock:
+            pack = self._packs[pet_name]
+        pet_conf = pack.config_for(size_factor, preload_core=False)
+        pack.load_acts(max_workers=max_workers, pet_conf=pet_conf)
+        return pet_conf
+
+    def get_frames(self, pet_name: str, image_base_name: str, scale: float) -> tuple[QImage, ...]:
+        """按 (宠物名称, 图片基础名称, 缩放比例) 获取帧序列，角色包须已被持有。"""
+        with self._lock:
+            pack = self._packs[pet_name]
+        return pack.get_frames(image_base_name, scale)
+
+    def stats(self) -> dict[str, int]:
+        """返回各角色包当前的引用计数（含空闲的角色包）。"""
+        with self._lock:
+            return {name: pack.refcount for name, pack in self._packs.items()}
+
+    def dedupe_stats(self) -> dict[str, dict[str, int]]:
+        """返回各角色包的帧去重统计（见 FramePool.stats）。"""
+        with self._lock:
+            return {name: pack.frame_pool.stats() for name, pack in self._packs.items()}
+
+    def _get_or_build(self, pet_name: str, preload_core: bool, hold: bool = False) -> tuple[RolePack, bool]:
+        """
+        返回 (角色包, 是否由本次调用构建)；不在缓存中时在缓存锁外构建。
+
+        同一宠物已有线程在构建时等待其完成，构建失败时抛出同一异常。
+        hold 为 True 时在取得角色包的同时 (持有缓存锁) 增加其引用计数。
+        """
+        while True:
+            with self._lock:
+                pack = self._packs.get(pet_name)
+                if pack is not None:
+                    if hold:
+                        self._idle.pop(pet_name, None)
+                        pack.refcount += 1
+                    return pack, False
+                pending = self._pending.get(pet_name)
+                building = pending is None
+                if building:
+                    pending = self._pending[pet_name] = Future()
+            if not building:
+                pending.result()
+                continue  # 新构建的角色包不在空闲队列中，不会被淘汰，下一轮即可取得
+
+            try:
+                pack = RolePack(pet_name, preload_core=preload_core)
+            except BaseException as e:
+                with self._lock:
+                    del self._pending[pet_name]
+                pending.set_exception(e)
+                raise
+            with self._lock:
+                self._packs[pet_name] = pack
+                del self._pending[pet_name]
+                if hold:
+                    pack.refcount += 1
+            pending.set_result(pack)
+            return pack, True
+
+    def _evict(self) -> None:
+        """淘汰最久未使用的空闲角色包，直到空闲数量不超过上限。"""
+        while len(self._idle) > self.max_idle_packs:
+            pet_name, _ = self._idle.popitem(last=False)
+            pack = self._packs.pop(pet_name)
+            pack.stop_prefetch()
+            pack.pixmaps.clear()
+            pack.hit_regions.clear()
+            print(f"[FrameCache] 已淘汰角色包 '{pet_name}'。")
+
+
+class PackLoader(QObject):
+    """
+    在后台线程中并行加载角色包在指定大小分档下的帧，并通过信号报告进度，避免阻塞 GUI 事件循环。
+
+    信号从加载线程发出；连接到 GUI 线程中 QObject 的方法时会自动排队到 GUI 线程执行。
+    """
+
+    # --- 信号定义 ---
+    sig_progress = pyqtSignal(str, int, int, name='sig_progress')  # (宠物名称, 已完成动作数, 总动作数)
+    sig_loaded = pyqtSignal(str, name='sig_loaded')  # 角色包已加载完成 (宠物名称)
+    sig_failed = pyqtSignal(str, str, name='sig_failed')  # 加载失败 (宠物名称, 错误信息)
+
+    def __init__(self,
+                 pet_name: str,
+                 size_factor: float = 1.0,
+                 max_workers: int = DEFAULT_LOAD_WORKERS,
+                 parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.pet_name: str = pet_name
+        self.size_factor: float = size_factor
+        self.max_workers: int = max_workers
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """启动后台加载线程。"""
+        self._thread = threading.Thread(target=self._run, name=f'pack-loader-{self.pet_name}', daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            FrameCache.instance().preload(
+                self.pet_name,
+                max_workers=self.max_workers,
+                on_progress=lambda done, total: self.sig_progress.emit(self.pet_name, done, total),
+                size_factor=self.size_factor,
+            )
+        except Exception as e:
+            print(f"[错误] PackLoader: 加载角色包 '{self.pet_name}' 失败: {e}")
+            self.sig_failed.emit(self.pet_name, str(e))
+            return
+        self.sig_loaded.emit(self.pet_name)
+
+
+class SizeLoader(QObject):
+    """
+    在后台线程中生成某个宠物在指定大小分档下的全部帧，完成后通过信号通知 GUI 线程切换。
+    """
+
+    # --- 信号定义 ---
+    sig_ready = pyqtSignal(str, float, name='sig_ready')  # 该档的帧已全部就绪 (宠物名称, 大小分档)
+    sig_failed = pyqtSignal(str, str, name='sig_failed')  # 生成失败 (宠物名称, 错误信息)
+
+    def __init__(self, pet_name: str, size_factor: float, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.pet_name: str = pet_name
+        self.size_factor: float = size_factor
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """启动后台生成线程。"""
+        self._thread = threading.Thread(target=self._run, name=f'size-loader-{self.pet_name}', daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            FrameCache.instance().load_size(self.pet_name, self.size_factor)
+        except Exception as e:
+            print(f"[错误] SizeLoader: 生成 '{self.pet_name}' 大小 {self.size_factor:g} 的帧失败: {e}")
+            self.sig_failed.emit(self.pet_name, str(e))
+            return
+        self.sig_ready.emit(self.pet_name, self.size_factor)
@@ -1,4 +1,5 @@
 import sys
+import threading
 import time
 import math
 import random
@@ -23,9 +24,21 @@ from typing import List, Optional
 
 from Petal.utils import *
 from Petal.conf import *
+from Petal.clock import AnimationClock
 
 from Petal.settings import Settings
 
+# 动画落后于截止时间不超过该秒数时跳帧追赶 (位移并入下一次显示的帧)；
+# 落后更多 (例如系统休眠后) 时不再追赶，从当前时刻重新计时
+MAX_FRAME_CATCHUP = 1.0
+# 每一步 (帧或动作序列之间的间隔) 的最短时长 (秒)：时长为 0 的帧也占 1 ms，
+# 追赶时每前进一步截止时间都会后移，不会原地空转
+MIN_FRAME_DURATION = 0.001
+# 掉落物理的固定步长 (秒)：重力、阻力与拖拽速度都按每 20 ms 一步标定，与 tick 间隔无关
+PHYSICS_STEP = 0.02
+# 两次 tick 之间最多补算的物理时长 (秒)；更长的停顿 (卡顿、暂停) 不补算，避免一次跳出很远
+MAX_PHYSICS_CATCHUP = 0.25
+
 
 class Animation_worker(QObject):
     """
@@ -35,73 +48,176 @@ class Animation_worker(QObject):
     """
 
     # --- 信号定义 ---
-    sig_setimg_anim = pyqtSignal(name='sig_setimg_anim')  # 请求设置新图像的信号
-    sig_move_anim = pyqtSignal(
-        float, float, name='sig_move_anim'
-    )  # 请求移动宠物的信号 (dx, dy)
-    sig_repaint_anim = pyqtSignal(name='sig_repaint_anim')  # 请求重绘的信号
+    # 每帧一个信号：帧标识与位移一起交给UI，UI 在同一次处理中完成换帧与移动；
+    # 附带发出时所用配置的代号 (PetConfig.generation)，UI 据此丢弃切换宠物或大小之前排队的 tick
+    sig_tick_anim = pyqtSignal(
+        int, int, int, float, float, int, name='sig_tick_anim'
+    )  # (动作编号, 帧序号, 标志位, dx, dy, 配置代号)
 
-    def __init__(self, pet_conf: PetConfig, parent: Optional[QObject] = None, settings : Settings = None) -> None:
+    def __init__(self, pet_conf: PetConfig, parent: Optional[QObject] = None, settings : Settings = None,
+                 clock: Optional[AnimationClock] = None) -> None:
         """
         初始化动画工作线程。
+
+        给出 clock 时不需要线程：由共享动画时钟在 GUI 线程中调用 advance 推进帧序列，
+        run() 只在兼容的线程模式下使用。
         """
         super(Animation_worker, self).__init__(parent)
         self.pet_conf: PetConfig = pet_conf
         self.is_killed: bool = False  # 线程是否被标记为终止
         self.is_paused: bool = False  # 线程是否被标记为暂停
+        # 保护上面两个标记：暂停时线程阻塞在条件变量上，恢复 / 终止时立即唤醒，也能打断帧间休眠
+        self._state = threading.Condition()
         self.settings: Settings = settings
 
+        # --- 可见性节流 ---
+        self.throttled: bool = False  # 窗口不可见时为 True：与暂停一样停止推进，不再唤醒
+        self.frames_skipped: int = 0  # 因节流而未发出的帧数
+        self.frames_merged: int = 0  # 因超出全局帧预算而与后一帧合并的帧数 (仅共享时钟模式)
+
+        # --- 截止时间统计 ---
+        self.frames_dropped: int = 0  # 落后于截止时间、整帧已过期而跳过的帧数
+        self.frames_timed: int = 0  # 按截止时间推进的步数
+        self.lateness_total: float = 0.0  # 各步实际推进时刻晚于截止时间的秒数之和
+        self.lateness_max: float = 0.0
+
+        # 下一步 (帧或动作序列之间的间隔) 开始的 time.monotonic() 截止时间；
+        # None 表示从当前时刻重新计时 (开始播放、暂停恢复后)
+        self._next_due: Optional[float] = None
+        # 被跳过的帧的位移，并入下一次发出的帧
+        self._pending_offset: tuple[float, float] = (0.0, 0.0)
+
+        # --- 共享时钟模式 ---
+        self.clock: Optional[AnimationClock] = clock
+        # 播放位置：当前动作序列、其中的动作下标 (等于序列长度时处于动作序列之间的间隔)
+        # 与该动作播放表中的步下标
+        self._acts: List[Act] = []
+        self._act_pos: int = 0
+        self._step: int = -1
+        # 下一个动作序列：在当前序列之后的间隔开始时选定，间隔期间由后台线程加载尚未加载的动作
+        self._next_acts: Optional[List[Act]] = None
+        self._act_loader: Optional[threading.Thread] = None
+        if clock is not None:
+            print(f'宠物 {self.pet_conf.petname} 的动画由共享时钟驱动')
+            clock.subscribe(self)
+
     def run(self) -> None:
         """
         线程主循环。
         持续运行，直到 is_killed 被设置为 True。
         循环执行随机动作，处理暂停状态，并按配置的刷新率休眠。
+        各帧与动作序列之间的间隔按绝对截止时间排定，发信号与调度的耗时不会累积成漂移。
         """
         print(f'开始运行宠物 {self.pet_conf.petname} 的动画线程')
+        self._next_due = None
         while not self.is_killed:
             # 执行一个随机选择的动作序列
             self.random_act()
 
-            # 检查是否需要暂停或已终止
-            if self._check_pause_kill():
-                break  # 如果在暂停期间被终止，则退出循环
-
-            # 如果没有被终止，则按配置的间隔休眠
-            if not self.is_killed:
-                time.sleep(self.pet_conf.refresh)
+            # 动作序列之间的间隔：等到它的截止时间 (暂停期间阻塞，被终止时退出循环)
+            due = self._wait_due()
+            if due is None:
+                break
+            self._next_due = due + self.pet_conf.refresh
 
         print(f'宠物 {self.pet_conf.petname} 的动画线程已停止')
 
     def kill(self) -> None:
-        """标记线程为终止状态，并确保其不处于暂停状态。"""
-        self.is_paused = False  # 确保解除暂停状态，以便线程能检查 is_killed
-        self.is_killed = True
+        """标记线程为终止状态，并确保其不处于暂停状态；共享时钟模式下同时退订时钟。"""
+        with self._state:
+            self.is_paused = False  # 确保解除暂停状态，以便线程能检查 is_killed
+            self.is_killed = True
+            self._state.notify_all()
+        if self.clock is not None:
+            self.clock.unsubscribe(self)
 
     def pause(self) -> None:
-        """标记线程为暂停状态。"""
-        self.is_paused = True
+        """标记线程为暂停状态；正在进行的帧间休眠随即结束。"""
+        with self._state:
+            self.is_paused = True
+            self._state.notify_all()
 
     def resume(self) -> None:
-        """解除线程的暂停状态。"""
-        self.is_paused = False
+        """解除线程的暂停状态，等待中的线程立即继续；共享时钟模式下从当前时刻重新计时。"""
+        with self._state:
+            if self.clock is not None and self.is_paused:
+                self._next_due = None
+            self.is_paused = False
+            self._state.notify_all()
+
+    def set_throttled(self, throttled: bool) -> None:
+        """
+        窗口不可见时开启节流：与暂停一样停在当前位置，重新可见后从当前时刻继续。
+        线程模式下线程阻塞在条件变量上；共享时钟模式下退订时钟，没有可见的宠物时时钟停止。
+        """
+        with self._state:
+            if throttled == self.throttled:
+                return
+            if self.clock is not None and not throttled:
+                self._next_due = None
+            self.throttled = throttled
+            self._state.notify_all()
+        if self.clock is not None and not self.is_killed:
+            if throttled:
+                self.clock.unsubscribe(self)
+            else:
+                self.clock.subscribe(self)
 
     def _check_pause_kill(self) -> bool:
         """
-        私有辅助方法：检查并处理暂停状态。
-        如果线程被暂停，则循环等待直到恢复或被终止。
+        私有辅助方法：检查并处理暂停 / 节流状态。
+        如果线程被暂停或节流，则阻塞在条件变量上直到恢复或被终止 (期间不会被唤醒)，返回是否已终止。
+        暂停不算落后：恢复后从当前时刻重新计时。
         """
-        while self.is_paused:
-            if self.is_killed:  # 在暂停期间也检查终止标记
-                return True
-            time.sleep(0.2)  # 暂停时短暂休眠，避免CPU空转
-        return self.is_killed  # 返回当前的终止状态
+        with self._state:
+            if (self.is_paused or self.throttled) and not self.is_killed:
+                self._state.wait_for(lambda: self.is_killed or not (self.is_paused or self.throttled))
+                self._next_due = None
+            return self.is_killed
+
+    def _sleep(self, seconds: float) -> bool:
+        """
+        休眠 seconds 秒；期间被暂停、节流或终止时提前结束。返回是否被提前结束。
+        """
+        with self._state:
+            return self._state.wait_for(lambda: self.is_killed or self.is_paused or self.throttled, timeout=seconds)
+
+    def _wait_due(self) -> Optional[float]:
+        """
+        等到下一步的截止时间并返回它；被终止时返回 None。
+        暂停时结束等待并阻塞到恢复，恢复后该步从当前时刻开始。
+        """
+        while True:
+            if self._next_due is None:
+                self._next_due = time.monotonic()
+            if not self._sleep(self._next_due - time.monotonic()):
+                return self._next_due
+            if self._check_pause_kill():
+                return None
+
+    def _record_lateness(self, lateness: float) -> None:
+        self.frames_timed += 1
+        self.lateness_total += lateness
+        self.lateness_max = max(self.lateness_max, lateness)
+
+    def timing_stats(self) -> dict[str, float]:
+        """返回截止时间统计：推进步数、跳过的帧数，以及晚于截止时间的平均 / 最大毫秒数。"""
+        return {
+            'frames': self.frames_timed,
+            'dropped': self.frames_dropped,
+            'lateness_avg_ms': self.lateness_total / self.frames_timed * 1000 if self.frames_timed else 0.0,
+            'lateness_max_ms': self.lateness_max * 1000,
+        }
 
     def random_act(self) -> None:
         """
         随机选择并执行一个动作序列。
         根据 pet_conf 中定义的动作概率分布来选择动作。
         """
+        self._run_acts(self._choose_acts())
 
+    def _choose_acts(self) -> List[Act]:
+        """按 pet_conf 中的动作概率分布随机选择一个动作序列 (可能包含一个或多个动作 Act)。"""
         # 根据概率分布选择动作索引
         prob_num = random.uniform(0, 1)
         # 计算累积概率，找到第一个大于 prob_num 的区间的索引
@@ -109,12 +225,7 @@ class Animation_worker(QObject):
             int(prob_num > self.pet_conf.act_prob[i])
             for i in range(len(self.pet_conf.act_prob))
         )
-
-        # 获取选中的动作序列 (可能包含一个或多个动作 Act)
-        acts: List[Act] = self.pet_conf.random_act[act_index]
-
-        # 执行选中的动作序列
-        self._run_acts(acts)
+        return self.pet_conf.random_act[act_index]
 
     def _run_acts(self, acts: List[Act]) -> None:
         """
@@ -128,31 +239,179 @@ class Animation_worker(QObject):
     def _run_act(self, act: Act) -> None:
         """
         执行单个动作 (Act) 的动画。
-        循环播放该动作的所有帧图像，并在每帧之间处理移动、暂停和休眠。
-        """
-        # 一个动作可能重复执行多次 (act.act_num)
-        for _ in range(act.act_num):
-            if self._check_pause_kill():
-                return  # 检查暂停/终止，如果终止则直接返回
-
-            # 遍历动作中的每一帧图像
-            for img in act.images:
-                if self._check_pause_kill():
-                    return  # 检查暂停/终止，如果终止则直接返回
-
-                # --- 更新图像 ---
-                # 注意：直接修改全局 settings 模块中的图像变量
-                self.settings.previous_img = self.settings.current_img
-                self.settings.current_img = img
-                self.sig_setimg_anim.emit()  # 发送信号，请求UI更新图像
+        按动作的播放表逐步播放 (帧序列已按 act_num 展开)，每步等到自己的截止时间再发出。
+        线程落后到某帧的显示时段已经整段过去时跳过该帧，位移并入下一次发出的帧，移动速度不变。
+        """
+        schedule = act.schedule
+        # 帧图片本身由 GUI 线程按帧标识查表，不跨线程传递 QImage
+        for step in range(len(schedule)):
+            # --- 等到本帧的截止时间 (暂停期间阻塞，被终止时直接返回) ---
+            due = self._wait_due()
+            if due is None:
+                return
+            duration = max(schedule.duration, MIN_FRAME_DURATION)
+            self._next_due = due + duration
+
+            # --- 更新帧，或在落后时跳过 ---
+            now = time.monotonic()
+            plus_x, plus_y = self._take_offset(schedule.dx, schedule.dy)
+            if now - due > MAX_FRAME_CATCHUP:
+                self._next_due = now + duration
+            elif now >= self._next_due:
+                self._pending_offset = (plus_x, plus_y)
+                self.frames_dropped += 1
+                continue
+            self._record_lateness(now - due)
+            self._emit_frame(act, schedule.frame_index[step], (plus_x, plus_y))
+
+    def _take_offset(self, plus_x: float, plus_y: float) -> tuple[float, float]:
+        """本帧的位移加上此前被跳过的帧累积的位移，并清空累积。"""
+        pending_x, pending_y = self._pending_offset
+        self._pending_offset = (0.0, 0.0)
+        return plus_x + pending_x, plus_y + pending_y
+
+    def _advance_step(self) -> Optional[Act]:
+        """
+        共享时钟模式：播放位置前进一步，播放顺序与 run() 相同。
+
+        返回该步所属的动作 (步下标为 self._step)；返回 None 表示动作序列之间的间隔
+        (时长为 pet_conf.refresh)。间隔开始时就随机选定下一个动作序列并开始后台加载。
+        """
+        if self._act_pos >= len(self._acts):
+            self._acts = self._queue_next_acts()
+            self._next_acts = None
+            self._act_pos = 0
+            self._step = -1
+        self._step += 1
+        while self._act_pos < len(self._acts):
+            act = self._acts[self._act_pos]
+            if self._step < len(act.schedule):
+                return act
+            self._act_pos += 1
+            self._step = 0
+        self._queue_next_acts()
+        return None
+
+    def _queue_next_acts(self) -> List[Act]:
+        """
+        共享时钟模式：选定下一个动作序列 (已选定时直接返回)，
+        其中尚未加载的动作交给后台线程加载，首次播放的动作不在 GUI 线程中解码。
+        """
+        if self._next_acts is None:
+            self._next_acts = self._choose_acts()
+            pending = [act for act in self._next_acts if not act.is_loaded]
+            if pending:
+                self._act_loader = threading.Thread(
+                    target=self._load_acts, args=(pending,),
+                    name=f'act-loader-{self.pet_conf.petname}', daemon=True
+                )
+                self._act_loader.start()
+        return self._next_acts
 
-                # --- 帧间延迟 ---
-                time.sleep(act.frame_refresh)
+    def _load_acts(self, acts: List[Act]) -> None:
+        """后台线程主体：加载动作的帧序列并编译播放表。"""
+        for act in acts:
+            try:
+                act.schedule
+            except (FileNotFoundError, KeyError) as e:
+                print(f"[警告] Animation_worker: 后台加载宠物 {self.pet_conf.petname} 的动作失败: {e}")
 
-                self._move(act)  # 总是尝试根据动作信息移动
+    def _next_act_loading(self) -> bool:
+        """
+        共享时钟模式：下一步要进入的动作是否仍在后台加载。
+        后台加载已结束而动作仍未加载 (加载失败) 时返回 False，由 _advance_step 照常加载并报错。
+        """
+        if self._act_pos >= len(self._acts):
+            acts, pos, step = self._queue_next_acts(), 0, 0
+        else:
+            acts, pos, step = self._acts, self._act_pos, self._step + 1
+        while pos < len(acts):
+            act = acts[pos]
+            if not act.is_loaded:
+                return self._act_loader is not None and self._act_loader.is_alive()
+            if step < len(act.schedule):
+                return False
+            pos += 1
+            step = 0
+        return False
+
+    def advance(self, now: float) -> bool:
+        """
+        由共享时钟调用：到期时前进一步，返回本次是否发出了 tick。
+
+        暂停期间不前进；下一步的到期时间由上一步累加，不随时钟间隔漂移。
+        GUI 线程卡顿导致落后时直接跳到当前时刻应显示的帧，不逐帧补发：
+        显示时段已整段过去的帧被跳过，位移并入显示的帧，移动距离不变；
+        落后超过 MAX_FRAME_CATCHUP 秒 (例如系统休眠) 或暂停恢复后从当前时刻重新计时。
+        帧时长短于时钟的帧预算 (全局帧率上限 / 省电模式) 时，连续的帧合并为一步：
+        只显示最后一帧，时长与位移累加，动作的总时长与移动距离不变。
+        下一步的动作仍在后台加载时停在当前位置，加载完成后从当前时刻重新计时。
+        """
+        if self.is_killed or self.is_paused or self.clock is None:
+            return False
+        if self._next_due is not None and now < self._next_due:
+            return False
+        due = self._next_due
+        if due is None or now - due > MAX_FRAME_CATCHUP:
+            due = now
+        budget = self.clock.frame_budget
+        shown: Optional[Act] = None
+        shown_frame = 0
+        shown_end = end = due
+        plus_x, plus_y = self._pending_offset
+        self._pending_offset = (0.0, 0.0)
+        while True:
+            if self._next_act_loading():
+                end = None
+                break
+            act = self._advance_step()
+            if act is None:
+                end += max(self.pet_conf.refresh, MIN_FRAME_DURATION)
+            else:
+                schedule = act.schedule
+                step = self._step
+                end += max(schedule.duration, MIN_FRAME_DURATION)
+                if shown is not None:
+                    # 被后一帧取代的帧：显示时段已整段过去的算作跳帧，否则是按帧预算合并
+                    if shown_end <= now:
+                        self.frames_dropped += 1
+                    else:
+                        self.frames_merged += 1
+                shown = act
+                shown_frame = schedule.frame_index[step]
+                shown_end = end
+                plus_x += schedule.dx
+                plus_y += schedule.dy
+            # 已整段过期的步继续跳过；动作序列之间的间隔不与后面的帧合并
+            if end > now and (act is None or end - due >= budget):
+                break
 
-                # --- 请求重绘 ---
-                self.sig_repaint_anim.emit()  # 发送信号，请求UI重绘
+        self._next_due = end
+        if end is not None:
+            self._record_lateness(now - due)
+        if shown is None:
+            # 只经过了动作序列之间的间隔：位移留给下一次发出的帧
+            self._pending_offset = (plus_x, plus_y)
+            return False
+        return self._emit_frame(shown, shown_frame, (plus_x, plus_y))
+
+    def needs_full_rate(self) -> bool:
+        """常规动画按帧预算播放即可，不需要时钟全速运行。"""
+        return False
+
+    def _emit_frame(self, act: Act, frame_index: int, offset: Optional[tuple[float, float]] = None) -> bool:
+        """
+        记录当前帧，并发送一次 tick：该帧与位移 (默认为动作每帧的位移) 一起交给UI。
+        节流时只记录当前帧并计数，返回是否发出了 tick。
+        """
+        frame = (act.act_id, frame_index, 0)
+        self.settings.previous_frame = self.settings.current_frame
+        self.settings.current_frame = frame
+        if self.throttled:
+            self.frames_skipped += 1
+            return False
+        self.sig_tick_anim.emit(*frame, *(offset if offset is not None else act.offset), self.pet_conf.generation)
+        return True
 
     def _static_act(self, pos: QPoint) -> None:
         """
@@ -191,29 +450,7 @@ class Animation_worker(QObject):
             # 计算相对移动量
             dx = new_x - pos.x()
             dy = new_y - pos.y()
-            self.sig_move_anim.emit(float(dx), float(dy))
-
-    def _move(self, act: Act) -> None:
-        """
-        根据动作信息计算位移量，并发出移动信号。
-        """
-        plus_x: float = 0.0
-        plus_y: float = 0.0
-        direction = act.direction  # 获取动作定义的方向
-
-        if direction:  # 仅当方向有效时才计算位移
-            move_amount = float(act.frame_move)  # 每帧的移动量
-            if direction == 'right':
-                plus_x = move_amount
-            elif direction == 'left':
-                plus_x = -move_amount
-            elif direction == 'up':
-                plus_y = -move_amount
-            elif direction == 'down':
-                plus_y = move_amount
-        # 仅当有实际位移时才发出信号（可选优化）
-        if plus_x != 0.0 or plus_y != 0.0:
-            self.sig_move_anim.emit(plus_x, plus_y)  # 发送移动信号 (dx, dy)
+            self.sig_tick_anim.emit(*self.settings.current_frame, float(dx), float(dy), self.pet_conf.generation)
 
 
 import math
@@ -231,13 +468,13 @@ from PyQt5.QtGui import QPixmap
 # settings.current_act: 当前动作对象
 # settings.previous_act: 上一个动作对象
 # settings.playid: 当前动作帧的播放索引
-# settings.current_img: 当前显示的图像 (QPixmap)
-# settings.previous_img: 上一个显示的图像 (QPixmap)
+# settings.current_frame: 当前显示的帧标识 (动作编号, 帧序号, 标志位)
+# settings.previous_frame: 上一个显示的帧标识
 # settings.act_id: 在一个动画序列中，当前执行到第几个动作 (Action) 的索引
 # settings.draging: 标志位，表示是否正在被鼠标拖拽 (1 表示是, 0 表示否)
 # settings.onfloor: 标志位，表示宠物是否在地面上 (1 表示是, 0 表示否)
 # settings.set_fall: 标志位，表示是否启用了掉落行为 (1 表示启用, 0 表示禁用)
-# settings.fall_right: 标志位，表示掉落时图像是否需要水平镜像
+# settings.fall_right: 标志位，表示掉落时是否显示水平镜像的帧 (FRAME_MIRRORED)
 # settings.dragspeedx: x 轴拖拽/掉落速度
 # settings.dragspeedy: y 轴拖拽/掉落速度
 
@@ -249,13 +486,18 @@ class Interaction_worker(QObject):
     """
 
     # --- 信号定义 ---
-    sig_setimg_inter = pyqtSignal(name='sig_setimg_inter')
-    sig_move_inter = pyqtSignal(float, float, name='sig_move_inter')
+    # 每个定时器 tick 至多一个信号：帧标识与位移一起交给UI
+    sig_tick_inter = pyqtSignal(
+        int, int, int, float, float, int, name='sig_tick_inter'
+    )  # (动作编号, 帧序号, 标志位, dx, dy, 配置代号)
     sig_act_finished = pyqtSignal()
 
-    def __init__(self, pet_conf, parent=None, settings : Settings = None):
+    def __init__(self, pet_conf, parent=None, settings : Settings = None, clock: Optional[AnimationClock] = None):
         """
         初始化 Interaction_worker。
+        给出 clock 时由共享动画时钟按 interact_speed 间隔调用 run，不启动自己的定时器。
+        没有交互在执行时不运行定时器 (也不订阅时钟)：start_interact 时启动，
+        交互结束 (动作序列播放完毕、松开鼠标或落地) 时停止，空闲的宠物不会被唤醒。
         """
         super(Interaction_worker, self).__init__(parent)
 
@@ -270,10 +512,53 @@ class Interaction_worker(QObject):
         self.timer = QTimer()
         # 连接定时器的 timeout 信号到 run 方法
         self.timer.timeout.connect(self.run)
-        # 启动定时器，间隔时间由宠物配置中的 interact_speed 决定 (毫秒)
-        self.timer.start(int(self.pet_conf.interact_speed))
         self.settings = settings
 
+        # 窗口不可见时为 True：不执行交互 (共享时钟模式下统计跳过的次数)
+        self.throttled = False
+        self.frames_skipped = 0
+
+        self.clock = clock
+        self._next_due = 0.0  # 共享时钟模式下，下一次 run 到期的 time.monotonic() 时间
+
+        # --- 掉落物理 (固定步长) ---
+        self._physics_last = None  # 上次积分的 time.monotonic() 时间；None 表示掉落重新开始
+        self._physics_acc = 0.0  # 尚未积分的时长 (秒)，不足一步
+        self._physics_extrap = (0.0, 0.0)  # 已按不足一步的时长外推并发出的位移
+
+    def advance(self, now):
+        """
+        由共享时钟调用：每隔 tick_interval() 毫秒执行一次 run，返回本次是否有交互在执行。
+        """
+        if self.is_killed or self.is_paused or now < self._next_due:
+            return False
+        interval = self.tick_interval() / 1000
+        start = self._next_due if now - self._next_due <= interval else now
+        self._next_due = start + interval
+        if self.interact is None:
+            return False
+        if self.throttled:
+            self.frames_skipped += 1
+            return False
+        self.run()
+        return True
+
+    def needs_full_rate(self):
+        """
+        正在拖拽时需要按 interact_speed 全速运行，窗口才跟手。
+        掉落按实际经过的时间积分，轨迹与 tick 间隔无关，随帧预算放慢即可。
+        """
+        return self.interact == 'mousedrag' and self.settings.draging == 1
+
+    def tick_interval(self):
+        """
+        交互的 tick 间隔 (毫秒)：通常为 interact_speed；
+        共享时钟模式下没有拖拽时 (包括掉落)，放慢到不短于时钟的帧预算。
+        """
+        if self.clock is None or self.needs_full_rate():
+            return self.pet_conf.interact_speed
+        return max(self.pet_conf.interact_speed, self.clock.frame_budget * 1000)
+
     def run(self):
         """
         定时器触发时执行的核心方法。
@@ -282,9 +567,9 @@ class Interaction_worker(QObject):
         # 如果当前没有指定交互方法，则直接返回
         if self.interact is None:
             return
-        # 如果指定的交互方法名不是当前对象的有效方法名，则清空交互方法名并返回
+        # 如果指定的交互方法名不是当前对象的有效方法名，则结束交互并返回
         elif self.interact not in dir(self):
-            self.interact = None
+            self._finish_interact()
         # 否则，获取并执行对应的交互方法
         else:
             # 使用 getattr 获取名称为 self.interact 的方法，并传入 self.act_name 作为参数执行
@@ -298,6 +583,39 @@ class Interaction_worker(QObject):
         self.interact = interact
         # 设置当前动作名
         self.act_name = act_name
+        # 启动定时器 / 订阅时钟；共享时钟模式下立即执行，并让时钟按需切换到全速
+        self._next_due = 0.0
+        self._reset_physics()
+        self._sync_timer()
+        if self.clock is not None:
+            self.clock.retime()
+
+    def _finish_interact(self):
+        """
+        结束当前交互：清空交互方法名与动作名，停止定时器 (或退订时钟)。
+        """
+        self.interact = None
+        self.act_name = None
+        self._sync_timer()
+
+    def _sync_timer(self):
+        """
+        只在有交互在执行、且未暂停 / 节流 / 终止时运行：定时器模式下启动或停止定时器，
+        共享时钟模式下订阅或退订时钟。
+        """
+        active = (self.interact is not None and not self.is_paused
+                  and not self.throttled and not self.is_killed)
+        if self.clock is not None:
+            if active:
+                self.clock.subscribe(self)
+            else:
+                self.clock.unsubscribe(self)
+        elif active:
+            if not self.timer.isActive():
+                # 间隔时间由宠物配置中的 interact_speed 决定 (毫秒)
+                self.timer.start(int(self.pet_conf.interact_speed))
+        else:
+            self.timer.stop()
 
     def kill(self):
         """
@@ -307,8 +625,8 @@ class Interaction_worker(QObject):
         self.is_paused = False
         # 设置终止标志
         self.is_killed = True
-        # 停止定时器
-        self.timer.stop()
+        # 停止定时器 / 退订时钟
+        self._sync_timer()
 
     def pause(self):
         """
@@ -316,21 +634,33 @@ class Interaction_worker(QObject):
         """
         # 设置暂停标志
         self.is_paused = True
-        # 停止定时器，阻止 run 方法被调用
-        self.timer.stop()
+        # 停止定时器 / 退订时钟，阻止 run 方法被调用
+        self._sync_timer()
+        # 暂停期间不算掉落时间
+        self._reset_physics()
 
     def resume(self):
         """
         恢复工作线程的活动 (如果之前被暂停)。
-        注意：此方法仅清除暂停标志，需要外部逻辑或修改来重新启动定时器。
-        当前代码下，调用 resume 后，需要再次调用 self.timer.start() 才能恢复 run 的执行。
+        有交互在执行时重新启动定时器 (或订阅时钟)，从暂停处继续。
         """
         # 清除暂停标志
         self.is_paused = False
+        self._sync_timer()
+
+    def set_throttled(self, throttled):
+        """
+        窗口不可见时开启节流，暂停交互的执行；关闭节流后从暂停处继续。
+        停止 / 重新启动定时器 (或退订 / 订阅时钟)；节流期间不算掉落时间。
+        """
+        self.throttled = throttled
+        self._sync_timer()
+        if throttled:
+            self._reset_physics()
 
     def img_from_act(self, act):
         """
-        根据给定的动作(act)对象，计算并设置当前应该显示的图像帧。
+        根据给定的动作(act)对象，计算并设置当前应该显示的帧标识。
         处理动画帧的重复播放逻辑，并更新全局状态 (settings)。
         """
 
@@ -343,26 +673,25 @@ class Interaction_worker(QObject):
             # 重置当前动作的播放帧索引
             self.settings.playid = 0
 
-        # 计算每张图片需要重复显示的次数 (基于动作帧刷新率和 InteractionWorker 的更新速度)
-        # math.ceil 确保至少重复一次
-        n_repeat = math.ceil(act.frame_refresh / (self.pet_conf.interact_speed / 1000))
-        # 创建一个扩展的图像列表，其中每个图像根据 n_repeat 重复，整个序列根据 act.act_num 重复
-        img_list_expand = [
-            item for item in act.images for i in range(n_repeat)
-        ] * act.act_num
-        # 从扩展列表中获取当前 playid 对应的图像
-        img = img_list_expand[self.settings.playid]
+        # 按当前 tick 间隔播放：每步占 ceil(帧时长 / tick 间隔) 个 tick，
+        # 整个播放表 (已含 act.act_num 次重复) 依次播放，由 playid 直接算出步下标
+        schedule = act.schedule
+        ticks_per_step = schedule.ticks_per_step(self.tick_interval())
+        n_ticks = len(schedule) * ticks_per_step
+        # tick 间隔变化 (例如帧预算调整) 后总 tick 数可能变少，从头播放
+        if self.settings.playid >= n_ticks:
+            self.settings.playid = 0
+        step = self.settings.playid // ticks_per_step
 
         # 播放索引加 1
         self.settings.playid += 1
-        # 如果播放索引超出了扩展列表的长度，则重置为 0，实现循环播放
-        if self.settings.playid >= len(img_list_expand):
+        # 如果播放索引超出了总 tick 数，则重置为 0，实现循环播放
+        if self.settings.playid >= n_ticks:
             self.settings.playid = 0
 
-        # 更新上一帧图像
-        self.settings.previous_img = self.settings.current_img
-        # 更新当前帧图像
-        self.settings.current_img = img
+        # 更新上一帧与当前帧的帧标识
+        self.settings.previous_frame = self.settings.current_frame
+        self.settings.current_frame = (act.act_id, schedule.frame_index[step], 0)
 
     def animat(self, act_name):
         """
@@ -378,32 +707,29 @@ class Interaction_worker(QObject):
         if self.settings.act_id >= len(acts):
             # 如果动画序列播放完毕，重置动作序列索引
             self.settings.act_id = 0
-            # 清除当前交互方法名，停止 animat 的后续调用
-            self.interact = None
+            # 结束交互，停止 animat 的后续调用与定时器
+            self._finish_interact()
             # 发出动作完成信号
             self.sig_act_finished.emit()
         else:
             # 获取当前要执行的动作对象
             act = acts[self.settings.act_id]
-            # 计算当前动作需要执行的总帧数 (考虑图像重复和动作次数)
-            n_repeat = math.ceil(
-                act.frame_refresh / (self.pet_conf.interact_speed / 1000)
-            )
-            n_repeat *= len(act.images) * act.act_num
+            # 当前动作需要执行的总 tick 数 (考虑图像重复和动作次数)
+            n_repeat = len(act.schedule) * act.schedule.ticks_per_step(self.tick_interval())
 
-            # 计算并设置当前帧图像
+            # 计算并设置当前帧
             self.img_from_act(act)
 
             if self.settings.playid >= n_repeat - 1:
                 # 增加动作序列索引，准备执行下一个动作
                 self.settings.act_id += 1
 
-            # 如果计算出的当前图像与上一帧不同，则需要更新显示和移动
-            if self.settings.previous_img != self.settings.current_img:
-                # 发出设置图像信号
-                self.sig_setimg_inter.emit()
-                # 根据当前动作的定义进行移动
-                self._move(act)
+            # 如果计算出的当前帧与上一帧不同，则需要更新显示和移动
+            if self.settings.previous_frame != self.settings.current_frame:
+                # 发出 tick：当前帧与动作每一步的位移
+                self.sig_tick_inter.emit(
+                    *self.settings.current_frame, act.schedule.dx, act.schedule.dy, self.pet_conf.generation
+                )
 
     def mousedrag(self, act_name):
         """
@@ -416,16 +742,14 @@ class Interaction_worker(QObject):
             if self.settings.draging == 1:
                 # 获取拖拽动画对应的动作对象
                 acts = self.pet_conf.drag
-                # 计算并设置拖拽动画的当前帧图像
+                # 计算并设置拖拽动画的当前帧
                 self.img_from_act(acts)
-                # 如果图像有变化，发出更新图像信号
-                if self.settings.previous_img != self.settings.current_img:
-                    self.sig_setimg_inter.emit()
-            # 如果停止拖拽
+                # 如果帧有变化，发出 tick (拖拽时窗口跟随鼠标，不附带位移)
+                if self.settings.previous_frame != self.settings.current_frame:
+                    self.sig_tick_inter.emit(*self.settings.current_frame, 0.0, 0.0, self.pet_conf.generation)
+            # 如果停止拖拽：结束交互并重置播放帧索引
             else:
-                # 清除动作名
-                self.act_name = None
-                # 重置播放帧索引
+                self._finish_interact()
                 self.settings.playid = 0
 
         # 情况 2: 掉落行为已启用 (settings.set_fall == 1) 且宠物不在地面上 (settings.onfloor == 0)
@@ -434,48 +758,81 @@ class Interaction_worker(QObject):
             if self.settings.draging == 1:
                 # 获取拖拽动画对应的动作对象
                 acts = self.pet_conf.drag
-                # 计算并设置拖拽动画的当前帧图像
+                # 计算并设置拖拽动画的当前帧
                 self.img_from_act(acts)
-                # 如果图像有变化，发出更新图像信号
-                if self.settings.previous_img != self.settings.current_img:
-                    self.sig_setimg_inter.emit()
+                # 如果帧有变化，发出 tick (拖拽时窗口跟随鼠标，不附带位移)
+                if self.settings.previous_frame != self.settings.current_frame:
+                    self.sig_tick_inter.emit(*self.settings.current_frame, 0.0, 0.0, self.pet_conf.generation)
+                # 松开鼠标时掉落从头计时
+                self._reset_physics()
             # 如果停止拖拽 (settings.draging == 0)，则开始掉落
             elif self.settings.draging == 0:
                 # 获取掉落动画对应的动作对象
                 acts = self.pet_conf.fall
-                # 计算并设置掉落动画的当前帧图像
+                # 计算并设置掉落动画的当前帧
                 self.img_from_act(acts)
 
-                # 如果需要向右镜像掉落图像
+                # 如果需要向右掉落，标记显示镜像帧 (镜像帧由 GUI 线程按动作缓存，不在此生成新图像)
                 if self.settings.fall_right:
-                    # 保存原始图像引用
-                    previous_img_state = self.settings.current_img
-                    # 水平镜像当前图像
-                    self.settings.current_img = self.settings.current_img.mirrored(True, False)
-
-                # 如果图像（或其镜像状态）有变化，发出更新图像信号
-                if self.settings.previous_img != self.settings.current_img:
-                    self.sig_setimg_inter.emit()
+                    act_id, frame_index, flags = self.settings.current_frame
+                    self.settings.current_frame = (act_id, frame_index, flags | FRAME_MIRRORED)
 
-                # 执行掉落位移计算
-                self.drop()
+                # 执行掉落位移计算，与当前帧（帧未变化时UI不会重绘）一起发出 tick
+                plus_x, plus_y = self.drop()
+                self.sig_tick_inter.emit(*self.settings.current_frame, plus_x, plus_y, self.pet_conf.generation)
 
-        # 情况 3: 掉落启用但在地面上，或者其他未覆盖的情况
+        # 情况 3: 掉落启用但在地面上 (已落地)，或者其他未覆盖的情况：结束交互并重置播放帧索引
         else:
-            # 清除动作名
-            self.act_name = None
-            # 重置播放帧索引
+            self._finish_interact()
             self.settings.playid = 0
 
-    def drop(self):
+    def drop(self, now: Optional[float] = None) -> tuple[float, float]:
         """
-        计算并发出掉落过程中的位移信号。
+        计算掉落过程中本次 tick 的位移 (dx, dy)。
+
+        物理按 PHYSICS_STEP 的固定步长积分，步数由实际经过的时间 (now，默认 time.monotonic()) 决定，
+        不足一步的时长按当前速度线性外推，因此任何 tick 间隔、定时器迟到与否，
+        宠物都沿 interact_speed 为 20 ms 时的同一条轨迹运动。
+        掉落开始后的第一个 tick 计为一步，与原先第一个 tick 即开始下落一致。
+        """
+        if now is None:
+            now = time.monotonic()
+        if self._physics_last is None:
+            elapsed = PHYSICS_STEP
+        else:
+            elapsed = min(now - self._physics_last, MAX_PHYSICS_CATCHUP)
+        self._physics_last = now
+        self._physics_acc += max(0.0, elapsed)
+
+        # 先撤销上次外推的位移，再按整步积分
+        plus_x, plus_y = -self._physics_extrap[0], -self._physics_extrap[1]
+        while self._physics_acc >= PHYSICS_STEP:
+            self._physics_acc -= PHYSICS_STEP
+            step_x, step_y = self._physics_step()
+            plus_x += step_x
+            plus_y += step_y
+
+        # 不足一步的时长：按下一步的速度外推，记下以便下次撤销
+        fraction = self._physics_acc / PHYSICS_STEP
+        self._physics_extrap = (self.settings.dragspeedx * fraction, self.settings.dragspeedy * fraction)
+        # 返回位移，由调用方随 tick 发给主界面
+        return plus_x + self._physics_extrap[0], plus_y + self._physics_extrap[1]
+
+    def _reset_physics(self):
+        """掉落重新开始 (开始交互、拖拽中、暂停)：清空计时与外推。"""
+        self._physics_last = None
+        self._physics_acc = 0.0
+        self._physics_extrap = (0.0, 0.0)
+
+    def _physics_step(self) -> tuple[float, float]:
+        """
+        掉落物理前进一个固定步长：返回本步的位移 (dx, dy)，并更新速度。
         模拟重力和速度衰减（线性阻力 F=-kv），但速度低于阈值时只加重力。
         """
 
-        # 获取当前的垂直速度作为本次的 y 轴位移增量
+        # 获取当前的垂直速度作为本步的 y 轴位移增量
         plus_y = self.settings.dragspeedy
-        # 获取当前的水平速度作为本次的 x 轴位移增量
+        # 获取当前的水平速度作为本步的 x 轴位移增量
         plus_x = self.settings.dragspeedx
 
         # 只有速度大于阈值时才施加阻力
@@ -486,36 +843,7 @@ class Interaction_worker(QObject):
         # 更新垂直速度，模拟重力加速度
         self.settings.dragspeedy = self.settings.dragspeedy + self.pet_conf.gravity
 
-        # 发出移动信号，请求主界面根据计算出的位移移动宠物
-        self.sig_move_inter.emit(plus_x, plus_y)
-
-    def _move(self, act) -> None:
-        """
-        根据动作(act)对象中定义的方和移动量，计算并发出移动信号。
-        """
-
-        # 初始化 x, y 轴位移量
-        plus_x = 0.0
-        plus_y = 0.0
-        # 获取动作定义的方向
-        direction = act.direction
-
-        # 如果动作没有定义方向，则不移动
-        if direction is None:
-            pass
-        # 根据方向字符串设置相应的位移量
-        else:
-            if direction == 'right':
-                plus_x = act.frame_move
-            elif direction == 'left':
-                plus_x = -act.frame_move
-            elif direction == 'up':
-                plus_y = -act.frame_move
-            elif direction == 'down':
-                plus_y = act.frame_move
-
-        # 发出移动信号，请求主界面移动宠物
-        self.sig_move_inter.emit(plus_x, plus_y)
+        return plus_x, plus_y
 
 
 class Scheduler_worker(QObject):
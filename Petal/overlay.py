@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+合成全部宠物的透明叠加窗口（可选模式）。
+
+默认每只宠物 (PetWidget) 是一个独立的无边框、半透明、置顶窗口，各自有后备存储与合成表面。
+叠加模式下宠物窗口不显示，由一个覆盖整个屏幕的透明 PetOverlay 在一次 paintEvent 中绘制所有宠物；
+窗口遮罩只包含各宠物当前帧的不透明像素，其余位置的鼠标事件穿透到下层窗口，
+落在宠物上的鼠标事件按命中测试转交给对应的 PetWidget。
+
+叠加窗口只绘制宠物精灵；宠物窗口中的状态栏、对话框等子控件在该模式下不显示。
+"""
+
+from typing import Optional
+
+from PyQt5.QtCore import QPoint, Qt
+from PyQt5.QtGui import QPainter, QRegion
+from PyQt5.QtWidgets import QApplication, QWidget
+
+from Petal.clock import AnimationClock
+
+# 为 True 时所有宠物由一个叠加窗口合成显示；默认 False，每只宠物一个窗口
+USE_OVERLAY = False
+
+
+class PetOverlay(QWidget):
+    """
+    单例叠加窗口，只能在 GUI 线程中使用。
+
+    宠物换帧或移动时调用 mark_dirty 登记；叠加窗口作为 AnimationClock 的后置订阅者，
+    在每次时钟推进完全部宠物之后统一处理登记过的宠物，只重绘变化的区域（新旧不透明区域的并集），
+    并在不透明区域变化时更新窗口遮罩。
+    没有宠物时窗口隐藏并退订时钟。
+    """
+
+    _instance: Optional['PetOverlay'] = None
+
+    @staticmethod
+    def instance() -> 'PetOverlay':
+        if PetOverlay._instance is None:
+            PetOverlay._instance = PetOverlay()
+        return PetOverlay._instance
+
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__(parent, Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
+        self.setAttribute(Qt.WA_TranslucentBackground, True)
+        self.setAttribute(Qt.WA_NoSystemBackground, True)
+        self.setAutoFillBackground(False)
+        self.setGeometry(QApplication.primaryScreen().virtualGeometry())
+
+        self._pets: list = []  # 绘制顺序，后加入的宠物在上层
+        # 每只宠物上次绘制时的 (帧标识, 帧矩形, 命中区域)，均为叠加窗口坐标
+        self._painted: dict = {}
+        self._dirty: set = set()  # 自上次同步以来换帧或移动过的宠物
+        self._mask_regions: tuple[QRegion, ...] = ()
+        self._grab = None  # 鼠标按下到松开期间接收鼠标事件的宠物
+
+        # 统计：绘制次数与合计绘制的宠物数
+        self.paints: int = 0
+        self.pets_painted: int = 0
+
+    @property
+    def pets(self) -> tuple:
+        return tuple(self._pets)
+
+    def add_pet(self, pet) -> None:
+        """加入一只宠物 (PetWidget)，必要时显示叠加窗口并订阅时钟。"""
+        if pet in self._pets:
+            return
+        self._pets.append(pet)
+        if len(self._pets) == 1:
+            AnimationClock.instance().subscribe(self, last=True)
+            self.show()
+        self.mark_dirty(pet)
+        self.sync()
+
+    def remove_pet(self, pet) -> None:
+        """移除一只宠物，擦除它上次绘制的区域；没有宠物时隐藏窗口。"""
+        if pet not in self._pets:
+            return
+        self._pets.remove(pet)
+        self._dirty.discard(pet)
+        if self._grab is pet:
+            self._grab = None
+        painted = self._painted.pop(pet, None)
+        if painted is not None:
+            self.update(painted[1])
+        if not self._pets:
+            AnimationClock.instance().unsubscribe(self)
+            self._mask_regions = ()
+            self.hide()
+            return
+        self._update_mask()
+
+    def mark_dirty(self, pet) -> None:
+        """登记宠物的帧或位置发生了变化，下一次同步时重绘。"""
+        if pet in self._pets:
+            self._dirty.add(pet)
+
+    def _pet_geometry(self, pet) -> tuple:
+        """宠物当前的 (帧标识, 帧矩形, 命中区域)，换算到叠加窗口坐标。"""
+        pet.layout.activate()  # 宠物窗口未显示，布局不会自动计算精灵控件的位置
+        offset = pet.pos() - self.pos() + pet.sprite.pos()
+        return (
+            pet.sprite.frame_id,
+            pet.sprite.frame_geometry().translated(offset),
+            pet.sprite.hit_geometry().translated(offset),
+        )
+
+    def advance(self, now: float) -> bool:
+        """时钟后置回调：各宠物本次的换帧与移动都已完成，统一同步到叠加窗口。"""
+        return self.sync()
+
+    def needs_full_rate(self) -> bool:
+        return False
+
+    def sync(self) -> bool:
+        """处理登记过的宠物，只重绘变化的区域；返回是否有变化。"""
+        if not self._dirty:
+            return False
+        dirty = QRegion()
+        pets, self._dirty = self._dirty, set()
+        for pet in pets:
+            geometry = self._pet_geometry(pet)
+            painted = self._painted.get(pet)
+            if painted == geometry:
+                continue
+            if painted is not None:
+                dirty += painted[2]
+            dirty += geometry[2]
+            self._painted[pet] = geometry
+        if dirty.isEmpty():
+            return False
+        self.update(dirty)
+        self._update_mask()
+        return True
+
+    def _update_mask(self) -> None:
+        """窗口遮罩为全部宠物命中区域的并集；各区域都不变时不重新设置。"""
+        regions = tuple(self._painted[pet][2] for pet in self._pets if pet in self._painted)
+        if regions == self._mask_regions:
+            return
+        self._mask_regions = regions
+        mask = QRegion()
+        for region in regions:
+            mask += region
+        # 空遮罩等于取消遮罩 (整个窗口接收鼠标事件)，此时用窗口外的一个像素代替
+        self.setMask(mask if not mask.isEmpty() else QRegion(-1, -1, 1, 1))
+
+    def paintEvent(self, event) -> None:
+        painter = QPainter(self)  # 绘制已被裁剪到待重绘区域
+        area = event.region().boundingRect()
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        painter.fillRect(area, Qt.transparent)
+        painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+        for pet in self._pets:
+            painted = self._painted.get(pet)
+            pixmap = pet.sprite.pixmap
+            if painted is None or pixmap is None or not painted[1].intersects(area):
+                continue
+            painter.drawPixmap(painted[1].topLeft(), pixmap)
+            self.pets_painted += 1
+        painter.end()
+        self.paints += 1
+
+    # --- 鼠标事件按命中测试转交给宠物 ---
+
+    def pet_at(self, pos: QPoint):
+        """叠加窗口坐标 pos 处 (不透明像素上) 最上层的宠物；没有时返回 None。"""
+        for pet in reversed(self._pets):
+            painted = self._painted.get(pet)
+            if painted is not None and painted[2].contains(pos):
+                return pet
+        return None
+
+    def mousePressEvent(self, event) -> None:
+        pet = self.pet_at(event.pos())
+        if pet is None:
+            event.ignore()
+            return
+        if event.button() == Qt.RightButton:
+            pet._show_right_menu()
+            return
+        self._grab = pet
+        pet.mousePressEvent(event)
+
+    def mouseMoveEvent(self, event) -> None:
+        if self._grab is not None:
+            self._grab.mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event) -> None:
+        pet, self._grab = self._grab, None
+        if pet is not None:
+            pet.mouseReleaseEvent(event)
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+已解码帧的磁盘缓存（内存映射）。
+
+首次加载时，把某个动作（图片基础名称）在某个缩放比例下已缩放、已预乘的 ARGB32 像素
+写入 'cache/frames/{pet_name}/{image_base_name}@{scale}.argb'；之后的启动直接内存映射该文件，
+QImage 直接包装映射区，不拷贝、不解码。多个进程映射同一文件时共享同一份物理页。
+
+缓存以源文件 (零散 PNG，或只发布图集时的 atlas.png + atlas.json) 与缩放比例校验。
+热启动只比较由各源文件的大小与修改时间得到的指纹 (只 stat，不读文件)；指纹变化时
+才读取源文件计算内容哈希：内容未变 (例如只是被 touch) 时缓存仍然有效并记下新指纹，
+内容变化时缓存失效并重新生成。
+"""
+
+import ctypes
+import hashlib
+import mmap
+import os
+import struct
+import threading
+from typing import Callable, Optional
+
+from PyQt5 import sip
+from PyQt5.QtGui import QImage
+
+RAW_CACHE_DIR_TPL = 'cache/frames/{pet_name}/'
+RAW_CACHE_FILE_TPL = '{image_base_name}@{scale:g}.argb'
+RAW_CACHE_MAGIC = b'PTLF'
+RAW_CACHE_VERSION = 3
+RAW_CACHE_FORMAT = QImage.Format_ARGB32_Premultiplied
+
+# 文件头: 魔数, 版本, 指纹 (sha1), 内容哈希 (sha1), 帧数
+_HEADER = struct.Struct('<4sI20s20sI')
+# 每帧记录: 宽, 高, 每行字节数, 像素数据在文件中的偏移, 像素内容摘要 (见 frame_digest)
+_FRAME = struct.Struct('<IIIQ16s')
+# 像素数据按 16 字节对齐，便于 SIMD 读取
+_ALIGN = 16
+
+# 已打开的映射在进程生命周期内保持有效：QImage 不持有映射区的所有权，
+# 提前解除映射会让仍在使用的 QImage 指向无效内存。映射页由文件支撑，可随时被系统回收。
+# 同一路径再次加载时复用已校验过同一指纹的映射；缓存文件被替换后新建的映射追加在后面，
+# 旧映射不会被替换或释放。每个映射记录校验时使用的指纹。
+_mappings: dict[str, list[tuple[mmap.mmap, bytes]]] = {}
+_mappings_lock = threading.Lock()
+
+
+def stat_fingerprint(paths: list[str], salt: str = '') -> bytes:
+    """
+    由文件的名称、大小与修改时间 (纳秒) 计算 sha1 指纹，只 stat 不读文件。
+    文件缺失时抛出 OSError。
+    """
+    digest = hashlib.sha1()
+    digest.update(salt.encode('utf-8'))
+    for path in paths:
+        stat = os.stat(path)
+        digest.update(f'{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns};'.encode('utf-8'))
+    return digest.digest()
+
+
+def source_fingerprint(source_files: list[str], scale: float) -> bytes:
+    """源文件与缩放比例的指纹 (见 stat_fingerprint)，用于校验缓存。"""
+    return stat_fingerprint(source_files, f'{RAW_CACHE_VERSION}:{scale!r}')
+
+
+def frame_digest(image: QImage) -> bytes:
+    """帧像素内容的 blake2b 摘要 (16 字节)，直接读取像素缓冲区，不拷贝。"""
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    return hashlib.blake2b(bits, digest_size=16).digest()
+
+
+def content_hash(source_files: list[str], scale: float) -> bytes:
+    """计算源 PNG 文件内容与缩放比例的 sha1 哈希。"""
+    digest = hashlib.sha1()
+    digest.update(f'{RAW_CACHE_VERSION}:{scale!r}'.encode('utf-8'))
+    for path in source_files:
+        digest.update(os.path.basename(path).encode('utf-8'))
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.digest()
+
+
+def cache_path(pet_name: str, image_base_name: str, scale: float) -> str:
+    """返回某个动作在某个缩放比例下的缓存文件路径。"""
+    return os.path.join(
+        RAW_CACHE_DIR_TPL.format(pet_name=pet_name),
+        RAW_CACHE_FILE_TPL.format(image_base_name=image_base_name, scale=scale),
+    )
+
+
+def load_frames(path: str,
+                fingerprint: bytes,
+                source_hash: Callable[[], bytes]) -> Optional[tuple[tuple[QImage, ...], tuple[bytes, ...]]]:
+    """
+    内存映射缓存文件，返回 (包装映射区的 QImage 序列, 各帧的像素内容摘要)。
+    摘要在写入缓存时算好，加载时不再读取像素。
+
+    文件头中的指纹与 fingerprint 相同即命中；不同时才调用 source_hash() 计算源文件的内容哈希
+    (见 content_hash)，与文件头中的内容哈希相同仍算命中，并把新指纹写回文件头。
+    文件不存在、格式不符或内容已变化时返回 None。
+    本进程已映射过该文件且校验过同一指纹时复用已有的映射，不再新建。
+    """
+    with _mappings_lock:
+        for mapping, mapped_fingerprint in _mappings.get(path, ()):
+            if mapped_fingerprint == fingerprint:
+                return _wrap_frames(path, mapping)
+
+        if not os.path.isfile(path):
+            return None
+
+        try:
+            with open(path, 'rb') as f:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (OSError, ValueError) as e:
+            print(f"[警告] raw_cache.load_frames: 无法映射缓存文件 '{path}': {e}")
+            return None
+
+        try:
+            magic, version, file_fingerprint, file_hash, _ = _HEADER.unpack_from(mapping, 0)
+        except struct.error:
+            magic = None
+        if magic != RAW_CACHE_MAGIC or version != RAW_CACHE_VERSION:
+            mapping.close()
+            return None
+        if file_fingerprint != fingerprint:
+            try:
+                valid = source_hash() == file_hash
+            except OSError as e:
+                print(f"[警告] raw_cache.load_frames: 无法读取源文件校验缓存 '{path}': {e}")
+                valid = False
+            if not valid:
+                mapping.close()
+                return None
+            _rewrite_fingerprint(path, fingerprint)
+
+        frames = _wrap_frames(path, mapping)
+        if frames is not None:
+            # 一经包装成 QImage 就必须一直保留
+            _mappings.setdefault(path, []).append((mapping, fingerprint))
+        return frames
+
+
+def _rewrite_fingerprint(path: str, fingerprint: bytes) -> None:
+    """源文件内容未变、只是指纹变化时，把新指纹写回缓存文件头，下次启动不必再读源文件。"""
+    offset = struct.calcsize('<4sI')
+    try:
+        with open(path, 'r+b') as f:
+            f.seek(offset)
+            f.write(fingerprint)
+    except OSError as e:
+        print(f"[警告] raw_cache: 无法更新缓存文件 '{path}' 的指纹: {e}")
+
+
+def _wrap_frames(path: str, mapping: mmap.mmap) -> Optional[tuple[tuple[QImage, ...], tuple[bytes, ...]]]:
+    """把映射区中的各帧包装成 QImage (不拷贝)，连同各帧的摘要返回；文件已损坏时返回 None。"""
+    try:
+        n_frames = _HEADER.unpack_from(mapping, 0)[-1]
+        images = []
+        digests = []
+        for i in range(n_frames):
+            width, height, bytes_per_line, offset, digest = _FRAME.unpack_from(
+                mapping, _HEADER.size + i * _FRAME.size
+            )
+            if offset + bytes_per_line * height > len(mapping):
+                raise ValueError(f"第 {i} 帧超出文件范围")
+            address = ctypes.addressof(ctypes.c_char.from_buffer(mapping, offset))
+            images.append(QImage(sip.voidptr(address), width, height, bytes_per_line, RAW_CACHE_FORMAT))
+            digests.append(digest)
+    except (struct.error, ValueError) as e:
+        print(f"[警告] raw_cache.load_frames: 缓存文件 '{path}' 已损坏: {e}")
+        return None
+    return tuple(images), tuple(digests)
+
+
+def store_frames(path: str,
+                 frames: tuple[QImage, ...],
+                 fingerprint: bytes,
+                 source_hash: bytes) -> tuple[tuple[QImage, ...], tuple[bytes, ...]]:
+    """
+    将帧序列以预乘 ARGB32 原始像素写入缓存文件，返回 (转换格式后的帧序列, 各帧的像素内容摘要)，
+    使冷启动与热启动得到的帧格式与摘要一致。
+
+    先写临时文件再替换，写入失败（如目标文件正被其他进程映射）时只打印警告。
+    """
+    converted = tuple(img.convertToFormat(RAW_CACHE_FORMAT) for img in frames)
+    digests = tuple(frame_digest(img) for img in converted)
+
+    records = []
+    offset = _HEADER.size + len(converted) * _FRAME.size
+    for img, digest in zip(converted, digests):
+        offset = (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+        records.append((img.width(), img.height(), img.bytesPerLine(), offset, digest))
+        offset += img.sizeInBytes()
+
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(_HEADER.pack(RAW_CACHE_MAGIC, RAW_CACHE_VERSION, fingerprint, source_hash, len(converted)))
+            for record in records:
+                f.write(_FRAME.pack(*record))
+            for img, (_, _, _, frame_offset, _) in zip(converted, records):
+                f.write(b'\0' * (frame_offset - f.tell()))
+                bits = img.constBits()
+                bits.setsize(img.sizeInBytes())
+                f.write(bits.asstring())
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"[警告] raw_cache.store_frames: 无法写入缓存文件 '{path}': {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    return converted, digests
@@ -1,12 +1,11 @@
-from PyQt5.QtGui import QImage
-
 class Settings:
     def __init__(self):
         """
         初始化应用程序所需的全局状态变量。
         """
-        self.current_img = QImage()
-        self.previous_img = QImage()
+        # 当前 / 上一个显示的帧标识 (动作编号, 帧序号, 标志位)，见 PetConfig.frame_image
+        self.current_frame: tuple[int, int, int] = (-1, 0, 0)
+        self.previous_frame: tuple[int, int, int] = (-1, 0, 0)
 
         # 物理、拖拽与掉落相关
         self.onfloor = 1  # 初始状态在地面上
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+宠物精灵的显示控件。
+
+SpriteWidget 在 paintEvent 中直接绘制当前帧的 QPixmap（底部水平居中），
+取代 QLabel + setPixmap：换帧时不触发布局与样式计算，只重绘新旧两帧不透明区域的并集。
+悬停时的状态栏 (Petal.status_overlay.StatusOverlay) 也画在本控件上，叠在帧的上方。
+"""
+
+from typing import Hashable, Optional
+
+from PyQt5.QtCore import QPoint, QRect, Qt
+from PyQt5.QtGui import QPainter, QPixmap, QRegion
+from PyQt5.QtWidgets import QSizePolicy, QWidget
+
+
+class SpriteWidget(QWidget):
+    """
+    直接绘制帧 QPixmap 的精灵控件。
+
+    set_frame 传入帧标识、QPixmap 与该帧不透明像素组成的命中区域（相对于帧左上角）；
+    帧标识未变化时不重绘。
+    """
+
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_NoSystemBackground, True)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self._frame_id: Optional[Hashable] = None
+        self._pixmap: Optional[QPixmap] = None
+        self._hit_region: QRegion = QRegion()  # 帧坐标系中的不透明像素
+        self._opaque_rect: QRect = QRect()  # _hit_region 的包围矩形
+        self._origin: QPoint = QPoint()  # 帧左上角在控件中的位置
+        self.status = None  # 画在帧上方的 StatusOverlay，由宠物窗口设置
+
+    @property
+    def frame_id(self) -> Optional[Hashable]:
+        """当前显示的帧标识。"""
+        return self._frame_id
+
+    @property
+    def pixmap(self) -> Optional[QPixmap]:
+        """当前帧的 QPixmap。"""
+        return self._pixmap
+
+    def frame_geometry(self) -> QRect:
+        """当前帧在控件中的矩形；按控件当前尺寸计算，控件未显示 (收不到 resizeEvent) 时也准确。"""
+        if self._pixmap is None:
+            return QRect()
+        return QRect(self._frame_origin(), self._pixmap.size())
+
+    def hit_geometry(self) -> QRegion:
+        """当前帧不透明像素在控件中的区域，用于窗口遮罩与命中测试。"""
+        if self._pixmap is None:
+            return QRegion()
+        return self._hit_region.translated(self._frame_origin())
+
+    def invalidate(self) -> None:
+        """忘记当前帧标识，使下一次 set_frame 即使标识相同也会重绘（例如帧图片换了尺寸）。"""
+        self._frame_id = None
+
+    def set_frame(self, frame_id: Hashable, pixmap: QPixmap, hit_region: QRegion) -> None:
+        """
+        切换到新的一帧，只请求重绘新旧两帧不透明区域的并集；帧标识未变化时直接返回。
+        """
+        if frame_id == self._frame_id:
+            return
+        dirty = self._opaque_rect.translated(self._origin)
+        if self.status is not None and self.status.shown and (
+                self._pixmap is None or self._pixmap.size() != pixmap.size()):
+            dirty = QRect(self.rect())  # 状态栏贴着帧的上沿，帧尺寸变化时随之移动
+        self._frame_id = frame_id
+        self._pixmap = pixmap
+        self._hit_region = hit_region
+        self._opaque_rect = hit_region.boundingRect()
+        self._origin = self._frame_origin()
+        dirty = dirty.united(self._opaque_rect.translated(self._origin))
+        if not dirty.isEmpty():
+            self.update(dirty)
+
+    def _frame_origin(self) -> QPoint:
+        """帧在控件中底部水平居中时，其左上角的位置。"""
+        if self._pixmap is None:
+            return QPoint()
+        return QPoint((self.width() - self._pixmap.width()) // 2, self.height() - self._pixmap.height())
+
+    def resizeEvent(self, event) -> None:
+        self._origin = self._frame_origin()
+        super().resizeEvent(event)
+
+    def paintEvent(self, event) -> None:
+        if self._pixmap is None and self.status is None:
+            return
+        painter = QPainter(self)
+        if self._pixmap is not None:
+            painter.drawPixmap(self._origin, self._pixmap)
+        if self.status is not None:
+            self.status.paint(painter)
+        painter.end()
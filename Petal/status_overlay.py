@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+宠物状态栏 (健康、心情、番茄钟、专注时间) 的绘制层。
+
+原先的状态信息框是一个 QFrame，内含 4 个图标 QLabel 与 4 个由样式表绘制的 QProgressBar，
+鼠标进入 / 离开精灵时整体 show / hide，每次都会让宠物窗口重新布局。
+StatusOverlay 不是控件：它只保存各状态条的数值，数值真正变化时才把全部状态条重新渲染到一张
+缓存的 QPixmap；悬停时由 SpriteWidget 在 paintEvent 中把这张 QPixmap 画在宠物上方，
+显示 / 隐藏只是重绘精灵控件中的一块矩形，不经过布局。
+"""
+
+from typing import Optional
+
+from PyQt5.QtCore import QObject, QPoint, QRect, QRectF, QSize, Qt, pyqtSignal
+from PyQt5.QtGui import QColor, QPainter, QPainterPath, QPalette, QPen, QPixmap
+from PyQt5.QtWidgets import QWidget
+
+# 图标与状态条的尺寸 (像素)
+ICON_SIZE = QSize(17, 15)
+BAR_HEIGHT = 15
+ROW_SPACING = 3
+# 状态条外观 (原 run_Petal.STYLE_SHEET 中 #PetHP / #PetEM / #PetFC 的样式)
+BORDER_COLOR = QColor('#535053')
+BORDER_WIDTH = 2
+BORDER_RADIUS = 7
+CHUNK_RADIUS = 5
+HP_COLOR = QColor('#f44357')
+EM_COLOR = QColor('#f6ce5f')
+FOCUS_COLOR = QColor('#47c0d2')
+
+
+class StatusBar:
+    """
+    一条状态条的数据，提供宠物窗口原先用到的 QProgressBar 接口
+    (value / setValue / setMaximum / setFormat / show / hide)。
+
+    与 QProgressBar 一致：超出 [0, maximum] 的值被忽略；数值、文本或可见性真正变化时
+    才通知所属的 StatusOverlay 重新渲染。
+    """
+
+    def __init__(self, owner: 'StatusOverlay', icon_path: str, color: QColor,
+                 maximum: int = 100, text: str = '', visible: bool = True):
+        self._owner = owner
+        self.icon_path: str = icon_path
+        self.color: QColor = color
+        self._maximum: int = maximum
+        self._value: int = 0
+        self._text: str = text
+        self._visible: bool = visible
+
+    def value(self) -> int:
+        return self._value
+
+    def maximum(self) -> int:
+        return self._maximum
+
+    def text(self) -> str:
+        return self._text
+
+    def isVisible(self) -> bool:
+        return self._visible
+
+    def setValue(self, value: int) -> None:
+        value = int(value)
+        if value == self._value or not 0 <= value <= self._maximum:
+            return
+        self._value = value
+        self._owner.invalidate()
+
+    def setMaximum(self, maximum: int) -> None:
+        maximum = int(maximum)
+        if maximum == self._maximum:
+            return
+        self._maximum = maximum
+        if self._value > maximum:
+            self._value = 0
+        self._owner.invalidate()
+
+    def setFormat(self, text: str) -> None:
+        if text == self._text:
+            return
+        self._text = text
+        self._owner.invalidate()
+
+    def setVisible(self, visible: bool) -> None:
+        if visible == self._visible:
+            return
+        self._visible = visible
+        self._owner.invalidate(resized=True)
+
+    def show(self) -> None:
+        self.setVisible(True)
+
+    def hide(self) -> None:
+        self.setVisible(False)
+
+
+class StatusOverlay(QObject):
+    """
+    画在精灵控件上的状态栏，只能在 GUI 线程中使用。
+
+    各行自上而下为番茄钟、专注时间、健康值、心情值 (隐藏的行不占位置)，整体水平居中，
+    底边贴着当前帧的上沿；帧上方的空间不足时与帧的上部重叠。
+    显示区域变化 (显示 / 隐藏、行数变化、重新排版) 时发出 sig_area_changed，供宠物窗口更新遮罩。
+    """
+
+    sig_area_changed = pyqtSignal()
+
+    # 各宠物共用的图标缓存：图标路径 -> 缩放到 ICON_SIZE 的 QPixmap
+    _icons: dict[str, QPixmap] = {}
+
+    def __init__(self, sprite: QWidget):
+        super().__init__(sprite)
+        self.sprite = sprite
+        self.shown: bool = False
+        self.bar_width: int = 0
+        self._pixmap: Optional[QPixmap] = None  # 缓存的渲染结果，数值变化后置空
+        self._geometry: QRect = QRect()  # 上次绘制的位置 (精灵控件坐标)
+
+        self.tomato = StatusBar(self, 'res/icons/Tomato_icon.png', HP_COLOR, maximum=25, text='无', visible=False)
+        self.focus = StatusBar(self, 'res/icons/Timer_icon.png', FOCUS_COLOR, text='无', visible=False)
+        self.hp = StatusBar(self, 'res/icons/HP_icon.png', HP_COLOR, text='50/100')
+        self.em = StatusBar(self, 'res/icons/emotion_icon.png', EM_COLOR, text='50/100')
+        self.hp.setValue(50)
+        self.em.setValue(50)
+
+        # 统计：重新渲染状态栏的次数
+        self.renders: int = 0
+
+    @property
+    def bars(self) -> tuple[StatusBar, ...]:
+        """自上而下的全部状态条。"""
+        return self.tomato, self.focus, self.hp, self.em
+
+    def set_bar_width(self, bar_width: int) -> None:
+        """设置状态条宽度 (通常为宠物配置宽度的 75%)。"""
+        if bar_width == self.bar_width:
+            return
+        self.bar_width = bar_width
+        self.invalidate(resized=True)
+
+    def set_shown(self, shown: bool) -> None:
+        """悬停时显示、离开时隐藏：只重绘状态栏所在的矩形。"""
+        if shown == self.shown:
+            return
+        self.shown = shown
+        self._geometry = self.geometry()
+        self.sprite.update(self._geometry)
+        self.sig_area_changed.emit()
+
+    def invalidate(self, resized: bool = False) -> None:
+        """状态条的数值或排版变化：丢弃缓存的渲染结果，显示中时重绘新旧两块区域。"""
+        self._pixmap = None
+        if not self.shown:
+            return
+        old_geometry = self._geometry
+        self._geometry = self.geometry()
+        self.sprite.update(old_geometry.united(self._geometry))
+        if resized:
+            self.sig_area_changed.emit()
+
+    def geometry(self) -> QRect:
+        """状态栏在精灵控件中的矩形；没有可见的行时为空矩形。"""
+        rows = sum(1 for bar in self.bars if bar.isVisible())
+        if rows == 0 or self.bar_width <= 0:
+            return QRect()
+        size = QSize(ICON_SIZE.width() + self.bar_width, rows * (BAR_HEIGHT + ROW_SPACING))
+        frame = self.sprite.frame_geometry()
+        bottom = max(size.height(), frame.top() if not frame.isEmpty() else self.sprite.height())
+        return QRect(QPoint((self.sprite.width() - size.width()) // 2, bottom - size.height()), size)
+
+    def paint(self, painter: QPainter) -> None:
+        """由 SpriteWidget.paintEvent 调用，在显示中时画出缓存的状态栏。"""
+        if not self.shown:
+            return
+        geometry = self.geometry()
+        if geometry.isEmpty():
+            return
+        if self._pixmap is None:
+            self._pixmap = self._render(geometry.size())
+        painter.drawPixmap(geometry.topLeft(), self._pixmap)
+        self._geometry = geometry
+
+    def _render(self, size: QSize) -> QPixmap:
+        """把全部可见的状态条渲染到一张透明 QPixmap。"""
+        ratio = self.sprite.devicePixelRatioF()
+        pixmap = QPixmap(size * ratio)
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        painter.setFont(self.sprite.font())
+        text_color = self.sprite.palette().color(QPalette.WindowText)
+        y = ROW_SPACING
+        for bar in self.bars:
+            if not bar.isVisible():
+                continue
+            painter.drawPixmap(QRect(QPoint(0, y), ICON_SIZE), self._icon(bar.icon_path))
+            self._paint_bar(painter, bar, QRectF(ICON_SIZE.width(), y, self.bar_width, BAR_HEIGHT), text_color)
+            y += BAR_HEIGHT + ROW_SPACING
+        painter.end()
+        self.renders += 1
+        return pixmap
+
+    @staticmethod
+    def _paint_bar(painter: QPainter, bar: StatusBar, rect: QRectF, text_color: QColor) -> None:
+        """画一条圆角状态条：边框、按比例填充的色块与居中的文本。"""
+        half = BORDER_WIDTH / 2
+        frame = rect.adjusted(half, half, -half, -half)
+        painter.setPen(QPen(BORDER_COLOR, BORDER_WIDTH))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRoundedRect(frame, BORDER_RADIUS, BORDER_RADIUS)
+
+        inner = rect.adjusted(BORDER_WIDTH, BORDER_WIDTH, -BORDER_WIDTH, -BORDER_WIDTH)
+        if bar.maximum() > 0 and bar.value() > 0:
+            chunk = QRectF(inner)
+            chunk.setWidth(inner.width() * min(1.0, bar.value() / bar.maximum()))
+            path = QPainterPath()
+            path.addRoundedRect(chunk, CHUNK_RADIUS, CHUNK_RADIUS)
+            painter.fillPath(path, bar.color)
+
+        painter.setPen(text_color)
+        painter.drawText(rect, Qt.AlignCenter, bar.text())
+
+    @classmethod
+    def _icon(cls, icon_path: str) -> QPixmap:
+        icon = cls._icons.get(icon_path)
+        if icon is None:
+            icon = QPixmap(icon_path)
+            if icon.isNull():
+                print(f"[警告] 状态栏图标未找到: '{icon_path}'。")
+            else:
+                icon = icon.scaled(ICON_SIZE, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+            cls._icons[icon_path] = icon
+        return icon
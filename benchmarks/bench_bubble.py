@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+对话框气泡基准：样式表 QLabel + text_wrap/setText (改前) vs. BubbleCache 预渲染的气泡 (改后)。
+
+在一个半透明的顶层窗口中放置气泡，轮流显示几句调度器常用的句子，统计：
+首次显示 (改后为缓存未命中，需要渲染)、重复显示 (缓存命中) 以及气泡每次重绘的 CPU 时间。
+半透明窗口中气泡下方的任何重绘 (例如宠物换帧) 都会让气泡跟着重绘。
+
+用法（在项目根目录下）:
+    python benchmarks/bench_bubble.py [次数]
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont, QFontDatabase
+from PyQt5.QtWidgets import QApplication, QLabel, QWidget
+
+from Petal.bubble import BUBBLE_BACKGROUND, BubbleCache, BubbleWidget, text_wrap
+
+TEXTS = (
+    '早上好，希望你精神满满！🚀',
+    '番茄时钟开始啦，专心工作吧',
+    '休息一下，喝口水吧',
+    '专注时间结束啦，辛苦了！',
+    '提醒：下午三点开会',
+)
+
+
+def _legacy_label(parent: QWidget, font: QFont) -> QLabel:
+    """原先的对话框：样式表绘制背景图，文本经 text_wrap 换行后居中。"""
+    label = QLabel(parent)
+    label.setAlignment(Qt.AlignCenter)
+    label.setFixedSize(BubbleCache.instance().background.size())
+    label.setFont(font)
+    label.setWordWrap(False)
+    label.setStyleSheet(f"background-image : url({BUBBLE_BACKGROUND})")
+    return label
+
+
+def _measure(app: QApplication, show, widget: QWidget, rounds: int) -> tuple[float, float, float]:
+    """返回 (首次显示, 重复显示, 重绘) 的平均 CPU 时间 (微秒)。"""
+    start = time.process_time()
+    for text in TEXTS:
+        show(text)
+        widget.repaint()
+    first = (time.process_time() - start) / len(TEXTS)
+
+    start = time.process_time()
+    for i in range(rounds):
+        show(TEXTS[i % len(TEXTS)])
+        widget.repaint()
+    repeat = (time.process_time() - start) / rounds
+
+    start = time.process_time()
+    for _ in range(rounds):
+        widget.repaint()
+    app.processEvents()
+    repaint = (time.process_time() - start) / rounds
+    return first * 1e6, repeat * 1e6, repaint * 1e6
+
+
+def main() -> None:
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    app = QApplication(sys.argv[:1])
+    QFontDatabase.addApplicationFont('res/font/MFNaiSi_Noncommercial-Regular.otf')
+    font = QFont('造字工房奈思体（非商用）', 11)
+
+    window = QWidget(None, Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
+    window.setAttribute(Qt.WA_TranslucentBackground, True)
+    window.resize(200, 160)
+    window.show()
+    app.processEvents()
+
+    print(f"{len(TEXTS)} 句，重复显示 / 重绘各 {rounds} 次 (CPU 时间, 微秒)")
+    label = _legacy_label(window, font)
+    label.show()
+    results = {'样式表 QLabel (改前)': _measure(app, lambda text: label.setText(text_wrap(text)), label, rounds)}
+    label.hide()
+
+    bubble = BubbleWidget(window)
+    bubble.setFont(font)
+    bubble.show()
+    results['预渲染气泡 (改后)'] = _measure(app, bubble.set_text, bubble, rounds)
+
+    for title, (first, repeat, repaint) in results.items():
+        print(f"{title:<14} 首次显示 {first:8.1f}  重复显示 {repeat:7.1f}  重绘 {repaint:7.1f}")
+    stats = BubbleCache.instance().stats()
+    print(f"气泡缓存: 命中 {stats['hits']} / 未命中 {stats['misses']} (缓存 {stats['size']} 个)")
+
+
+if __name__ == '__main__':
+    main()
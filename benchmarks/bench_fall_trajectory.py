@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+抛出 / 掉落轨迹检查：不同 tick 间隔下，Interaction_worker.drop 产生的轨迹是否一致。
+
+基准为原先每个 tick 积分一步的 drop 公式在 interact_speed 为 20 ms 时的轨迹，
+由 _legacy_positions 独立实现 (不调用 Interaction_worker)，第 n 个位置为积分 n 步后的位置。
+分别按 10 / 20 / 50 ms 的 tick 间隔调用 drop，tick 可准时，也可在 ±50% 的范围内随机抖动
+(每 SYNC_MS 毫秒一个 tick 准时，作为同步点)，检查两项：
+  - 步长边界：落在步长边界上的 tick 累计的位置与基准位置的偏差；
+  - 步间：其余 tick 的位置是否落在前后两个基准位置围成的范围内 (输出越界的最大像素数)。
+"改前" 为每个 tick 积分一步 (原先的 drop)，轨迹随 tick 间隔变快或变慢。
+改后任一项超过 TOLERANCE 时以状态码 1 退出。
+
+用法（在项目根目录下）:
+    python benchmarks/bench_fall_trajectory.py [宠物名称] [秒数]
+"""
+
+import math
+import os
+import random
+import sys
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+
+from Petal.frame_cache import FrameCache
+from Petal.modules import PHYSICS_STEP, Interaction_worker
+from Petal.settings import Settings
+
+TICKS_MS = (10, 20, 50)
+STEP_MS = round(PHYSICS_STEP * 1000)
+# 抖动的 tick 中每隔多少毫秒安排一个准时的 tick (须为各 tick 间隔与步长的公倍数)
+SYNC_MS = 100
+# 抖动幅度 (tick 间隔的比例)
+JITTER = 0.5
+# 抛出时的初速度 (像素 / 步)：向右上方抛出，两个方向都经过阻力阈值
+THROW_SPEED = (45.0, -60.0)
+# 允许的最大偏差 (像素)，只容纳浮点误差
+TOLERANCE = 1e-3
+
+
+def _legacy_positions(pet_conf, n_steps: int) -> list[tuple[float, float]]:
+    """按原先 drop 的公式逐步积分 n_steps 步，返回各步后的累计位置 (下标 0 为起点)。"""
+    settings = Settings()
+    vx, vy = THROW_SPEED
+    x = y = 0.0
+    points = [(x, y)]
+    for _ in range(n_steps):
+        x += vx
+        y += vy
+        if abs(vx) > settings.drag_speed_threshold:
+            vx *= 1 - settings.drag_base_friction
+        if abs(vy) > settings.drag_speed_threshold:
+            vy *= 1 - settings.drag_base_friction
+        vy += pet_conf.gravity
+        points.append((x, y))
+    return points
+
+
+def _tick_times(tick_ms: int, seconds: float, jitter: float, rng: random.Random) -> list[tuple[float, bool]]:
+    """返回各 tick 相对第一个 tick 的时刻 (秒) 及其是否为同步点；同步点以外的 tick 随机抖动。"""
+    ticks = []
+    for i in range(int(seconds * 1000 / tick_ms) + 1):
+        t_ms = i * tick_ms
+        if t_ms % SYNC_MS == 0:
+            ticks.append((t_ms / 1000, True))
+        else:
+            ticks.append(((t_ms + rng.uniform(-jitter, jitter) * tick_ms) / 1000, False))
+    return ticks
+
+
+def _outside(value: float, a: float, b: float) -> float:
+    """value 超出 [min(a, b), max(a, b)] 的距离。"""
+    return max(0.0, min(a, b) - value, value - max(a, b))
+
+
+def _check(pet_conf, points, tick_ms: int, seconds: float, jitter: float, per_tick: bool) -> tuple[float, float]:
+    """按 tick 时刻调用 drop，返回 (步长边界上的最大偏差, 步间的最大越界)。"""
+    worker = Interaction_worker(pet_conf, settings=Settings())
+    worker.settings.dragspeedx, worker.settings.dragspeedy = THROW_SPEED
+    x = y = 0.0
+    at_step = between = 0.0
+    for i, (t, synced) in enumerate(_tick_times(tick_ms, seconds, jitter, random.Random(1))):
+        if per_tick:
+            dx, dy = worker._physics_step()
+        else:
+            dx, dy = worker.drop(100.0 + t)
+        x += dx
+        y += dy
+        # 第一个 tick 计为一步
+        if synced or (jitter == 0 and round(t * 1000) % STEP_MS == 0):
+            ref_x, ref_y = points[round(t * 1000) // STEP_MS + 1]
+            at_step = max(at_step, math.hypot(x - ref_x, y - ref_y))
+        else:
+            n = int(math.floor(t / PHYSICS_STEP)) + 1
+            (x0, y0), (x1, y1) = points[n], points[n + 1]
+            between = max(between, math.hypot(_outside(x, x0, x1), _outside(y, y0, y1)))
+    return at_step, between
+
+
+def main() -> None:
+    pet_name = sys.argv[1] if len(sys.argv) > 1 else 'Kitty'
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 1.5
+    app = QApplication(sys.argv[:1])
+
+    pet_conf = FrameCache.instance().acquire(pet_name).pet_conf
+    points = _legacy_positions(pet_conf, int(seconds / PHYSICS_STEP) + 3)
+    print(f"宠物: {pet_name}, 重力 {pet_conf.gravity:g}, 初速度 {THROW_SPEED}, 掉落 {seconds:g} 秒; "
+          f"与 20 ms 基准轨迹比较 (像素): 步长边界上的偏差 / 步间的越界")
+    failed = False
+    for tick_ms in TICKS_MS:
+        legacy, _ = _check(pet_conf, points, tick_ms, seconds, 0.0, per_tick=True)
+        on_time = _check(pet_conf, points, tick_ms, seconds, 0.0, per_tick=False)
+        jittered = _check(pet_conf, points, tick_ms, seconds, JITTER, per_tick=False)
+        failed |= max(on_time + jittered) > TOLERANCE
+        print(f"tick {tick_ms:3d} ms  每 tick 一步 (改前) {legacy:9.2f}  固定步长 (改后) "
+              f"准时 {on_time[0]:.1e} / {on_time[1]:.1e}  抖动 ±{JITTER:.0%} {jittered[0]:.1e} / {jittered[1]:.1e}")
+    print('不一致' if failed else f'一致 (容差 {TOLERANCE:g} 像素)')
+    app.quit()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+空闲唤醒基准：没有交互在执行的 Interaction_worker 每秒被唤醒的次数。
+
+分别统计定时器模式 (每只宠物一个 interact_speed 间隔的 QTimer，唤醒一次即调用一次 run)
+与共享时钟模式 (时钟每次触发调用一次 advance) 下，空闲宠物的唤醒次数。
+"改前" 由 AlwaysOnInteractionWorker 复现原先的行为：定时器在构造时启动、一直订阅时钟；
+"改后" 只在有交互在执行时运行定时器 / 订阅时钟。
+
+用法（在项目根目录下）:
+    python benchmarks/bench_idle_wakeups.py [宠物名称] [宠物数量] [秒数]
+"""
+
+import os
+import sys
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication
+
+from Petal.clock import AnimationClock
+from Petal.frame_cache import FrameCache
+from Petal.modules import Interaction_worker
+from Petal.settings import Settings
+
+
+class CountingInteractionWorker(Interaction_worker):
+    """统计 run (定时器模式) 与 advance (共享时钟模式) 的调用次数。"""
+
+    def __init__(self, *args, **kwargs):
+        self.wakeups = 0
+        super().__init__(*args, **kwargs)
+
+    def run(self):
+        self.wakeups += 1
+        super().run()
+
+    def advance(self, now):
+        self.wakeups += 1
+        return super().advance(now)
+
+
+class AlwaysOnInteractionWorker(CountingInteractionWorker):
+    """按原先的方式：构造时即启动定时器 (或订阅时钟)，与是否有交互无关。"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._sync_timer()
+
+    def _sync_timer(self):
+        if self.clock is not None:
+            if self.is_killed:
+                self.clock.unsubscribe(self)
+            else:
+                self.clock.subscribe(self)
+        elif self.is_paused or self.is_killed or self.throttled:
+            self.timer.stop()
+        elif not self.timer.isActive():
+            self.timer.start(int(self.pet_conf.interact_speed))
+
+
+def _run(app: QApplication, pet_conf, worker_cls, clock, n_pets: int, seconds: float) -> int:
+    """返回全部空闲宠物在 seconds 秒内被唤醒的总次数。"""
+    workers = [worker_cls(pet_conf, settings=Settings(), clock=clock) for _ in range(n_pets)]
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    app.exec_()
+    for worker in workers:
+        worker.kill()
+    app.processEvents()
+    return sum(worker.wakeups for worker in workers)
+
+
+def main() -> None:
+    pet_name = sys.argv[1] if len(sys.argv) > 1 else 'Kitty'
+    n_pets = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 3.0
+    app = QApplication(sys.argv[:1])
+
+    pet_conf = FrameCache.instance().acquire(pet_name).pet_conf
+    print(f"宠物: {pet_name} x {n_pets}, 空闲 {seconds:g} 秒 (interact_speed {pet_conf.interact_speed:g} ms)")
+    for mode, clock in (('定时器', None), ('共享时钟', AnimationClock.instance())):
+        for title, worker_cls in (('始终运行 (改前)', AlwaysOnInteractionWorker),
+                                  ('按需启动 (改后)', CountingInteractionWorker)):
+            wakeups = _run(app, pet_conf, worker_cls, clock, n_pets, seconds)
+            print(f"{mode:<5} {title:<12} 唤醒 {wakeups:6d} 次 ({wakeups / seconds / n_pets:6.1f} 次/秒/只)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+显示模式基准：N 个独立的宠物窗口 vs. 一个合成全部宠物的叠加窗口 (Petal.overlay)。
+
+两种模式分别在子进程中运行（USE_OVERLAY 需在导入 PetWidget 之前设定）：通过主窗口添加 N 只宠物，
+预热后统计一段时间内进程的 CPU 时间、顶层窗口数以及各顶层窗口后备存储的像素总量。
+
+用法（在项目根目录下）:
+    python benchmarks/bench_overlay.py [宠物名称] [宠物数量] [秒数]
+"""
+
+import os
+import random
+import subprocess
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WARMUP_SECONDS = 2.0
+
+
+def _run_mode(mode: str, pet_name: str, n_pets: int, seconds: float) -> None:
+    """子进程：以指定模式运行并打印一行结果。"""
+    random.seed(0)
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication(sys.argv[:1])
+    import Petal.overlay as overlay
+    overlay.USE_OVERLAY = mode == 'overlay'
+    from Mainwindow.MainWindow import MainWindow
+
+    main_window = MainWindow(app, 800, 600)
+    for _ in range(n_pets):
+        main_window.add_pet(pet_name)
+
+    result = {}
+
+    def start() -> None:
+        result['cpu'] = time.process_time()
+
+    def stop() -> None:
+        cpu = time.process_time() - result['cpu']
+        windows = [w for w in app.topLevelWidgets() if w.isVisible() and w is not main_window]
+        pixels = sum(w.width() * w.height() for w in windows)
+        print(f"{mode:<8} 宠物 {len(main_window.pet_instances):3d}  顶层窗口 {len(windows):3d}  "
+              f"后备存储 {pixels * 4 / 1024 / 1024:6.1f} MB  CPU {cpu / seconds * 100:5.1f}%", flush=True)
+        app.quit()
+
+    QTimer.singleShot(int(WARMUP_SECONDS * 1000), start)
+    QTimer.singleShot(int((WARMUP_SECONDS + seconds) * 1000), stop)
+    app.exec_()
+    os._exit(0)
+
+
+def main() -> None:
+    if len(sys.argv) > 1 and sys.argv[1] == '--mode':
+        _run_mode(sys.argv[2], sys.argv[3], int(sys.argv[4]), float(sys.argv[5]))
+        return
+
+    pet_name = sys.argv[1] if len(sys.argv) > 1 else 'Doggy'
+    n_pets = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 5.0
+    print(f"宠物: {pet_name} x {n_pets}, 统计 {seconds:g} 秒")
+    for mode in ('windows', 'overlay'):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--mode', mode, pet_name, str(n_pets), str(seconds)],
+            capture_output=True, text=True,
+        ).stdout
+        print(next((line for line in output.splitlines() if line.startswith(mode)), f"{mode:<8} 运行失败"))
+
+
+if __name__ == '__main__':
+    main()
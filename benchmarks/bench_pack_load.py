@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+角色包加载基准：比较串行加载与线程池并行加载（1/2/4/8 个线程）的冷启动耗时。
+
+每次加载都使用全新的临时目录作为帧缓存目录，保证测到的是解码 + 缩放的真实开销。
+
+用法（在项目根目录下）:
+    python benchmarks/bench_pack_load.py [宠物名称] [重复次数]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtGui import QGuiApplication
+
+from Petal import raw_cache
+from Petal.frame_cache import RolePack
+
+WORKER_COUNTS = (1, 2, 4, 8)
+
+
+def _load_serial(pet_name: str) -> None:
+    pack = RolePack(pet_name)
+    for act in pack.pet_conf.acts.values():
+        act.images
+
+
+def _load_parallel(pet_name: str, max_workers: int) -> None:
+    pack = RolePack(pet_name, preload_core=False)
+    pack.load_acts(max_workers=max_workers)
+
+
+def _time_cold(load, repeat: int) -> list[float]:
+    """在全新的缓存目录中重复执行 load，返回每次的耗时 (秒)。"""
+    timings = []
+    original_dir = raw_cache.RAW_CACHE_DIR_TPL
+    try:
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory() as tmp:
+                raw_cache.RAW_CACHE_DIR_TPL = os.path.join(tmp, '{pet_name}') + os.sep
+                start = time.perf_counter()
+                load()
+                timings.append(time.perf_counter() - start)
+    finally:
+        raw_cache.RAW_CACHE_DIR_TPL = original_dir
+    return timings
+
+
+def main() -> None:
+    pet_name = sys.argv[1] if len(sys.argv) > 1 else 'Doggy'
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    app = QGuiApplication(sys.argv[:1])
+
+    print(f"宠物: {pet_name}, 重复 {repeat} 次, CPU 核数 {os.cpu_count()}")
+    serial = statistics.median(_time_cold(lambda: _load_serial(pet_name), repeat))
+    print(f"{'串行':<8}{serial * 1000:8.1f} ms")
+    for n in WORKER_COUNTS:
+        parallel = statistics.median(_time_cold(lambda: _load_parallel(pet_name, n), repeat))
+        print(f"{f'{n} 线程':<8}{parallel * 1000:8.1f} ms  (x{serial / parallel:.2f})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+暂停 / 恢复基准：线程模式下的 Animation_worker，比较 0.2 秒轮询 (改前) 与条件变量 (改后)。
+
+统计两项：
+  - 恢复延迟：resume() 到工作线程发出下一帧 tick 的时间；
+  - 暂停开销：全部宠物暂停期间，工作线程被唤醒 (轮询) 的次数与进程 CPU 时间。
+"改前" 由 PollingAnimationWorker 复现原先 run / _run_act / _check_pause_kill 的实现。
+
+用法（在项目根目录下）:
+    python benchmarks/bench_pause_resume.py [宠物名称] [宠物数量] [暂停秒数]
+"""
+
+import os
+import statistics
+import sys
+import threading
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QThread, Qt
+from PyQt5.QtWidgets import QApplication
+
+from Petal.frame_cache import FrameCache
+from Petal.modules import Animation_worker
+from Petal.settings import Settings
+
+
+class PollingAnimationWorker(Animation_worker):
+    """按原先的方式播放与处理暂停：每 0.2 秒醒来检查一次标记，帧间休眠不可打断。"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.polls = 0
+
+    def pause(self) -> None:
+        self.is_paused = True
+
+    def resume(self) -> None:
+        self.is_paused = False
+
+    def _check_pause_kill(self) -> bool:
+        while self.is_paused:
+            if self.is_killed:
+                return True
+            self.polls += 1
+            time.sleep(0.2)
+        return self.is_killed
+
+    def run(self) -> None:
+        while not self.is_killed:
+            self.random_act()
+            if self._check_pause_kill():
+                break
+            time.sleep(self.pet_conf.refresh)
+
+    def _run_act(self, act) -> None:
+        for _ in range(act.act_num):
+            if self._check_pause_kill():
+                return
+            for frame_index in range(len(act.images)):
+                if self._check_pause_kill():
+                    return
+                self._emit_frame(act, frame_index)
+                time.sleep(act.frame_refresh)
+
+
+class TickProbe:
+    """在工作线程中 (直接连接) 记录最近一次 tick 的时间。"""
+
+    def __init__(self):
+        self.ticked = threading.Event()
+        self.last = 0.0
+
+    def on_tick(self, *args) -> None:
+        self.last = time.monotonic()
+        self.ticked.set()
+
+
+def _run(pet_conf, worker_cls, n_pets: int, seconds: float) -> tuple[list[float], float, int]:
+    """返回 (各宠物的恢复延迟, 暂停期间的 CPU 时间, 暂停期间的轮询次数)。"""
+    threads, workers, probes = [], [], []
+    for _ in range(n_pets):
+        worker = worker_cls(pet_conf, settings=Settings())
+        probe = TickProbe()
+        worker.sig_tick_anim.connect(probe.on_tick, Qt.DirectConnection)
+        thread = QThread()
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        threads.append(thread)
+        workers.append(worker)
+        probes.append(probe)
+    for thread in threads:
+        thread.start()
+    for probe in probes:
+        probe.ticked.wait()
+
+    for worker in workers:
+        worker.pause()
+    time.sleep(0.5)  # 等待正在进行的帧间休眠结束，全部线程进入暂停等待
+    polls = sum(getattr(worker, 'polls', 0) for worker in workers)
+    cpu_start = time.process_time()
+    time.sleep(seconds)
+    cpu = time.process_time() - cpu_start
+    polls = sum(getattr(worker, 'polls', 0) for worker in workers) - polls
+
+    latencies = []
+    for worker, probe in zip(workers, probes):
+        probe.ticked.clear()
+        start = time.monotonic()
+        worker.resume()
+        probe.ticked.wait()
+        latencies.append(probe.last - start)
+
+    for worker in workers:
+        worker.kill()
+    for thread in threads:
+        thread.quit()
+    for thread in threads:
+        thread.wait()
+    return latencies, cpu, polls
+
+
+def main() -> None:
+    pet_name = sys.argv[1] if len(sys.argv) > 1 else 'Kitty'
+    n_pets = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 3.0
+    app = QApplication(sys.argv[:1])
+
+    pet_conf = FrameCache.instance().acquire(pet_name).pet_conf
+    walk = pet_conf.acts['left_walk']
+    walk.images  # 预先加载，避免计入基准
+    pet_conf.random_act = [[walk]]
+    pet_conf.act_prob = [1.0]
+    pet_conf.refresh = 0
+
+    print(f"宠物: {pet_name} x {n_pets}, 暂停 {seconds:g} 秒")
+    for title, worker_cls in (('0.2 秒轮询 (改前)', PollingAnimationWorker), ('条件变量 (改后)', Animation_worker)):
+        latencies, cpu, polls = _run(pet_conf, worker_cls, n_pets, seconds)
+        print(f"{title:<14} 恢复延迟 平均 {statistics.mean(latencies) * 1000:7.2f} ms  "
+              f"最大 {max(latencies) * 1000:7.2f} ms  暂停期间唤醒 {polls / seconds:6.1f} 次/秒  "
+              f"CPU {cpu * 1000:6.1f} ms")
+    app.quit()
+
+
+if __name__ == '__main__':
+    main()
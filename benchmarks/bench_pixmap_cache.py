@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+每帧显示开销基准：比较 PetWidget.set_img 原先的逐帧 QPixmap.fromImage 与按帧缓存的 QPixmap。
+
+按动画顺序循环播放角色包全部动作的帧，在主线程中测量每帧 "取得 QPixmap 并设置到 QLabel" 的
+CPU 时间 (time.process_time)；缓存方式的首次转换计入总时间。
+分别测试磁盘缓存提供的预乘 ARGB32 帧，以及 PNG 解码得到的非预乘 ARGB32 帧（需要逐像素转换）。
+
+用法（在项目根目录下）:
+    python benchmarks/bench_pixmap_cache.py [宠物名称] [循环次数]
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtWidgets import QApplication, QLabel
+
+from Petal.frame_cache import RolePack
+
+
+def _play(label: QLabel, frames: list, rounds: int, to_pixmap) -> float:
+    """循环播放 rounds 轮，返回每帧平均 CPU 时间 (微秒)。"""
+    start = time.process_time()
+    for _ in range(rounds):
+        for image in frames:
+            label.setPixmap(to_pixmap(image))
+    return (time.process_time() - start) / (rounds * len(frames)) * 1e6
+
+
+def main() -> None:
+    pet_name = sys.argv[1] if len(sys.argv) > 1 else 'Doggy'
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    app = QApplication(sys.argv[:1])
+
+    pack = RolePack(pet_name, preload_core=False)
+    pack.load_acts()
+    frames = [image for act in pack.pet_conf.acts.values() for image in act.images]
+    label = QLabel()
+
+    print(f"宠物: {pet_name}, {len(frames)} 帧/轮, 循环 {rounds} 轮")
+    for title, source in (
+        ('预乘 ARGB32', frames),
+        ('非预乘 ARGB32', [image.convertToFormat(QImage.Format_ARGB32) for image in frames]),
+    ):
+        pack.pixmaps.clear()
+        baseline = _play(label, source, rounds, QPixmap.fromImage)
+        cached = _play(label, source, rounds, pack.pixmap)
+        print(f"[{title}]")
+        print(f"  {'QPixmap.fromImage':<20}{baseline:10.1f} us/帧")
+        print(f"  {'按帧缓存的 QPixmap':<20}{cached:10.1f} us/帧  (减少 {(1 - cached / baseline) * 100:.0f}%)")
+    print(f"缓存的 QPixmap: {len(pack.pixmaps)} 个")
+
+
+if __name__ == '__main__':
+    main()
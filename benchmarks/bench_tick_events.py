@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+跨线程排队事件量基准：30 只一直行走的宠物，比较每帧三个信号（换图、移动、重绘）与每帧一个 tick 信号。
+
+每只宠物一个 Animation_worker 线程，随机动作固定为行走 (left_walk)。主线程中的接收对象
+统计收到的排队事件 (QEvent.MetaCall) 数量，以及处理这些事件花费的主线程 CPU 时间。
+"改前" 由 LegacyAnimationWorker 复现原先 _run_act 的发信号方式。
+
+用法（在项目根目录下）:
+    python benchmarks/bench_tick_events.py [宠物名称] [宠物数量] [秒数]
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QEvent, QObject, QThread, QTimer, pyqtSignal, pyqtSlot
+from PyQt5.QtWidgets import QApplication
+
+from Petal.frame_cache import FrameCache
+from Petal.modules import Animation_worker
+from Petal.settings import Settings
+
+
+class LegacyAnimationWorker(Animation_worker):
+    """按原先的方式每帧发出三个信号：换图、移动 (仅在有位移时)、重绘。"""
+
+    sig_setimg_anim = pyqtSignal(int, int, int)
+    sig_move_anim = pyqtSignal(float, float)
+    sig_repaint_anim = pyqtSignal()
+
+    def _run_act(self, act) -> None:
+        for _ in range(act.act_num):
+            if self._check_pause_kill():
+                return
+            for frame_index in range(len(act.images)):
+                if self._check_pause_kill():
+                    return
+                self.sig_setimg_anim.emit(act.act_id, frame_index, 0)
+                time.sleep(act.frame_refresh)
+                plus_x, plus_y = act.offset
+                if plus_x != 0.0 or plus_y != 0.0:
+                    self.sig_move_anim.emit(plus_x, plus_y)
+                self.sig_repaint_anim.emit()
+
+
+class Receiver(QObject):
+    """主线程中的接收对象，统计排队事件数与处理耗时。"""
+
+    def __init__(self):
+        super().__init__()
+        self.events = 0
+        self.ticks = 0
+        self.cpu = 0.0
+
+    def event(self, event) -> bool:
+        if event.type() != QEvent.MetaCall:
+            return super().event(event)
+        self.events += 1
+        start = time.process_time()
+        handled = super().event(event)
+        self.cpu += time.process_time() - start
+        return handled
+
+    # 槽函数用 pyqtSlot 声明，排队事件才会直接投递给本对象，而不是 PyQt 生成的代理对象
+    @pyqtSlot(int, int, int)
+    def on_setimg(self, act_id: int, frame_index: int, flags: int) -> None:
+        self.ticks += 1
+
+    @pyqtSlot(float, float)
+    def on_move(self, plus_x: float, plus_y: float) -> None:
+        pass
+
+    @pyqtSlot()
+    def on_repaint(self) -> None:
+        pass
+
+    @pyqtSlot(int, int, int, float, float, int)
+    def on_tick(self, act_id: int, frame_index: int, flags: int, plus_x: float, plus_y: float, generation: int) -> None:
+        self.ticks += 1
+
+
+def _run(app: QApplication, pet_conf, worker_cls, n_pets: int, seconds: float) -> Receiver:
+    receiver = Receiver()
+    threads, workers = [], []
+    for _ in range(n_pets):
+        worker = worker_cls(pet_conf, settings=Settings())
+        if worker_cls is LegacyAnimationWorker:
+            worker.sig_setimg_anim.connect(receiver.on_setimg)
+            worker.sig_move_anim.connect(receiver.on_move)
+            worker.sig_repaint_anim.connect(receiver.on_repaint)
+        else:
+            worker.sig_tick_anim.connect(receiver.on_tick)
+        thread = QThread()
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        threads.append(thread)
+        workers.append(worker)
+
+    for thread in threads:
+        thread.start()
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    app.exec_()
+
+    for worker in workers:
+        worker.kill()
+    for thread in threads:
+        thread.quit()
+    for thread in threads:
+        thread.wait()
+    app.processEvents()
+    return receiver
+
+
+def main() -> None:
+    pet_name = sys.argv[1] if len(sys.argv) > 1 else 'Kitty'
+    n_pets = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 5.0
+    app = QApplication(sys.argv[:1])
+
+    pet_conf = FrameCache.instance().acquire(pet_name).pet_conf
+    walk = pet_conf.acts['left_walk']
+    walk.images  # 预先加载，避免计入基准
+    pet_conf.random_act = [[walk]]
+    pet_conf.act_prob = [1.0]
+    pet_conf.refresh = 0
+
+    print(f"宠物: {pet_name} x {n_pets}, 行走 {seconds:g} 秒 (每帧 {walk.frame_refresh:g} 秒)")
+    for title, worker_cls in (('每帧三个信号 (改前)', LegacyAnimationWorker), ('每帧一个 tick (改后)', Animation_worker)):
+        receiver = _run(app, pet_conf, worker_cls, n_pets, seconds)
+        print(f"{title:<16} 帧 {receiver.ticks:6d}  排队事件 {receiver.events:6d} "
+              f"({receiver.events / max(receiver.ticks, 1):.2f} 个/帧, {receiver.events / seconds:7.1f} 个/秒)  "
+              f"主线程 {receiver.cpu * 1000:7.1f} ms")
+
+
+if __name__ == '__main__':
+    main()